@@ -0,0 +1,13 @@
+"""Allow ``python -m radar_chart_automation`` from the repository root."""
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.cli import main  # noqa: E402
+
+if __name__ == "__main__":
+    raise SystemExit(main())
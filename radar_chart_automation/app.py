@@ -1,7 +1,6 @@
+import multiprocessing
 import os
-import shutil
 import sys
-import traceback
 from datetime import datetime
 
 try:
@@ -16,13 +15,14 @@ except ImportError as exc:
     print(f"Original error: {exc}")
     raise SystemExit(1) from exc
 
-import pandas as pd
-from matplotlib.backends.backend_pdf import PdfPages
-
-from src import io, percentiles, radar_plot, run_manager, utils
+from src import run_manager, startup, tasks
 from src.version import __version__
 
 APP_VERSION = __version__
+# How often the UI thread drains events from a background run.
+POLL_MS = 50
+# Imported in the background once the window is up (pandas, matplotlib, the pipeline).
+WARM_IMPORTS = ("src.pipeline", "src.radar_plot", "matplotlib.backends.backend_pdf")
 
 
 class RadarChartApp(tk.Tk):
@@ -33,9 +33,18 @@ class RadarChartApp(tk.Tk):
 
         self.selected_files = []
         self.last_run_folder = None
+        self.last_result = None
         self.athlete_names = []
+        self.group_by = []
+        self.task = None
+        self.warm_thread = None
 
         self._build_ui()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.after_idle(self._warm_imports)
+
+    def _warm_imports(self):
+        self.warm_thread = startup.warm_imports(WARM_IMPORTS)
 
     def _build_ui(self):
         frame = ttk.Frame(self, padding=12)
@@ -68,11 +77,30 @@ class RadarChartApp(tk.Tk):
         self.run_title_entry.insert(0, "e.g. January 2026 Testing")
         self.run_title_entry.bind("<FocusIn>", self._clear_placeholder)
 
+        group_by_frame = ttk.Frame(frame)
+        group_by_frame.pack(fill=tk.X, pady=(0, 4))
+        ttk.Label(group_by_frame, text="Rank within (optional)").pack(side=tk.LEFT)
+        self.group_by_entry = ttk.Entry(group_by_frame)
+        self.group_by_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(8, 0))
+        ttk.Label(group_by_frame, text="e.g. Team, Position").pack(side=tk.LEFT, padx=(8, 0))
+
         self.export_png_var = tk.BooleanVar(value=False)
         self.export_png_check = ttk.Checkbutton(
             frame, text="Export PNGs", variable=self.export_png_var
         )
-        self.export_png_check.pack(anchor=tk.W, pady=(4, 8))
+        self.export_png_check.pack(anchor=tk.W, pady=(4, 0))
+
+        self.rebuild_var = tk.BooleanVar(value=False)
+        self.rebuild_check = ttk.Checkbutton(
+            frame, text="Rebuild (re-read every file and re-ask dates)", variable=self.rebuild_var
+        )
+        self.rebuild_check.pack(anchor=tk.W)
+
+        self.update_sketch_var = tk.BooleanVar(value=False)
+        self.update_sketch_check = ttk.Checkbutton(
+            frame, text="Add this run to the local norms sketch", variable=self.update_sketch_var
+        )
+        self.update_sketch_check.pack(anchor=tk.W, pady=(0, 8))
 
         self.selected_only_var = tk.BooleanVar(value=False)
         self.selected_only_check = ttk.Checkbutton(
@@ -116,6 +144,16 @@ class RadarChartApp(tk.Tk):
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self._set_athlete_list_state(enabled=False)
 
+        progress_frame = ttk.Frame(frame)
+        progress_frame.pack(fill=tk.X, pady=(0, 8))
+        self.progress_bar = ttk.Progressbar(progress_frame, mode="determinate")
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.cancel_button = ttk.Button(progress_frame, text="Cancel", command=self.cancel_task)
+        self.cancel_button.pack(side=tk.LEFT, padx=(8, 0))
+        self.cancel_button.state(["disabled"])
+        self.progress_label = ttk.Label(frame, text="")
+        self.progress_label.pack(anchor=tk.W, pady=(0, 4))
+
         self.status_area = ScrolledText(frame, height=12, wrap=tk.WORD, state=tk.DISABLED)
         self.status_area.pack(fill=tk.BOTH, expand=True)
 
@@ -212,83 +250,104 @@ class RadarChartApp(tk.Tk):
         except Exception as exc:
             messagebox.showerror("Error", f"Could not open folder: {exc}")
 
-    def _setup_logger(self, log_path: str):
-        import logging
-
-        logger = logging.getLogger("radar_chart_automation")
-        logger.setLevel(logging.INFO)
-        logger.handlers = []
-        formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
-        file_handler = logging.FileHandler(log_path)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-        return logger
+    def _run_title(self) -> str:
+        run_title_input = self.run_title_entry.get().strip()
+        if run_title_input and not run_title_input.startswith("e.g."):
+            return run_title_input
+        return ""
+
+    def _start_task(self, work, on_done):
+        """Run ``work(task)`` off the UI thread; ``on_done(result)`` runs back on it."""
+        self._set_busy(True)
+        self._on_task_done = on_done
+        self.task = tasks.BackgroundTask(work).start()
+        self.after(POLL_MS, self._poll_task)
+
+    def _poll_task(self):
+        task = self.task
+        if task is None:
+            return
+        task.dispatch(self._handle_task_event)
+        if not task.finished:
+            self.after(POLL_MS, self._poll_task)
+
+    def _handle_task_event(self, kind, payload):
+        if kind == "status":
+            self.log_status(payload)
+        elif kind == "progress":
+            self.progress_bar.configure(maximum=max(payload.total, 1), value=payload.current)
+            self.progress_label.configure(text=payload.describe())
+            if payload.stage == "files":
+                self.log_status(payload.describe())
+        else:
+            self.task = None
+            self._set_busy(False)
+            if kind == "done":
+                self._on_task_done(payload)
+            elif kind == "cancelled":
+                self.progress_label.configure(text="Cancelled.")
+                self.log_status("Cancelled.")
+            else:
+                messagebox.showerror("Error", str(payload))
+                self.log_status(f"Error: {payload}")
+
+    def _set_busy(self, busy: bool):
+        state = ["disabled"] if busy else ["!disabled"]
+        for button in (self.select_button, self.run_button, self.make_charts_button):
+            button.state(state)
+        self.cancel_button.state(["!disabled"] if busy else ["disabled"])
+        if busy:
+            self.progress_bar.configure(value=0)
+            self.progress_label.configure(text="")
+
+    def cancel_task(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.log_status("Cancelling after the current file or page...")
+
+    def _on_close(self):
+        if self.task is not None:
+            self.task.cancel()
+        self.destroy()
 
     def run_processing(self):
         if not self.selected_files:
             messagebox.showerror("Missing files", "Please select one or more files.")
             return
 
-        run_title_input = self.run_title_entry.get().strip()
-        user_provided_title = run_title_input and not run_title_input.startswith("e.g.")
-        default_title = os.path.splitext(os.path.basename(self.selected_files[0]))[0]
-
-        run_paths = run_manager.create_run_folder(
-            run_title_input if user_provided_title else "",
-            default_title=default_title,
-        )
-        log_path = os.path.join(run_paths.logs, "run.log")
-        logger = self._setup_logger(log_path)
-        logger.info("Radar Chart Automation v%s", APP_VERSION)
-        logger.info("Selected CSVs: %s", ", ".join(self.selected_files))
-
-        self.log_status("Copying input files...")
-        for path in self.selected_files:
-            shutil.copy2(path, run_paths.raw_input)
-
-        long_frames = []
-        wide_frames = []
-        date_labels = []
-
-        try:
-            for path in self.selected_files:
-                df, mapping = self._load_with_mapping(path)
-                logger.info("Column mapping for %s: %s", path, mapping)
-                io.validate_required_metrics(df, mapping)
-
-                date_label = self._determine_date_label(df, path)
-                if not date_label:
-                    raise ValueError(f"No date label resolved for {os.path.basename(path)}")
-
-                date_labels.append(date_label)
-                logger.info("Date label for %s: %s", path, date_label)
-
-                long_df, wide_df = percentiles.compute_percentiles(df, mapping)
-                long_df["metrics_pull_date_label"] = date_label
-                wide_df["metrics_pull_date_label"] = date_label
-
-                long_frames.append(long_df)
-                wide_frames.append(wide_df)
-
-                logger.info("Processed %s athletes for %s", len(wide_df), date_label)
-
-            long_all = pd.concat(long_frames, ignore_index=True)
-            wide_all = pd.concat(wide_frames, ignore_index=True)
+        files = list(self.selected_files)
+        run_title = self._run_title()
+        self.group_by = [name.strip() for name in self.group_by_entry.get().split(",") if name.strip()]
+        group_by = self.group_by
+        incremental = not self.rebuild_var.get()
+        update_sketch = self.update_sketch_var.get()
+
+        def work(task):
+            from src import pipeline
+
+            return pipeline.run_processing(
+                files,
+                run_title=run_title,
+                group_by=group_by,
+                incremental=incremental,
+                update_sketch=update_sketch,
+                resolve_mapping=task.ui_callback(self._resolve_column_mapping),
+                resolve_date_label=task.ui_callback(self._prompt_date_label),
+                status=task.status,
+                progress=task.progress,
+                cancel=task.cancel_token,
+            )
 
-            long_all.to_csv(os.path.join(run_paths.percentiles, "percentiles_long.csv"), index=False)
-            wide_all.to_csv(os.path.join(run_paths.percentiles, "percentiles_wide.csv"), index=False)
+        self._start_task(work, self._processing_done)
 
-            self.last_run_folder = run_paths.base
-            self.athlete_names = sorted(wide_all["athlete_name"].unique().tolist())
-            self._update_athlete_list(self.athlete_names)
-            self.open_button.state(["!disabled"])
-            self.log_status("Percentiles saved. Use 'Make Charts' to build PDFs.")
-            self.log_status(f"Output folder: {run_paths.base}")
-        except Exception as exc:
-            logger.error("Run failed: %s", exc)
-            logger.error(traceback.format_exc())
-            messagebox.showerror("Error", str(exc))
-            self.log_status(f"Error: {exc}")
+    def _processing_done(self, result):
+        self.last_run_folder = result.run_paths.base
+        self.last_result = result
+        self.athlete_names = result.athlete_names
+        self._update_athlete_list(self.athlete_names)
+        self.open_button.state(["!disabled"])
+        self.log_status("Percentiles saved. Use 'Make Charts' to build PDFs.")
+        self.log_status(f"Output folder: {result.run_paths.base}")
 
     def make_charts(self):
         if not self.last_run_folder:
@@ -302,29 +361,6 @@ class RadarChartApp(tk.Tk):
             messagebox.showerror("Missing percentiles", "Percentiles file not found. Please click Run first.")
             return
 
-        wide_all = pd.read_csv(percentiles_path)
-        label_col = "metrics_pull_date_label"
-        if label_col not in wide_all.columns:
-            label_col = "test_date_label"
-        if label_col not in wide_all.columns:
-            raise ValueError("Missing Metrics Pull Date column in percentiles.")
-
-        date_labels = list(dict.fromkeys(wide_all[label_col].tolist()))
-
-        athlete_date_values = {}
-        for _, row in wide_all.iterrows():
-            athlete = row["athlete_name"]
-            date_label = row[label_col]
-            values = [
-                row["Jump Height percentile"],
-                row["Triple Ext percentile"],
-                row["Elasticity percentile"],
-                row["Loading percentile"],
-                row["Braking percentile"],
-            ]
-            values = [float(v) * 100 for v in values]
-            athlete_date_values.setdefault(athlete, {})[date_label] = values
-
         selected_athletes = None
         if self.selected_only_var.get():
             selected_indices = self.athlete_listbox.curselection()
@@ -336,44 +372,35 @@ class RadarChartApp(tk.Tk):
                 return
             selected_athletes = {self.athlete_listbox.get(i) for i in selected_indices}
 
-        run_title_input = self.run_title_entry.get().strip()
-        user_provided_title = run_title_input and not run_title_input.startswith("e.g.")
-        if user_provided_title:
-            pdf_base = utils.sanitize_title(run_title_input)
-            pdf_name = f"{pdf_base}__radars.pdf"
-        else:
-            pdf_name = f"{os.path.basename(self.last_run_folder)}__radars.pdf"
-        pdf_path = os.path.join(self.last_run_folder, "03_outputs", pdf_name)
-
-        self.log_status("Building PDF charts...")
-        with PdfPages(pdf_path) as pdf:
-            for athlete, date_map in athlete_date_values.items():
-                if selected_athletes is not None and athlete not in selected_athletes:
-                    continue
-                ordered_map = {label: date_map[label] for label in date_labels if label in date_map}
-                fig = radar_plot.build_radar_figure(athlete, ordered_map)
-                pdf.savefig(fig)
-                if self.export_png_var.get():
-                    png_dir = os.path.join(self.last_run_folder, "03_outputs", "png")
-                    os.makedirs(png_dir, exist_ok=True)
-                    filename = utils.sanitize_filename(athlete) + ".png"
-                    fig.savefig(os.path.join(png_dir, filename), dpi=150)
-                plt_close(fig)
-
-        self.log_status("Charts complete.")
-
-    def _load_with_mapping(self, path: str):
-        try:
-            return io.load_csv(path)
-        except io.ColumnMappingNeeded as exc:
-            mapping = self._prompt_column_mapping(exc.columns, exc.suggested_mapping)
-            if not mapping:
-                raise ValueError("Column mapping was cancelled.")
-            df, mapping = io.load_csv(path, mapping)
-            return df, mapping
+        # Charts come straight from the last run's tables instead of re-reading them.
+        run_folder = self.last_result or self.last_run_folder
+        run_title = self._run_title()
+        export_png = self.export_png_var.get()
+        incremental = not self.rebuild_var.get()
+
+        def work(task):
+            from src import pipeline
+
+            return pipeline.make_charts(
+                run_folder,
+                run_title=run_title,
+                export_png=export_png,
+                athletes=selected_athletes,
+                incremental=incremental,
+                status=task.status,
+                progress=task.progress,
+                cancel=task.cancel_token,
+            )
+
+        self._start_task(work, lambda pdf_path: self.log_status(f"PDF written to {pdf_path}"))
+
+    def _resolve_column_mapping(self, path, columns, suggested_mapping):
+        return self._prompt_column_mapping(columns, suggested_mapping)
 
     def _prompt_column_mapping(self, columns, suggested_mapping):
-        required = io.REQUIRED_KEYS
+        from src import io
+
+        required = io.REQUIRED_KEYS + [io.group_key(name) for name in self.group_by]
         mapping = dict(suggested_mapping)
 
         dialog = tk.Toplevel(self)
@@ -416,27 +443,21 @@ class RadarChartApp(tk.Tk):
         self.wait_window(dialog)
         return result["mapping"]
 
-    def _determine_date_label(self, df, path: str):
-        date_column = utils.pick_date_column(df.columns)
-        date_label = None
-        if date_column:
-            date_label = utils.extract_date_label_from_column(df, date_column)
-        if not date_label:
-            date_label = utils.infer_date_from_filename(path)
-        if not date_label:
-            prompt = f"Enter a date label for {os.path.basename(path)} (e.g. 2026-01-31):"
-            date_label = simpledialog.askstring("Date label", prompt, parent=self)
-            if date_label:
-                date_label = utils.parse_date_label(date_label) or date_label.strip()
-        return date_label
+    def _prompt_date_label(self, path: str):
+        prompt = f"Enter a date label for {os.path.basename(path)} (e.g. 2026-01-31):"
+        return simpledialog.askstring("Date label", prompt, parent=self)
 
 
-def plt_close(fig):
-    import matplotlib.pyplot as plt
-
-    plt.close(fig)
+def main():
+    # Chart rendering uses worker processes; frozen builds must hand them off here.
+    multiprocessing.freeze_support()
+    startup.configure_frozen_matplotlib(os.path.join(run_manager.app_data_dir(), "Cache", "mplconfig"))
+    # Charts render on a background thread (in-process for small jobs), so pyplot must
+    # never pick the Tk backend; set before anything imports matplotlib, as the CLI does.
+    os.environ["MPLBACKEND"] = "Agg"
+    app = RadarChartApp()
+    app.mainloop()
 
 
 if __name__ == "__main__":
-    app = RadarChartApp()
-    app.mainloop()
+    main()
@@ -0,0 +1,78 @@
+"""Time Excel ingestion: full pandas/openpyxl parse vs the projected readers in src.io."""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from src import io  # noqa: E402
+
+METRIC_HEADERS = [
+    "Jump Height (in)",
+    "Peak Power/BM",
+    "RSI-Modified",
+    "Eccentric Peak Power/BM",
+    "Eccentric Deceleration RFD/BM",
+]
+
+
+def write_workbook(path: str, rows: int, extra_columns: int, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    data = {"Name": [f"Athlete {index:05d}" for index in range(rows)], "Date": ["2026-01-31"] * rows}
+    for header in METRIC_HEADERS:
+        data[header] = rng.uniform(0, 100, rows).round(3)
+    for index in range(extra_columns):
+        data[f"Other Metric {index}"] = rng.uniform(0, 100, rows).round(3)
+    pd.DataFrame(data).to_excel(path, index=False, engine="openpyxl")
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Excel loading strategies.")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--extra-columns", type=int, default=20, help="Unmapped columns in the export")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "export.xlsx")
+        print(f"Writing {args.rows} x {args.extra_columns + 7} workbook...")
+        write_workbook(path, args.rows, args.extra_columns)
+
+        columns = io.read_header(path)
+        mapping = io.resolve_mapping(columns)
+        usecols = io.projected_columns(columns, mapping)
+        dtype = {mapping[key]: "float64" for key in io.METRIC_COLUMNS}
+
+        baseline_time, baseline = timed(lambda: pd.read_excel(path, engine="openpyxl"))
+        print(f"{'pandas read_excel (all columns)':>34}: {baseline_time:7.2f}s")
+        expected = baseline[[col for col in baseline.columns if col in usecols]].astype(dtype)
+
+        stream_time, streamed = timed(lambda: io.read_excel_columns(path, columns, usecols, dtype))
+        pd.testing.assert_frame_equal(streamed, expected)
+        print(f"{'streaming openpyxl (projected)':>34}: {stream_time:7.2f}s  {baseline_time / stream_time:5.1f}x")
+
+        if io.excel_engine() == "calamine":
+            calamine_time, fast = timed(
+                lambda: pd.read_excel(path, engine="calamine", usecols=usecols, dtype=dtype)
+            )
+            pd.testing.assert_frame_equal(fast, expected)
+            print(f"{'calamine (projected)':>34}: {calamine_time:7.2f}s  {baseline_time / calamine_time:5.1f}x")
+        else:
+            print("python-calamine not installed; skipping the calamine engine.")
+
+
+if __name__ == "__main__":
+    main()
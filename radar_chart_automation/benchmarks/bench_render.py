@@ -0,0 +1,53 @@
+"""Compare pages per second of the matplotlib and direct PDF chart backends."""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import matplotlib  # noqa: E402
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+
+from src import rendering  # noqa: E402
+
+
+def synthetic_jobs(pages: int, dates: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    labels = [f"2026-{month:02d}-15" for month in range(1, dates + 1)]
+    jobs = []
+    for index in range(pages):
+        values = rng.uniform(0, 100, size=(dates, 5)).round(1)
+        jobs.append(rendering.PageJob(f"Athlete {index:05d}", dict(zip(labels, values.tolist()))))
+    return jobs
+
+
+def time_backend(backend: str, jobs, workers: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        rendering.render_pages(os.path.join(tmp, "out.pdf"), jobs, workers=workers, backend=backend)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark radar chart PDF backends.")
+    parser.add_argument("--pages", type=int, default=200, help="Pages to render per backend")
+    parser.add_argument("--dates", type=int, default=3, help="Dates (polygons) per page")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for the matplotlib backend")
+    args = parser.parse_args()
+
+    jobs = synthetic_jobs(args.pages, args.dates)
+    for backend in rendering.BACKENDS:
+        elapsed = time_backend(backend, jobs, args.workers)
+        print(f"{backend:>10}: {args.pages / elapsed:10.1f} pages/s ({elapsed:.2f}s for {args.pages} pages)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Measure GUI cold start: interpreter launch to first painted window.
+
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --eager    # import pandas/matplotlib first, like older builds
+
+Each run is a fresh interpreter. Reported per run: ``import_app`` (importing
+app.py), ``first_window`` (process launch until the window has been drawn,
+including interpreter start) and ``warm_done`` (until the background imports of
+pandas, matplotlib and the pipeline have finished). Without a display only the
+import time is measured.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+CHILD = r"""
+import json, sys, time
+stamps = {}
+start = time.perf_counter()
+import app
+if sys.argv[1] == "1":
+    import importlib
+    for name in app.WARM_IMPORTS:
+        importlib.import_module(name)
+stamps["import_app"] = time.perf_counter() - start
+try:
+    window = app.RadarChartApp()
+except Exception as exc:  # no display
+    stamps["error"] = str(exc)
+else:
+    window.update()
+    stamps["first_window"] = time.time()
+    if window.warm_thread is not None:
+        window.warm_thread.join()
+    stamps["warm_done"] = time.time()
+    window.destroy()
+print(json.dumps(stamps), flush=True)
+"""
+
+
+def one_run(eager: bool) -> dict:
+    launched = time.time()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, "1" if eager else "0"],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    row = json.loads(output.strip().splitlines()[-1])
+    for key in ("first_window", "warm_done"):
+        if key in row:
+            row[key] -= launched
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time GUI start-up to first window.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--eager", action="store_true", help="Import the heavy modules before the window")
+    parser.add_argument("--output", help="Also write the runs and medians as JSON")
+    args = parser.parse_args()
+
+    runs = [one_run(args.eager) for _ in range(args.runs)]
+    medians = {
+        key: statistics.median(run[key] for run in runs)
+        for key in ("import_app", "first_window", "warm_done")
+        if all(key in run for run in runs)
+    }
+    for key, seconds in medians.items():
+        print(f"{key:<14} {seconds * 1000:8.1f} ms (median of {len(runs)})")
+    if "first_window" not in medians:
+        print(f"No window measured: {runs[0].get('error')}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump({"eager": args.eager, "runs": runs, "median": medians}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
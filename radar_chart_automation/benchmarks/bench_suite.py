@@ -0,0 +1,174 @@
+"""Time every pipeline stage on synthetic exports and write the results as JSON.
+
+    python benchmarks/bench_suite.py --sizes 100 1000 10000 --output results.json
+    python benchmarks/bench_suite.py --compare results.json   # print ratios vs an earlier run
+
+Loading, validation and ranking run on all athletes. Figure building and the
+matplotlib PDF/PNG writes cost the same per page at any roster size, so they
+are timed on a sample of pages (``--sample-pages``); the direct PDF writer
+renders every athlete.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import matplotlib  # noqa: E402
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from matplotlib.backends.backend_pdf import PdfPages  # noqa: E402
+
+import synthetic  # noqa: E402
+from src import io, percentiles, pipeline, radar_plot, rendering  # noqa: E402
+from src.version import __version__  # noqa: E402
+
+
+def best_of(repeat: int, func):
+    """Fastest of ``repeat`` calls (seconds) and the last result."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def page_inputs(wide_df: pd.DataFrame, pages: int):
+    data = pipeline.chart_data(wide_df)
+    return [(athlete, data.series(athlete)) for athlete in data.athletes[:pages]]
+
+
+def bench_size(athletes: int, args, tmp: str):
+    results = []
+
+    def record(stage: str, seconds: float, items: int):
+        results.append(
+            {
+                "athletes": athletes,
+                "stage": stage,
+                "seconds": round(seconds, 6),
+                "items": items,
+                "seconds_per_item": round(seconds / items, 9) if items else None,
+            }
+        )
+        print(f"{athletes:>7} {stage:<28} {seconds:9.4f}s  ({items} items)", flush=True)
+
+    df = None
+    mapping = None
+    for fmt in args.formats:
+        path = os.path.join(tmp, f"export_{athletes}.{fmt}")
+        synthetic.write_export(path, athletes, args.dates, args.junk_columns)
+        seconds, (df, mapping) = best_of(args.repeat, lambda: io.load_csv(path))
+        record(f"load_csv[{fmt}]", seconds, len(df))
+
+    seconds, _ = best_of(args.repeat, lambda: io.validate_required_metrics(df.copy(), mapping))
+    record("validate_required_metrics", seconds, len(df))
+    io.validate_required_metrics(df, mapping)
+
+    session = df[df["Date"] == df["Date"].iloc[0]] if "Date" in df.columns else df
+    seconds, (_, wide_df) = best_of(args.repeat, lambda: percentiles.compute_percentiles(session, mapping))
+    record("compute_percentiles", seconds, len(session))
+    wide_df[pipeline.LABEL_COLUMN] = "2026-01-05"
+
+    pages = page_inputs(wide_df, min(args.sample_pages, athletes))
+
+    start = time.perf_counter()
+    for athlete, date_map in pages:
+        with radar_plot.RadarFigureRenderer() as renderer:
+            renderer.render(athlete, date_map)
+    record("build_radar_figure", time.perf_counter() - start, len(pages))
+
+    renderer = radar_plot.RadarFigureRenderer()
+    start = time.perf_counter()
+    for athlete, date_map in pages:
+        renderer.render(athlete, date_map)
+    record("render[reused scaffold]", time.perf_counter() - start, len(pages))
+
+    pdf_path = os.path.join(tmp, "matplotlib.pdf")
+    start = time.perf_counter()
+    with PdfPages(pdf_path) as pdf:
+        for athlete, date_map in pages:
+            pdf.savefig(renderer.render(athlete, date_map))
+    record("pdf_write[matplotlib]", time.perf_counter() - start, len(pages))
+
+    start = time.perf_counter()
+    for index, (athlete, date_map) in enumerate(pages):
+        renderer.render(athlete, date_map).savefig(os.path.join(tmp, f"page_{index}.png"), dpi=150)
+    record("png_write", time.perf_counter() - start, len(pages))
+    renderer.close()
+    plt.close("all")
+
+    all_pages = [rendering.PageJob(athlete, date_map) for athlete, date_map in page_inputs(wide_df, athletes)]
+    seconds, _ = best_of(args.repeat, lambda: rendering.write_direct(os.path.join(tmp, "direct.pdf"), all_pages))
+    record("pdf_write[direct]", seconds, len(all_pages))
+    return results
+
+
+def environment() -> dict:
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "app_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "matplotlib": matplotlib.__version__,
+        "excel_engine": io.excel_engine(),
+    }
+
+
+def compare(current: list, previous_path: str) -> None:
+    with open(previous_path, "r", encoding="utf-8") as handle:
+        previous = {(row["athletes"], row["stage"]): row for row in json.load(handle)["results"]}
+    print(f"\nCompared with {previous_path} (ratio > 1 means slower now):")
+    for row in current:
+        before = previous.get((row["athletes"], row["stage"]))
+        if not before or not before["seconds_per_item"] or not row["seconds_per_item"]:
+            continue
+        ratio = row["seconds_per_item"] / before["seconds_per_item"]
+        print(f"{row['athletes']:>7} {row['stage']:<28} {ratio:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark load, rank, render and export stages.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="Athlete counts")
+    parser.add_argument("--dates", type=int, default=1, help="Sessions per synthetic export")
+    parser.add_argument("--junk-columns", type=int, default=20, help="Unused columns per export")
+    parser.add_argument("--formats", nargs="+", choices=["csv", "xlsx"], default=["csv", "xlsx"])
+    parser.add_argument("--sample-pages", type=int, default=50, help="Pages timed for matplotlib stages")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N for the non-render stages")
+    parser.add_argument("--output", default="bench_results.json", help="JSON file to write")
+    parser.add_argument("--compare", metavar="JSON", help="Earlier results to compare against")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for athletes in args.sizes:
+            results.extend(bench_size(athletes, args, tmp))
+
+    report = {"environment": environment(), "settings": vars(args), "results": results}
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
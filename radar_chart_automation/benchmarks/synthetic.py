@@ -0,0 +1,72 @@
+"""Generate realistic Teamworks-style CMJ exports for benchmarks.
+
+    python benchmarks/synthetic.py out.xlsx --athletes 1000 --dates 3 --junk-columns 40
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+METRIC_HEADERS = {
+    # header: (mean, sd) roughly matching real CMJ exports
+    "Jump Height (in)": (15.0, 3.0),
+    "Peak Power/BM": (55.0, 8.0),
+    "RSI-Modified": (0.45, 0.1),
+    "Eccentric Peak Power/BM": (20.0, 4.0),
+    "Eccentric Deceleration RFD/BM": (90.0, 20.0),
+}
+POSITIONS = ["Guard", "Forward", "Center", "Midfielder", "Defender", "Sprinter"]
+
+
+def session_dates(dates: int):
+    # Weekly testing sessions.
+    return [str(day.date()) for day in pd.date_range("2026-01-05", periods=dates, freq="7D")]
+
+
+def export_frame(athletes: int, dates: int = 1, junk_columns: int = 20, seed: int = 0) -> pd.DataFrame:
+    """One row per athlete per session, with extra columns a real export would carry."""
+    rng = np.random.default_rng(seed)
+    names = np.array([f"Athlete {index:05d}" for index in range(athletes)])
+    labels = session_dates(dates)
+    rows = athletes * len(labels)
+
+    data = {
+        "Name": np.tile(names, len(labels)),
+        "Date": np.repeat(labels, athletes),
+        "Position": rng.choice(POSITIONS, rows),
+        "Team": rng.choice(["Varsity", "JV"], rows),
+        "Body Weight (kg)": rng.normal(80, 10, rows).round(1),
+    }
+    for header, (mean, sd) in METRIC_HEADERS.items():
+        data[header] = np.abs(rng.normal(mean, sd, rows)).round(3)
+    for index in range(junk_columns):
+        data[f"Other Metric {index}"] = rng.uniform(0, 100, rows).round(3)
+    data["Notes"] = rng.choice(["", "felt tired", "retest", "new shoes"], rows)
+    return pd.DataFrame(data)
+
+
+def write_export(path: str, athletes: int, dates: int = 1, junk_columns: int = 20, seed: int = 0) -> str:
+    df = export_frame(athletes, dates, junk_columns, seed)
+    if os.path.splitext(path)[1].lower() in (".xlsx", ".xlsm"):
+        df.to_excel(path, index=False, engine="openpyxl")
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic Teamworks-style export.")
+    parser.add_argument("path", help="Output .csv or .xlsx path")
+    parser.add_argument("--athletes", type=int, default=100)
+    parser.add_argument("--dates", type=int, default=1, help="Sessions in the file (one row per athlete each)")
+    parser.add_argument("--junk-columns", type=int, default=20, help="Unused numeric columns to include")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_export(args.path, args.athletes, args.dates, args.junk_columns, args.seed)
+    print(f"Wrote {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,22 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+import os
+import subprocess
+import sys
+
 block_cipher = None
 
+# Ship matplotlib's font cache so the first launch skips the font scan (see src/startup.py).
+# Built in a separate interpreter because matplotlib reads MPLCONFIGDIR once, on import.
+MPL_CONFIG_DIR = os.path.join("build", "mplconfig")
+subprocess.check_call([sys.executable, os.path.join("scripts", "build_font_cache.py"), MPL_CONFIG_DIR])
+
 
 a = Analysis(
     ["app.py"],
     pathex=["."],
     binaries=[],
-    datas=[],
+    datas=[(MPL_CONFIG_DIR, "mplconfig")],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
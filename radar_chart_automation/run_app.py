@@ -45,9 +45,14 @@ def main() -> int:
         result = subprocess.run(cmd, cwd=str(project_root), env=_clean_python_env(os.environ))
         return result.returncode
 
+    # Already on the .venv interpreter: start the GUI in this process instead of spawning another.
     os.chdir(project_root)
-    result = subprocess.run([str(active_python), str(app_path)], env=_clean_python_env(os.environ))
-    return result.returncode
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+    from app import main as run_gui
+
+    run_gui()
+    return 0
 
 
 if __name__ == "__main__":
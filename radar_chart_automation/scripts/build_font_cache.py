@@ -0,0 +1,23 @@
+"""Build matplotlib's font cache for the frozen app (run by radar_chart_automation.spec).
+
+    python scripts/build_font_cache.py build/mplconfig
+"""
+
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.startup import build_font_cache  # noqa: E402
+
+
+def main():
+    out_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, "build", "mplconfig")
+    path = build_font_cache(out_dir)
+    print(f"Font cache written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,27 @@
-__all__ = ["io", "percentiles", "radar_plot", "run_manager", "utils"]
+__all__ = [
+    "chart_data",
+    "chart_style",
+    "cli",
+    "columnar",
+    "disk_cache",
+    "input_cache",
+    "input_store",
+    "io",
+    "memory",
+    "norms",
+    "page_cache",
+    "pdf_writer",
+    "percentiles",
+    "pipeline",
+    "radar_plot",
+    "rendering",
+    "run_manager",
+    "run_manifest",
+    "shards",
+    "sketches",
+    "startup",
+    "tasks",
+    "timing",
+    "trends",
+    "utils",
+]
@@ -0,0 +1,86 @@
+"""Dense athlete x date x axis store of chart percentiles.
+
+:class:`ChartData` holds one ``(athletes, dates, axes)`` float array, a
+``(athletes, dates)`` presence mask and name/date index maps, built from
+percentiles_wide in a few vectorized steps. Each page's input is an
+:class:`AthleteSeries`: a read-only ``date label -> values`` mapping over row
+views of that array, so nothing is copied per athlete until a page job is
+pickled for a render worker.
+"""
+
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class ChartData:
+    def __init__(self, athletes: List[str], dates: List[str], values: np.ndarray, present: np.ndarray):
+        self.athletes = athletes
+        self.dates = dates
+        self.values = values
+        self.present = present
+        self.athlete_index: Dict[str, int] = {name: index for index, name in enumerate(athletes)}
+        self.date_index: Dict[str, int] = {label: index for index, label in enumerate(dates)}
+
+    @classmethod
+    def from_wide(
+        cls, wide_df: pd.DataFrame, label_column: str, value_columns: Sequence[str], scale: float = 100.0
+    ) -> "ChartData":
+        """Athletes and dates keep first-seen order; a repeated (athlete, date) row replaces the earlier one."""
+        athlete_codes, athletes = pd.factorize(wide_df["athlete_name"], sort=False, use_na_sentinel=False)
+        date_codes, dates = pd.factorize(wide_df[label_column], sort=False, use_na_sentinel=False)
+        rows = wide_df[list(value_columns)].to_numpy(dtype=float) * scale
+
+        flat = athlete_codes.astype(np.int64) * len(dates) + date_codes
+        keep = ~pd.Series(flat).duplicated(keep="last").to_numpy()
+        values = np.full((len(athletes), len(dates), len(value_columns)), np.nan)
+        present = np.zeros((len(athletes), len(dates)), dtype=bool)
+        values[athlete_codes[keep], date_codes[keep]] = rows[keep]
+        present[athlete_codes[keep], date_codes[keep]] = True
+        return cls(list(athletes), list(dates), values, present)
+
+    def __len__(self) -> int:
+        return len(self.athletes)
+
+    def __contains__(self, athlete) -> bool:
+        return athlete in self.athlete_index
+
+    def series(self, athlete: str) -> "AthleteSeries":
+        return AthleteSeries(self, self.athlete_index[athlete])
+
+
+class AthleteSeries(Mapping):
+    """One athlete's tested dates (in store order) mapped to views of their axis values."""
+
+    __slots__ = ("_data", "_row")
+
+    def __init__(self, data: ChartData, row: int):
+        self._data = data
+        self._row = row
+
+    def _columns(self) -> np.ndarray:
+        return np.flatnonzero(self._data.present[self._row])
+
+    def __getitem__(self, label) -> np.ndarray:
+        column = self._data.date_index.get(label)
+        if column is None or not self._data.present[self._row, column]:
+            raise KeyError(label)
+        return self._data.values[self._row, column]
+
+    def __iter__(self) -> Iterator[str]:
+        dates = self._data.dates
+        return (dates[column] for column in self._columns())
+
+    def __len__(self) -> int:
+        return int(self._data.present[self._row].sum())
+
+    def items(self):
+        dates = self._data.dates
+        values = self._data.values[self._row]
+        return [(dates[column], values[column]) for column in self._columns()]
+
+    def __reduce__(self):
+        # Ship only this athlete's rows to worker processes, not the whole store.
+        return (dict, ([(label, values.copy()) for label, values in self.items()],))
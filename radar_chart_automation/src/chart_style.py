@@ -0,0 +1,82 @@
+"""Page layout constants and cell formatting shared by the chart backends.
+
+Nothing here imports matplotlib, so the direct PDF writer can use it without
+paying for a plotting stack.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Bump when page output changes so cached or previously rendered pages are redrawn.
+STYLE_VERSION = 1
+
+AXIS_LABELS = ["Jump Height", "Triple Ext", "Elasticity", "Loading", "Braking"]
+RING_LEVELS = [0, 25, 50, 75, 100]
+TABLE_COL_WIDTHS = [0.20, 0.16, 0.16, 0.16, 0.16, 0.16]
+# matplotlib's tab10 cycle, used to colour one polygon per date.
+DATE_COLORS = [
+    "#1f77b4",
+    "#ff7f0e",
+    "#2ca02c",
+    "#d62728",
+    "#9467bd",
+    "#8c564b",
+    "#e377c2",
+    "#7f7f7f",
+    "#bcbd22",
+    "#17becf",
+]
+
+
+def axis_angles(n_axes: int) -> np.ndarray:
+    base = np.linspace(0, 2 * np.pi, n_axes, endpoint=False)
+    return np.pi / 2 - base
+
+
+def values_to_points(values: List[float], angles: np.ndarray) -> np.ndarray:
+    scaled = np.array(values, dtype=float) / 100.0
+    x = scaled * np.cos(angles)
+    y = scaled * np.sin(angles)
+    points = np.column_stack([x, y])
+    return np.vstack([points, points[0]])
+
+
+def percentile_table_rows(
+    date_to_values: Dict[str, List[float]], deltas: Optional[Dict[str, List[float]]] = None
+):
+    # deltas: precomputed change since the previous date (trends.Trends.deltas); else computed here.
+    rows = []
+    previous_values = None
+    for date_label, values in date_to_values.items():
+        rows.append(("date", date_label, values))
+        if previous_values is not None:
+            if deltas is not None:
+                change = deltas[date_label]
+            else:
+                change = [curr - prev for curr, prev in zip(values, previous_values)]
+            rows.append(("delta", date_label, change))
+        previous_values = values
+    return rows
+
+
+def format_percentile(value: float) -> str:
+    rounded = round(float(value), 1)
+    if rounded.is_integer():
+        return f"{int(rounded)}%"
+    return f"{rounded:.1f}%"
+
+
+def format_delta(value: float) -> str:
+    rounded = round(float(value), 1)
+    if rounded.is_integer():
+        return f"{int(rounded):+d}"
+    return f"{rounded:+.1f}"
+
+
+def delta_color(delta_value: float) -> str:
+    if delta_value > 0:
+        return "#1b7f3a"
+    if delta_value < 0:
+        return "#b42318"
+    return "#555555"
@@ -0,0 +1,324 @@
+"""Command-line entry point: ``python -m radar_chart_automation run <files...>``."""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Optional
+
+
+def _parse_pairs(values: List[str], option: str) -> Dict[str, str]:
+    pairs = {}
+    for value in values or []:
+        key, sep, item = value.partition("=")
+        if not sep or not key.strip() or not item.strip():
+            raise SystemExit(f"{option} expects KEY=VALUE, got: {value}")
+        pairs[key.strip()] = item.strip()
+    return pairs
+
+
+def _load_config(path: Optional[str]) -> dict:
+    if not path:
+        return {}
+    with open(path, "r", encoding="utf-8") as handle:
+        config = json.load(handle)
+    if not isinstance(config, dict):
+        raise SystemExit(f"Config file must contain a JSON object: {path}")
+    return config
+
+
+def _mapping_resolver(overrides: Dict[str, str], group_by: List[str] = ()):
+    from . import io
+
+    group_keys = [io.group_key(name) for name in group_by]
+
+    def resolve(path, columns, suggested_mapping):
+        mapping = {**suggested_mapping, **overrides}
+        missing = [key for key in io.REQUIRED_KEYS + group_keys if key not in mapping]
+        if missing:
+            raise ValueError(
+                f"Unresolved columns for {os.path.basename(path)}: {', '.join(missing)}. "
+                f"Pass --map KEY=COLUMN. Available columns: {', '.join(map(str, columns))}"
+            )
+        return mapping
+
+    return resolve
+
+
+def _date_label_resolver(date_labels: Dict[str, str]):
+    def resolve(path):
+        return date_labels.get(os.path.basename(path)) or date_labels.get(path) or date_labels.get("*")
+
+    return resolve
+
+
+def _status(message: str) -> None:
+    print(message, flush=True)
+
+
+def _add_chart_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--title", default="", help="Run title (also used for the PDF name)")
+    parser.add_argument("--png", action="store_true", help="Also export one PNG per athlete")
+    parser.add_argument("--athletes", nargs="+", metavar="NAME", help="Only chart these athletes")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Processes used to render pages (default: number of CPU cores, 1 renders in-process)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["matplotlib", "pdf"],
+        default="matplotlib",
+        help="Chart renderer: matplotlib figures or the direct PDF writer (much faster)",
+    )
+    parser.add_argument(
+        "--shard-by",
+        metavar="COLUMN",
+        help="Write one PDF per value of this input column (e.g. Team or Position), plus an index.csv",
+    )
+    parser.add_argument(
+        "--shard-pages",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Split the PDF (or each --shard-by group) into files of at most N pages",
+    )
+    parser.add_argument(
+        "--shard-mb",
+        type=float,
+        default=None,
+        metavar="MB",
+        help="Split the PDF into files of roughly at most MB megabytes",
+    )
+    parser.add_argument(
+        "--no-timing",
+        action="store_true",
+        help="Skip the timing summary in run.log and logs/metrics.json",
+    )
+    parser.add_argument(
+        "--memory-profile",
+        action="store_true",
+        help="Record RSS/tracemalloc peaks and live figures per stage in run.log and logs/metrics.json",
+    )
+    parser.add_argument(
+        "--memory-ceiling",
+        type=int,
+        default=None,
+        metavar="MB",
+        help="Stop the run if resident memory stays above MB after freeing cached figures",
+    )
+    parser.add_argument(
+        "--no-page-cache",
+        action="store_true",
+        help="Render every page instead of copying identical pages from earlier runs",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignore the run manifest: recompute every input and re-render every page",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="radar_chart_automation",
+        description="Build percentile tables and radar chart PDFs without the GUI.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Process exports and build charts")
+    run_parser.add_argument("files", nargs="+", help="Teamworks CSV/XLSX exports")
+    _add_chart_options(run_parser)
+    run_parser.add_argument(
+        "--map",
+        action="append",
+        metavar="KEY=COLUMN",
+        help="Column for a field that is not auto-detected (keys: athlete_name, metric keys, --group-by keys)",
+    )
+    run_parser.add_argument(
+        "--date-label",
+        action="append",
+        metavar="FILE=DATE",
+        help="Date label for a file without one (use *=DATE for every file)",
+    )
+    run_parser.add_argument(
+        "--config",
+        help='JSON file with "mapping" and "date_labels" objects (command-line values win)',
+    )
+    run_parser.add_argument(
+        "--group-by",
+        action="append",
+        metavar="COLUMN",
+        help="Rank within each value of this column instead of the whole file, e.g. Team, Position or Sex "
+        "(repeatable; the percentile files gain a column per key)",
+    )
+    run_parser.add_argument(
+        "--norms", metavar="DIR", help="Score against a norms index instead of ranking within each file"
+    )
+    run_parser.add_argument(
+        "--norms-group",
+        default="all",
+        metavar="KEY",
+        help='Norms group to score against, e.g. "Soccer|F" for an index grouped by sport and sex',
+    )
+    run_parser.add_argument(
+        "--norms-sketch",
+        metavar="FILE",
+        help="Score approximately against a quantile sketch (.npz) instead of an exact norms index",
+    )
+    run_parser.add_argument(
+        "--update-sketch",
+        action="store_true",
+        help="Fold this run's raw values into the local norms sketch (Sketches/local.npz) for merge-sketches",
+    )
+    run_parser.add_argument(
+        "--baseline",
+        metavar="DATE",
+        help="Date label that percentiles_trends measures delta_baseline from (default: each athlete's first test)",
+    )
+    run_parser.add_argument(
+        "--trend-window",
+        type=int,
+        default=3,
+        metavar="N",
+        help="Number of tests in the rolling mean and slope of percentiles_trends (default: 3)",
+    )
+    run_parser.add_argument("--no-charts", action="store_true", help="Only write the percentile files")
+    run_parser.add_argument(
+        "--no-cache", action="store_true", help="Always re-parse inputs instead of using the parsed-input cache"
+    )
+
+    charts_parser = subparsers.add_parser("charts", help="Build charts for an existing run folder")
+    charts_parser.add_argument("run_folder", help="Run folder created by a previous run")
+    _add_chart_options(charts_parser)
+
+    norms_parser = subparsers.add_parser("norms", help="Add past runs to a normative reference index")
+    norms_parser.add_argument("sources", nargs="+", help="Run folders or percentiles_long.csv files")
+    norms_parser.add_argument(
+        "--index", metavar="DIR", help="Index folder (default: RadarChartAutomation/Norms in Documents)"
+    )
+    norms_parser.add_argument(
+        "--group-by",
+        action="append",
+        metavar="COLUMN",
+        help="Keep separate norms per value of this percentiles_long column (repeatable)",
+    )
+
+    merge_parser = subparsers.add_parser("merge-sketches", help="Merge norms sketches from several sites")
+    merge_parser.add_argument("output", help="Merged .npz file to write")
+    merge_parser.add_argument(
+        "sketches", nargs="+", help="Sketch files (runs with --update-sketch add to Sketches/local.npz)"
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from . import io, memory, pipeline
+
+    if args.command == "norms":
+        return _build_norms(args)
+    if args.command == "merge-sketches":
+        return _merge_sketches(args)
+
+    if args.command == "run":
+        config = _load_config(args.config)
+        overrides = {**config.get("mapping", {}), **_parse_pairs(args.map, "--map")}
+        date_labels = {**config.get("date_labels", {}), **_parse_pairs(args.date_label, "--date-label")}
+        missing_files = [path for path in args.files if not os.path.isfile(path)]
+        if missing_files:
+            print(f"File not found: {', '.join(missing_files)}", file=sys.stderr)
+            return 2
+        try:
+            result = pipeline.run_processing(
+                args.files,
+                run_title=args.title,
+                resolve_mapping=_mapping_resolver(overrides, args.group_by or []),
+                resolve_date_label=_date_label_resolver(date_labels),
+                status=_status,
+                use_cache=not args.no_cache,
+                incremental=not args.rebuild,
+                norms_dir=args.norms,
+                norms_group=args.norms_group,
+                norms_sketch=args.norms_sketch,
+                update_sketch=args.update_sketch,
+                collect_timings=not args.no_timing,
+                memory_profile=args.memory_profile,
+                memory_ceiling_mb=args.memory_ceiling,
+                group_by=args.group_by or (),
+                trend_baseline=args.baseline,
+                trend_window=args.trend_window,
+            )
+        except (ValueError, FileNotFoundError, io.ColumnMappingNeeded, memory.MemoryCeilingExceeded) as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            return 1
+        print(f"Percentiles saved to {result.run_paths.percentiles}")
+        if args.no_charts:
+            return 0
+        run_folder = result
+    else:
+        run_folder = args.run_folder
+
+    try:
+        pdf_path = pipeline.make_charts(
+            run_folder,
+            run_title=args.title,
+            export_png=args.png,
+            athletes=args.athletes,
+            status=_status,
+            workers=args.workers,
+            backend=args.backend,
+            incremental=not args.rebuild,
+            collect_timings=not args.no_timing,
+            memory_profile=args.memory_profile,
+            memory_ceiling_mb=args.memory_ceiling,
+            shard_by=args.shard_by,
+            shard_pages=args.shard_pages,
+            shard_mb=args.shard_mb,
+            use_page_cache=not args.no_page_cache,
+        )
+    except (ValueError, FileNotFoundError, memory.MemoryCeilingExceeded) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    if args.shard_by or args.shard_pages or args.shard_mb:
+        print(f"PDF shards written to {os.path.dirname(pdf_path)} (index: {os.path.basename(pdf_path)})")
+        return 0
+    print(f"PDF written to {pdf_path}")
+    return 0
+
+
+def _build_norms(args) -> int:
+    from . import norms
+
+    root = args.index or norms.default_norms_dir()
+    try:
+        index = norms.build_index(root, args.sources, args.group_by or ())
+    except (ValueError, FileNotFoundError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    for group, axes in sorted(index.groups.items()):
+        counts = ", ".join(f"{axis} {entry['count']}" for axis, entry in axes.items())
+        print(f"{group}: {counts}")
+    print(f"Norms index written to {root}")
+    return 0
+
+
+def _merge_sketches(args) -> int:
+    from . import sketches
+
+    try:
+        merged = sketches.merge_files(args.sketches, args.output)
+    except (ValueError, FileNotFoundError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    print(
+        f"Merged {len(merged.sources)} input(s) into {args.output} "
+        f"(estimated rank error {merged.error_estimate() * 100:.2f} percentile points)"
+    )
+    return 0
@@ -0,0 +1,93 @@
+"""Arrow IPC files: copies of the percentile tables and the input cache's entries.
+
+Each ``.csv`` in ``02_percentiles/`` gets an uncompressed Arrow IPC twin
+(``.arrow``) written right after it. Reopening a run folder loads that file
+instead of parsing text and keeps the exact float64 values; only the requested
+columns are read, and they are copied into pandas. pyarrow is in
+requirements.txt but stays optional: without it only the CSVs are written and
+read. The CSV stays the source of truth, so a CSV edited after the run is read
+instead of its older Arrow copy.
+"""
+
+import importlib.util
+import os
+from typing import Dict, Optional, Sequence
+
+import pandas as pd
+
+ARROW_SUFFIX = ".arrow"
+
+
+def available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def arrow_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ARROW_SUFFIX
+
+
+def write_frame(df: pd.DataFrame, path: str, metadata: Optional[Dict[str, str]] = None) -> None:
+    """Write ``df`` as an Arrow IPC file; ``metadata`` goes into the schema (see :func:`read_metadata`)."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if metadata:
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+    tmp_path = path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def read_frame(path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """``columns`` limits the read to those columns (missing ones are skipped)."""
+    import pyarrow as pa
+    from pyarrow import feather
+
+    if columns is not None:
+        # An IPC file is Feather v2, whose reader skips the other columns' buffers.
+        with pa.memory_map(path, "r") as source:
+            names = pa.ipc.open_file(source).schema.names
+        columns = [name for name in names if name in columns]
+    return feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+
+def read_metadata(path: str) -> Dict[str, str]:
+    """The ``metadata`` passed to :func:`write_frame` (schema only; no column data is read)."""
+    import pyarrow as pa
+
+    with pa.memory_map(path, "r") as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    return {key.decode(): value.decode() for key, value in metadata.items() if key != b"pandas"}
+
+
+def write_table(df: pd.DataFrame, csv_path: str) -> None:
+    """Write ``csv_path`` and, when pyarrow is installed, its Arrow twin."""
+    df.to_csv(csv_path, index=False)
+    if available():
+        write_frame(df, arrow_path(csv_path))
+
+
+def read_table(csv_path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Load the Arrow twin of ``csv_path`` when it is at least as new as the CSV, else the CSV.
+
+    ``columns`` limits the load to those columns (missing ones are skipped).
+    """
+    path = arrow_path(csv_path)
+    if available() and os.path.exists(path) and _mtime(path) >= _mtime(csv_path):
+        import pyarrow as pa
+
+        try:
+            return read_frame(path, columns)
+        except (OSError, pa.ArrowInvalid):
+            pass
+    if columns is None:
+        return pd.read_csv(csv_path)
+    return pd.read_csv(csv_path, usecols=lambda column: column in columns)
+
+
+def _mtime(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
@@ -0,0 +1,83 @@
+"""Size-bounded, least-recently-used file cache on local disk."""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Callable, Optional
+
+
+def hash_key(*parts) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class DiskCache:
+    """Stores one file per key under ``root``; reads refresh an entry's mtime,
+    and the oldest entries are evicted once the total exceeds ``max_bytes``."""
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, key: str, suffix: str = "") -> str:
+        return os.path.join(self.root, key[:2], key + suffix)
+
+    def get(self, key: str, suffix: str = "") -> Optional[str]:
+        path = self.path_for(key, suffix)
+        if not os.path.exists(path):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def put(self, key: str, suffix: str, write: Callable[[str], None], evict: bool = True) -> str:
+        """Store ``write(tmp_path)``'s output; pass ``evict=False`` when adding many
+        entries and call :meth:`evict` once afterwards."""
+        path = self.path_for(key, suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", dir=os.path.dirname(path))
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        if evict:
+            self.evict()
+        return path
+
+    def discard(self, key: str, suffix: str = "") -> None:
+        try:
+            os.remove(self.path_for(key, suffix))
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        entries = []
+        total = 0
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.startswith(".tmp_"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        for _mtime, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
@@ -0,0 +1,102 @@
+"""Cache of parsed, validated input frames keyed by file content and mapping.
+
+Repeat runs over the same export skip CSV/Excel parsing and validation
+entirely. Each entry is one Arrow IPC file (see :mod:`columnar`): the parsed
+frame, its validated float metric block as extra columns and the resolved
+mapping in the schema metadata, stored under ``<app data>/Cache/inputs`` with
+size-bounded LRU eviction. Without pyarrow nothing is cached.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import columnar, io
+from .disk_cache import DiskCache, hash_key
+from .run_manager import app_data_dir
+
+CACHE_VERSION = 3
+DEFAULT_MAX_BYTES = 2 * 1024**3
+SUFFIX = ".arrow"
+# Metric block columns appended to the stored frame; no export header looks like these.
+BLOCK_PREFIX = "__metric_block__/"
+
+
+def file_digest(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class InputCache:
+    def __init__(self, root: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.store = DiskCache(root or os.path.join(app_data_dir(), "Cache", "inputs"), max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._digests: Dict[tuple, str] = {}
+
+    def digest(self, path: str) -> str:
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._digests:
+            self._digests[key] = file_digest(path)
+        return self._digests[key]
+
+    def load_validated(
+        self,
+        path: str,
+        mapping: Optional[Dict[str, str]] = None,
+        group_by: Sequence[str] = (),
+        digest: Optional[str] = None,
+    ) -> Tuple[pd.DataFrame, Dict[str, str], np.ndarray]:
+        """The validated frame, mapping and ``io.validate_required_metrics`` block; parses only on a miss.
+
+        ``digest`` (e.g. from the input store) saves hashing the file again.
+        """
+        # Auto-detected mappings are keyed as "auto" so a hit needs no header read.
+        digest = digest or self.digest(path)
+        key = hash_key(CACHE_VERSION, pd.__version__, digest, mapping or "auto", list(group_by))
+        cached = self._read(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        df, resolved = io.load_csv(path, mapping, group_by)
+        values = io.validate_required_metrics(df, resolved)
+        if columnar.available():
+            try:
+                self.store.put(key, SUFFIX, lambda tmp_path: _write_entry(tmp_path, df, resolved, values))
+            except Exception:
+                # Columns Arrow cannot type (e.g. mixed numbers and text) are simply not cached.
+                pass
+        return df, resolved, values
+
+    def _read(self, key: str) -> Optional[Tuple[pd.DataFrame, Dict[str, str], np.ndarray]]:
+        if not columnar.available():
+            return None
+        path = self.store.get(key, SUFFIX)
+        if path is None:
+            return None
+        try:
+            mapping = json.loads(columnar.read_metadata(path)["mapping"])
+            frame = columnar.read_frame(path)
+        except Exception:
+            # Unreadable (partial or from an incompatible build): drop and re-parse.
+            self.store.discard(key, SUFFIX)
+            return None
+        block_columns = [column for column in frame.columns if str(column).startswith(BLOCK_PREFIX)]
+        values = frame[block_columns].to_numpy(dtype=float)
+        return frame.drop(columns=block_columns), mapping, values
+
+
+def _write_entry(path: str, df: pd.DataFrame, mapping: Dict[str, str], values: np.ndarray) -> None:
+    names = [f"{BLOCK_PREFIX}{index}" for index in range(values.shape[1])]
+    block = pd.DataFrame(values, columns=names, index=df.index)
+    columnar.write_frame(pd.concat([df, block], axis=1), path, {"mapping": json.dumps(mapping)})
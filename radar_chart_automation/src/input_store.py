@@ -0,0 +1,153 @@
+"""Content-addressed store of raw input files shared by every run.
+
+Each selected export is kept once under ``<app data>/Store/inputs`` as
+``<digest[:2]>/<digest><ext>``, where the digest is the same SHA-256 the input
+cache and run manifest key on; it is computed from the bytes as they are copied
+in, so storing a file reads it once. A run's ``01_raw_input/`` entry is a
+hardlink to the stored file, a reflink (copy-on-write clone) where hardlinks are
+unavailable, and a plain copy only as a last resort, so re-running the same
+exports no longer adds a full copy per run. File permissions are left as the
+export had them. Stored files that no run manifest lists any more are removed
+by :meth:`InputStore.prune`, at most once per ``PRUNE_INTERVAL_SECONDS``.
+"""
+
+import hashlib
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+from typing import Optional, Tuple
+
+from .run_manager import app_data_dir
+from .run_manifest import referenced_inputs
+
+# Linux FICLONE ioctl (btrfs, XFS, ...); other platforms fall back to a copy.
+_FICLONE = 0x40049409
+CHUNK_BYTES = 1024 * 1024
+PRUNE_INTERVAL_SECONDS = 24 * 60 * 60
+PRUNE_STAMP = ".last_prune"
+
+
+class InputStore:
+    def __init__(self, root: Optional[str] = None, runs_dir: Optional[str] = None):
+        self.root = root or os.path.join(app_data_dir(), "Store", "inputs")
+        self.runs_dir = runs_dir or os.path.join(app_data_dir(), "Runs")
+
+    def object_path(self, digest: str, source_name: str) -> str:
+        ext = os.path.splitext(source_name)[1].lower()
+        return os.path.join(self.root, digest[:2], f"{digest}{ext}")
+
+    def add(self, path: str) -> Tuple[str, str]:
+        """Store ``path`` unless its content is already there; returns ``(digest, stored path)``."""
+        os.makedirs(self.root, exist_ok=True)
+        # A unique temp name: load workers may add the same content at once.
+        fd, tmp_path = tempfile.mkstemp(prefix=".add_", suffix=".tmp", dir=self.root)
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, "wb") as target, open(path, "rb") as source:
+                for chunk in iter(lambda: source.read(CHUNK_BYTES), b""):
+                    digest.update(chunk)
+                    target.write(chunk)
+            digest = digest.hexdigest()
+            stored = self.object_path(digest, path)
+            if not os.path.exists(stored):
+                shutil.copystat(path, tmp_path)
+                os.makedirs(os.path.dirname(stored), exist_ok=True)
+                try:
+                    os.replace(tmp_path, stored)
+                except OSError:
+                    # Windows cannot replace a file another worker just stored.
+                    if not os.path.exists(stored):
+                        raise
+        finally:
+            _make_writable(tmp_path)
+            _remove(tmp_path)
+        return digest, stored
+
+    def link(self, stored: str, target: str) -> str:
+        """Place ``stored`` at ``target``; returns "hardlink", "reflink" or "copy"."""
+        if os.path.exists(target) and os.path.samefile(stored, target):
+            return "hardlink"
+        tmp_path = target + ".tmp"
+        _remove(tmp_path)
+        try:
+            os.link(stored, tmp_path)
+            mode = "hardlink"
+        except OSError:
+            if _reflink(stored, tmp_path):
+                mode = "reflink"
+            else:
+                shutil.copy2(stored, tmp_path)
+                mode = "copy"
+        _make_writable(target)
+        os.replace(tmp_path, target)
+        return mode
+
+    def prune_due(self, interval: float = PRUNE_INTERVAL_SECONDS) -> bool:
+        """Whether ``interval`` seconds have passed since the last :meth:`prune`."""
+        try:
+            return time.time() - os.stat(os.path.join(self.root, PRUNE_STAMP)).st_mtime >= interval
+        except OSError:
+            return True
+
+    def prune(self) -> int:
+        """Remove stored files no run manifest lists; returns how many were removed.
+
+        A file a run folder still hardlinks is kept too (a run in progress has
+        not saved its manifest yet). Nothing is removed while any manifest is
+        unreadable, since its run's inputs cannot be told apart.
+        """
+        removed = 0
+        if not os.path.isdir(self.root):
+            return removed
+        referenced = referenced_inputs(self.runs_dir)
+        if referenced is None:
+            return removed
+        with open(os.path.join(self.root, PRUNE_STAMP), "w", encoding="utf-8"):
+            pass
+        for prefix in os.scandir(self.root):
+            if not prefix.is_dir():
+                continue
+            for entry in os.scandir(prefix.path):
+                if entry.name.endswith(".tmp") or entry.stat().st_nlink > 1:
+                    continue
+                if os.path.splitext(entry.name)[0] in referenced:
+                    continue
+                _make_writable(entry.path)
+                _remove(entry.path)
+                removed += 1
+        return removed
+
+
+def _reflink(source: str, target: str) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    except OSError:
+        _remove(target)
+        return False
+    shutil.copystat(source, target)
+    return True
+
+
+def _make_writable(path: str) -> None:
+    # Windows refuses to replace or delete read-only files; elsewhere the mode is left alone.
+    if os.name != "nt":
+        return
+    try:
+        os.chmod(path, stat.S_IREAD | stat.S_IWRITE)
+    except OSError:
+        pass
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
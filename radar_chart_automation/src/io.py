@@ -1,10 +1,16 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
+import importlib.util
 import os
+import re
 
+import numpy as np
 import pandas as pd
 
+from .timing import timed
+from .utils import pick_date_column
+
 NAME_COLUMN_CANDIDATES = [
     "about",
     "athlete",
@@ -34,6 +40,18 @@ METRIC_COLUMNS = {
 
 REQUIRED_KEYS = ["athlete_name"] + list(METRIC_COLUMNS.keys())
 
+# Optional cohort grouping columns; any other group name matches a header of the same name.
+GROUP_COLUMNS = {
+    "team": ["team", "team name", "squad"],
+    "position": ["position", "pos", "position group"],
+    "sex": ["sex", "gender"],
+}
+
+EXCEL_EXTENSIONS = [".xlsx", ".xlsm"]
+
+# Offending cells listed per column in a validation report; the rest are only counted.
+MAX_REPORTED_CELLS = 10
+
 
 @dataclass
 class ColumnMappingResult:
@@ -78,41 +96,258 @@ def detect_column_mapping(columns) -> ColumnMappingResult:
     return ColumnMappingResult(mapping=mapping, missing_keys=missing)
 
 
-def load_csv(path: str, mapping: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+@timed("read_header")
+def read_header(path: str) -> List[str]:
+    # Only the header row is parsed, so mapping problems surface before any data is read.
     ext = os.path.splitext(path)[1].lower()
-    if ext in [".xlsx", ".xlsm"]:
-        df = pd.read_excel(path, engine="openpyxl")
-    elif ext == ".xls":
+    if ext in EXCEL_EXTENSIONS:
+        return pd.read_excel(path, engine=excel_engine(), nrows=0).columns.tolist()
+    if ext == ".xls":
         raise ValueError("Legacy .xls files are not supported. Please save as .xlsx.")
-    else:
-        df = pd.read_csv(path)
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def group_key(name: str) -> str:
+    """Mapping key (and output column) for a grouping column name: "Team Name" -> "team_name"."""
+    key = re.sub(r"\W+", "_", str(name).strip().lower()).strip("_")
+    if not key:
+        raise ValueError(f"Invalid grouping column name: {name!r}")
+    return key
+
+
+def resolve_mapping(columns, mapping: Optional[Dict[str, str]] = None, group_by=()) -> Dict[str, str]:
+    """Required fields plus one entry per ``group_by`` key (see :func:`group_key`)."""
     if mapping:
         missing = [key for key in REQUIRED_KEYS if key not in mapping]
         if missing:
-            raise ColumnMappingNeeded(df.columns.tolist(), missing, mapping)
+            raise ColumnMappingNeeded(list(columns), missing, mapping)
     else:
-        result = detect_column_mapping(df.columns)
-        mapping = result.mapping
+        result = detect_column_mapping(columns)
         if result.missing_keys:
-            raise ColumnMappingNeeded(df.columns.tolist(), result.missing_keys, mapping)
+            raise ColumnMappingNeeded(list(columns), result.missing_keys, result.mapping)
+        mapping = result.mapping
+    if not group_by:
+        return mapping
+
+    mapping = dict(mapping)
+    missing = []
+    for key in group_by:
+        if key not in mapping:
+            col = _match_column(columns, GROUP_COLUMNS.get(key, [key.replace("_", " "), key]))
+            if col:
+                mapping[key] = col
+            else:
+                missing.append(key)
+    if missing:
+        raise ColumnMappingNeeded(list(columns), missing, mapping)
+    return mapping
 
+
+def projected_columns(columns, mapping: Dict[str, str]) -> List[str]:
+    # Mapped columns plus the date column; absent names are left for validation to report.
+    wanted = list(mapping.values())
+    date_column = pick_date_column(columns)
+    if date_column:
+        wanted.append(date_column)
+    present = set(columns)
+    return [col for col in dict.fromkeys(wanted) if col in present]
+
+
+def load_csv(path: str, mapping: Optional[Dict[str, str]] = None, group_by=()) -> pd.DataFrame:
+    columns = read_header(path)
+    mapping = resolve_mapping(columns, mapping, group_by)
+
+    usecols = projected_columns(columns, mapping)
+    metric_columns = {mapping[key] for key in METRIC_COLUMNS if mapping[key] in usecols}
+    dtype = {col: "float64" for col in metric_columns}
+    try:
+        df = _read_columns(path, columns, usecols, dtype)
+    except ValueError:
+        # A non-numeric cell; re-read untyped so validation can report the column.
+        df = _read_columns(path, columns, usecols, None)
     return df, mapping
 
 
-def validate_required_metrics(df: pd.DataFrame, mapping: Dict[str, str]) -> None:
-    errors = []
-    for key, col in mapping.items():
-        if col not in df.columns:
-            errors.append(f"Missing column: {col}")
-            continue
-        if key == "athlete_name":
-            if df[col].isna().any():
-                errors.append(f"Missing athlete name values in column: {col}")
+def read_selected_columns(path: str, usecols: List[str]) -> pd.DataFrame:
+    """Read only ``usecols`` from a CSV or workbook, with inferred types."""
+    return _read_columns(path, read_header(path), usecols, None)
+
+
+def excel_engine() -> str:
+    # python-calamine is optional; when installed it parses workbooks natively.
+    if importlib.util.find_spec("python_calamine") is not None:
+        return "calamine"
+    return "openpyxl"
+
+
+@timed("read_columns")
+def _read_columns(path: str, columns: List[str], usecols: List[str], dtype) -> pd.DataFrame:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in EXCEL_EXTENSIONS:
+        if excel_engine() == "calamine":
+            return pd.read_excel(path, engine="calamine", usecols=usecols, dtype=dtype)
+        return read_excel_columns(path, columns, usecols, dtype)
+    return pd.read_csv(path, usecols=usecols, dtype=dtype)
+
+
+def read_excel_columns(
+    path: str, columns: List[str], usecols: List[str], dtype: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """Stream the first sheet in read-only mode, keeping only ``usecols``.
+
+    ``columns`` is the header as returned by ``read_header``; values are
+    collected per column while rows stream past and typed once at the end,
+    matching ``pd.read_excel(usecols=..., dtype=...)``.
+    """
+    from openpyxl import load_workbook
+
+    positions = sorted(columns.index(col) for col in usecols)
+    names = [columns[pos] for pos in positions]
+    collected: List[list] = [[] for _ in positions]
+
+    workbook = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    n_rows = 0
+    try:
+        sheet = workbook.worksheets[0]
+        sheet.reset_dimensions()
+        rows = sheet.iter_rows(values_only=True)
+        next(rows, None)
+        for row in rows:
+            width = len(row)
+            for values, pos in zip(collected, positions):
+                values.append(row[pos] if pos < width else None)
+            # pandas drops trailing rows with no values in any column.
+            if any(cell is not None and cell != "" for cell in row):
+                n_rows = len(collected[0]) if collected else 0
+    finally:
+        workbook.close()
+
+    dtype = dtype or {}
+    data = {
+        name: _typed_column(values[:n_rows], dtype.get(name)) for name, values in zip(names, collected)
+    }
+    return pd.DataFrame(data, columns=names)
+
+
+def _typed_column(values: list, dtype: Optional[str]):
+    if dtype is not None:
+        try:
+            return np.array([np.nan if value is None else value for value in values], dtype=dtype)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Could not convert column to {dtype}: {exc}") from exc
+    series = pd.Series([np.nan if value is None else value for value in values], dtype=object)
+    # Like pandas' parser: numeric-looking columns become numbers, others keep inferred types.
+    try:
+        return pd.to_numeric(series)
+    except (TypeError, ValueError):
+        return series.infer_objects()
+
+
+@dataclass
+class InvalidCell:
+    column: str
+    row: int
+    value: object
+
+
+@dataclass
+class ValidationReport:
+    """Problems found in one export; ``row`` numbers count the header as row 1."""
+
+    missing_columns: List[str] = field(default_factory=list)
+    missing_name_rows: List[int] = field(default_factory=list)
+    missing_name_count: int = 0
+    invalid_counts: Dict[str, int] = field(default_factory=dict)
+    # The first MAX_REPORTED_CELLS offending cells of each column, with their raw values.
+    invalid_cells: List[InvalidCell] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing_columns or self.missing_name_count or self.invalid_counts)
+
+    def summary(self) -> str:
+        errors = [f"Missing column: {col}" for col in self.missing_columns]
+        if self.missing_name_count:
+            rows = ", ".join(str(row) for row in self.missing_name_rows)
+            errors.append(f"Missing athlete name values in {self.missing_name_count} row(s) (rows {rows})")
+        for col, count in self.invalid_counts.items():
+            cells = ", ".join(
+                f"row {cell.row}: {_describe_value(cell.value)}" for cell in self.invalid_cells if cell.column == col
+            )
+            more = f", +{count - MAX_REPORTED_CELLS} more" if count > MAX_REPORTED_CELLS else ""
+            errors.append(f"Non-numeric or missing values in column: {col} ({cells}{more})")
+        return "; ".join(errors)
+
+
+class InputValidationError(ValueError):
+    def __init__(self, report: ValidationReport):
+        super().__init__(report.summary())
+        self.report = report
+
+
+def _describe_value(value) -> str:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return "empty"
+    return repr(value)
+
+
+def _sheet_rows(positions: np.ndarray) -> List[int]:
+    # Spreadsheet row numbers: the header is row 1.
+    return [int(pos) + 2 for pos in positions[:MAX_REPORTED_CELLS]]
+
+
+def metric_block(df: pd.DataFrame, mapping: Dict[str, str], report: Optional[ValidationReport] = None) -> np.ndarray:
+    """Coerce the mapped metric columns into one ``(rows, metrics)`` float block.
+
+    Columns are in ``METRIC_COLUMNS`` order. Float columns are copied straight
+    in; others go through ``pd.to_numeric`` once. Cells that do not convert are
+    NaN in the block and recorded in ``report`` (or raised if none is given).
+    """
+    own_report = report is None
+    report = report if report is not None else ValidationReport()
+    columns = [mapping[key] for key in METRIC_COLUMNS]
+    block = np.full((len(df), len(columns)), np.nan)
+    present = np.array([col in df.columns for col in columns])
+    for pos, col in enumerate(columns):
+        if not present[pos]:
+            if col not in report.missing_columns:
+                report.missing_columns.append(col)
             continue
-        numeric = pd.to_numeric(df[col], errors="coerce")
-        if numeric.isna().any():
-            errors.append(f"Non-numeric or missing values in column: {col}")
-        else:
-            df[col] = numeric
-    if errors:
-        raise ValueError("; ".join(errors))
+        series = df[col]
+        if series.dtype.kind not in "fiub":
+            series = pd.to_numeric(series, errors="coerce")
+        block[:, pos] = series.to_numpy(dtype=float, na_value=np.nan)
+
+    # One NaN scan over the whole block; raw values are fetched only for offending rows.
+    bad = np.isnan(block) & present
+    if bad.any():
+        for pos in np.flatnonzero(bad.any(axis=0)):
+            col = columns[pos]
+            rows = np.flatnonzero(bad[:, pos])
+            report.invalid_counts[col] = len(rows)
+            raw = df[col].iloc[rows[:MAX_REPORTED_CELLS]].tolist()
+            report.invalid_cells.extend(InvalidCell(col, row, value) for row, value in zip(_sheet_rows(rows), raw))
+    if own_report and not report.ok:
+        raise InputValidationError(report)
+    return block
+
+
+@timed("validate_required_metrics")
+def validate_required_metrics(df: pd.DataFrame, mapping: Dict[str, str]) -> np.ndarray:
+    """Check names and metrics in one pass and return the validated metric block.
+
+    Raises :class:`InputValidationError` whose ``report`` lists every missing
+    column and the rows and raw values of the offending cells.
+    """
+    report = ValidationReport()
+    name_col = mapping["athlete_name"]
+    if name_col not in df.columns:
+        report.missing_columns.append(name_col)
+    else:
+        missing = np.flatnonzero(df[name_col].isna().to_numpy())
+        report.missing_name_count = len(missing)
+        report.missing_name_rows = _sheet_rows(missing)
+    block = metric_block(df, mapping, report)
+    if not report.ok:
+        raise InputValidationError(report)
+    return block
@@ -0,0 +1,201 @@
+"""Memory instrumentation and a process memory ceiling for long chart runs.
+
+With a :class:`MemoryMonitor` active, :func:`stage` records the resident set
+size (RSS) before/after and sampled peak, the tracemalloc peak of Python
+allocations, and the number of live matplotlib figures for each stage.
+:func:`enforce_ceiling` flushes (garbage collection plus a caller-supplied
+release step) when RSS passes the ceiling and raises
+:class:`MemoryCeilingExceeded` if that did not bring it back under, so a run
+stops before the machine starts swapping.
+
+RSS comes from psutil when installed, ``/proc/self/statm`` on Linux, or the
+Win32 process counters on Windows; elsewhere it is ``None`` and only
+tracemalloc figures are reported.
+"""
+
+import gc
+import importlib.util
+import json
+import os
+import sys
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Callable, List, Optional
+
+MB = 1024 * 1024
+_HAS_PSUTIL = importlib.util.find_spec("psutil") is not None
+
+_current: ContextVar[Optional["MemoryMonitor"]] = ContextVar("memory_monitor", default=None)
+
+
+class MemoryCeilingExceeded(RuntimeError):
+    """Raised when memory stays above the configured ceiling after a flush."""
+
+
+def rss_bytes() -> Optional[int]:
+    if _HAS_PSUTIL:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    if os.path.exists("/proc/self/statm"):
+        with open("/proc/self/statm", "r", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    if sys.platform.startswith("win"):
+        return _windows_rss()
+    return None
+
+
+def _windows_rss() -> Optional[int]:
+    import ctypes
+    from ctypes import wintypes
+
+    class Counters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = Counters()
+    counters.cb = ctypes.sizeof(Counters)
+    handle = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+        return None
+    return counters.WorkingSetSize
+
+
+def live_figures() -> int:
+    # Only count when pyplot is already loaded; importing it here would cost memory itself.
+    pyplot = sys.modules.get("matplotlib.pyplot")
+    return len(pyplot.get_fignums()) if pyplot is not None else 0
+
+
+@dataclass
+class MemoryRecord:
+    stage: str
+    rss_before: Optional[int]
+    rss_after: Optional[int]
+    rss_peak: Optional[int]
+    traced_peak: Optional[int]
+    live_figures: int
+
+
+class MemoryMonitor:
+    def __init__(self, trace: bool = True):
+        self.trace = trace
+        self.records: List[MemoryRecord] = []
+        self._started_tracing = False
+        self._peak: Optional[int] = None
+
+    def start(self) -> None:
+        if self.trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def sample(self) -> Optional[int]:
+        rss = rss_bytes()
+        if rss is not None and (self._peak is None or rss > self._peak):
+            self._peak = rss
+        return rss
+
+    @contextmanager
+    def stage(self, name: str):
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        outer_peak = self._peak
+        self._peak = None
+        before = self.sample()
+        try:
+            yield
+        finally:
+            after = self.sample()
+            traced_peak = tracemalloc.get_traced_memory()[1] if tracing else None
+            self.records.append(MemoryRecord(name, before, after, self._peak, traced_peak, live_figures()))
+            if outer_peak is not None and (self._peak is None or outer_peak > self._peak):
+                self._peak = outer_peak
+
+    def format_table(self) -> str:
+        lines = [f"{'Stage':<24} {'RSS before':>11} {'RSS after':>10} {'RSS peak':>9} {'Py peak':>8} {'Figures':>8}"]
+        for record in self.records:
+            lines.append(
+                f"{record.stage[:24]:<24} {_mb(record.rss_before):>11} {_mb(record.rss_after):>10} "
+                f"{_mb(record.rss_peak):>9} {_mb(record.traced_peak):>8} {record.live_figures:>8}"
+            )
+        return "\n".join(lines)
+
+    def write_metrics(self, path: str, section: str) -> None:
+        """Add the stage records as ``memory`` under ``section`` of a metrics JSON file."""
+        data = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    data = json.load(handle)
+            except (OSError, ValueError):
+                data = {}
+        data.setdefault(section, {})["memory"] = [asdict(record) for record in self.records]
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2)
+        os.replace(tmp_path, path)
+
+
+def _mb(value: Optional[int]) -> str:
+    return "n/a" if value is None else f"{value / MB:.0f} MB"
+
+
+def stage(name: str):
+    monitor = _current.get()
+    return monitor.stage(name) if monitor is not None else nullcontext()
+
+
+def sample() -> None:
+    monitor = _current.get()
+    if monitor is not None:
+        monitor.sample()
+
+
+@contextmanager
+def monitoring(monitor: Optional[MemoryMonitor]):
+    """Make ``monitor`` active (and tracing) for the block; ``None`` disables it."""
+    token = _current.set(monitor)
+    if monitor is not None:
+        monitor.start()
+    try:
+        yield monitor
+    finally:
+        if monitor is not None:
+            monitor.stop()
+        _current.reset(token)
+
+
+def enforce_ceiling(ceiling_bytes: Optional[int], flush: Optional[Callable[[], None]] = None) -> None:
+    """Flush when RSS is over ``ceiling_bytes``; raise if it is still over afterwards."""
+    if not ceiling_bytes:
+        return
+    rss = rss_bytes()
+    if rss is None or rss <= ceiling_bytes:
+        return
+    if flush is not None:
+        flush()
+    gc.collect()
+    rss = rss_bytes()
+    if rss is not None and rss > ceiling_bytes:
+        raise MemoryCeilingExceeded(
+            f"Memory use {rss / MB:.0f} MB is above the {ceiling_bytes / MB:.0f} MB ceiling; "
+            "stopping. Render fewer athletes per run or raise the ceiling."
+        )
@@ -0,0 +1,176 @@
+"""Normative reference index: score athletes against a stored population.
+
+An index is a folder holding ``index.json`` and one sorted ``.npy`` array of raw
+values per (group, axis), built from the ``percentiles_long.csv`` files of past
+runs. Arrays are memory-mapped when scoring, so a batch of k values costs k
+binary searches (O(k log n)) and never reloads the history.
+
+Scoring keeps the Excel RANK.EQ/COUNT semantics used within a file: a value's
+percentile is its rank within the reference population plus itself, i.e.
+``(count of reference values below it + 1) / (n + 1)``.
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import columnar
+from .disk_cache import hash_key
+from .input_cache import file_digest
+from .percentiles import AXIS_LABELS
+from .run_manager import app_data_dir
+
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+DEFAULT_GROUP = "all"
+LONG_CSV = os.path.join("02_percentiles", "percentiles_long.csv")
+
+
+def default_norms_dir() -> str:
+    return os.path.join(app_data_dir(), "Norms")
+
+
+def group_key(values: Sequence) -> str:
+    """Join grouping column values (e.g. sport, sex) into one index key."""
+    return "|".join(str(value) for value in values) if len(values) else DEFAULT_GROUP
+
+
+def percent_rank(sorted_values: np.ndarray, values) -> np.ndarray:
+    below = np.searchsorted(sorted_values, np.asarray(values, dtype=float), side="left")
+    return (below + 1) / (len(sorted_values) + 1)
+
+
+class NormReference:
+    """Sorted reference values for one group, keyed by axis label."""
+
+    def __init__(self, group: str, arrays: Dict[str, np.ndarray], identity: str = ""):
+        self.group = group
+        self.arrays = arrays
+        self.identity = identity
+
+    def count(self, axis_label: str) -> int:
+        return len(self.arrays[axis_label])
+
+    def percent_rank(self, axis_label: str, values) -> np.ndarray:
+        return percent_rank(self.arrays[axis_label], values)
+
+
+class NormsIndex:
+    def __init__(self, root: str, data: Optional[dict] = None):
+        self.root = root
+        data = data or {}
+        self.group_by: List[str] = data.get("group_by", [])
+        self.sources: List[str] = data.get("sources", [])
+        # group -> axis label -> {"file": ..., "count": ...}
+        self.groups: Dict[str, Dict[str, dict]] = data.get("groups", {})
+
+    @classmethod
+    def open(cls, root: str) -> "NormsIndex":
+        path = os.path.join(root, INDEX_FILE)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Norms index not found: {path}")
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported norms index version in {path}")
+        return cls(root, data)
+
+    @classmethod
+    def open_or_create(cls, root: str, group_by: Sequence[str] = ()) -> "NormsIndex":
+        if os.path.exists(os.path.join(root, INDEX_FILE)):
+            index = cls.open(root)
+            if group_by and list(group_by) != index.group_by:
+                raise ValueError(
+                    f"Norms index {root} is grouped by {index.group_by or 'nothing'}, not {list(group_by)}"
+                )
+            return index
+        index = cls(root)
+        index.group_by = list(group_by)
+        return index
+
+    @property
+    def identity(self) -> str:
+        # Changes whenever the population changes, so cached scores can be invalidated.
+        return hash_key(os.path.abspath(self.root), self.group_by, self.sources)
+
+    def reference(self, group: str = DEFAULT_GROUP) -> NormReference:
+        axes = self.groups.get(group)
+        if not axes:
+            available = ", ".join(sorted(self.groups)) or "none"
+            raise ValueError(f"No norms for group '{group}' (available: {available})")
+        missing = [axis for axis in AXIS_LABELS if axis not in axes]
+        if missing:
+            raise ValueError(f"Norms group '{group}' has no values for: {', '.join(missing)}")
+        arrays = {axis: np.load(os.path.join(self.root, axes[axis]["file"]), mmap_mode="r") for axis in AXIS_LABELS}
+        return NormReference(group, arrays, hash_key(self.identity, group))
+
+    def add_long(self, long_df: pd.DataFrame, source: str) -> bool:
+        """Merge a percentiles_long frame into the index; False if ``source`` is already in it."""
+        if source in self.sources:
+            return False
+        missing = [column for column in self.group_by if column not in long_df.columns]
+        if missing:
+            raise ValueError(f"Missing grouping column(s) for norms: {', '.join(missing)}")
+
+        values = pd.to_numeric(long_df["raw_value"], errors="coerce")
+        frame = long_df.assign(raw_value=values).dropna(subset=["raw_value"])
+        if self.group_by:
+            grouped = frame.groupby(self.group_by, sort=False)
+        else:
+            grouped = [((), frame)]
+        os.makedirs(self.root, exist_ok=True)
+        for keys, group_frame in grouped:
+            keys = keys if isinstance(keys, tuple) else (keys,)
+            group = group_key(keys)
+            for axis, axis_frame in group_frame.groupby("metric_key", sort=False):
+                self._merge(group, axis, axis_frame["raw_value"].to_numpy(dtype=float))
+        self.sources.append(source)
+        return True
+
+    def _merge(self, group: str, axis: str, new_values: np.ndarray) -> None:
+        entry = self.groups.setdefault(group, {}).setdefault(
+            axis, {"file": f"{hash_key(group, axis)[:16]}.npy", "count": 0}
+        )
+        path = os.path.join(self.root, entry["file"])
+        existing = np.load(path) if os.path.exists(path) else np.empty(0)
+        merged = np.concatenate([existing, new_values])
+        merged.sort(kind="mergesort")
+        tmp_path = path + ".tmp.npy"
+        np.save(tmp_path, merged)
+        os.replace(tmp_path, path)
+        entry["count"] = int(len(merged))
+
+    def save(self) -> None:
+        data = {
+            "version": INDEX_VERSION,
+            "group_by": self.group_by,
+            "sources": self.sources,
+            "groups": self.groups,
+        }
+        path = os.path.join(self.root, INDEX_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+
+def long_csv_path(path: str) -> str:
+    """Accept either a run folder or a percentiles_long.csv path."""
+    return os.path.join(path, LONG_CSV) if os.path.isdir(path) else path
+
+
+def build_index(root: str, paths: Iterable[str], group_by: Sequence[str] = ()) -> NormsIndex:
+    """Add past runs (run folders or percentiles_long.csv files) to the index at ``root``."""
+    index = NormsIndex.open_or_create(root, group_by)
+    for path in paths:
+        csv_path = long_csv_path(path)
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(f"Percentiles file not found: {csv_path}")
+        columns = ["metric_key", "raw_value", *index.group_by]
+        long_df = columnar.read_table(csv_path, columns)
+        index.add_long(long_df, file_digest(csv_path))
+    index.save()
+    return index
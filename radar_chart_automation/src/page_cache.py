@@ -0,0 +1,86 @@
+"""Rendered chart pages shared across runs, keyed by content.
+
+A page's key hashes the athlete name, its ordered date -> values series, the
+chart style version and backend (``run_manifest.page_hash``) plus the output
+format and PNG resolution. Entries are single-page PDFs and PNG files under
+``<app data>/Cache/pages`` with size-bounded LRU eviction, so rebuilding the
+same athletes under another run title or for a subset copies their pages
+instead of drawing them again.
+"""
+
+import os
+import shutil
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .disk_cache import DiskCache, hash_key
+from .rendering import PNG_DPI, PageJob, png_filename
+from .run_manager import app_data_dir
+
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 1024**3
+
+
+@dataclass
+class CachedPage:
+    pdf: str
+    png: Optional[str] = None
+
+
+class PageCache:
+    def __init__(self, root: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.store = DiskCache(root or os.path.join(app_data_dir(), "Cache", "pages"), max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(page_hash: str, fmt: str) -> str:
+        return hash_key(CACHE_VERSION, page_hash, fmt, PNG_DPI if fmt == "png" else None)
+
+    def lookup(self, jobs: List[PageJob], hashes: Dict[str, str], need_png: bool = False) -> Dict[str, CachedPage]:
+        """Cached pages (athlete -> files) for ``jobs``; with ``need_png`` a hit needs both files."""
+        found = {}
+        for job in jobs:
+            pdf = self.store.get(self._key(hashes[job.athlete], "pdf"), ".pdf")
+            png = self.store.get(self._key(hashes[job.athlete], "png"), ".png") if need_png else None
+            if pdf is not None and (png is not None or not need_png):
+                found[job.athlete] = CachedPage(pdf, png)
+        self.hits += len(found)
+        self.misses += len(jobs) - len(found)
+        return found
+
+    def restore_pngs(self, found: Dict[str, CachedPage], png_dir: str) -> None:
+        os.makedirs(png_dir, exist_ok=True)
+        for athlete, page in found.items():
+            if page.png is not None:
+                shutil.copyfile(page.png, os.path.join(png_dir, png_filename(athlete)))
+
+    def add(
+        self,
+        pdf_path: str,
+        pages: List[Tuple[int, PageJob]],
+        hashes: Dict[str, str],
+        png_dir: Optional[str] = None,
+    ) -> None:
+        """Store ``(page index in pdf_path, job)`` pages, and their PNGs from ``png_dir``."""
+        if not pages:
+            return
+        from pypdf import PdfReader, PdfWriter
+
+        reader = PdfReader(pdf_path)
+        for index, job in pages:
+            page_hash = hashes[job.athlete]
+
+            def write_page(tmp_path, index=index):
+                writer = PdfWriter()
+                writer.add_page(reader.pages[index])
+                with open(tmp_path, "wb") as handle:
+                    writer.write(handle)
+                writer.close()
+
+            self.store.put(self._key(page_hash, "pdf"), ".pdf", write_page, evict=False)
+            png = os.path.join(png_dir, png_filename(job.athlete)) if png_dir else None
+            if png is not None and os.path.exists(png):
+                key = self._key(page_hash, "png")
+                self.store.put(key, ".png", lambda tmp_path, src=png: shutil.copyfile(src, tmp_path), evict=False)
+        self.store.evict()
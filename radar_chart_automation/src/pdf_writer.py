@@ -0,0 +1,337 @@
+"""Direct PDF writer for radar report pages, bypassing matplotlib.
+
+Pages are emitted as raw PDF drawing operators using the standard Helvetica
+fonts (nothing is embedded). The polygon grid and the ring/axis labels never
+change, so they are written once as form XObjects shared by every page; each
+page only adds its polygons, title, legend and table.
+"""
+
+import math
+import zlib
+from typing import Dict, List, Optional
+
+from .chart_style import (
+    AXIS_LABELS,
+    DATE_COLORS,
+    RING_LEVELS,
+    TABLE_COL_WIDTHS,
+    axis_angles,
+    delta_color,
+    format_delta,
+    format_percentile,
+    percentile_table_rows,
+    values_to_points,
+)
+
+PAGE_WIDTH = 612.0
+PAGE_HEIGHT = 792.0
+
+# Advance widths (1/1000 em) of printable ASCII, from the Adobe core font AFMs.
+_HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 222, 333, 333, 389, 584,
+    278, 333, 278, 278, 556, 556, 556, 556, 556, 556, 556, 556,
+    556, 556, 278, 278, 584, 584, 584, 556, 1015, 667, 667, 722,
+    722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278,
+    278, 278, 469, 556, 222, 556, 556, 500, 556, 556, 278, 556,
+    556, 222, 222, 500, 222, 833, 556, 556, 556, 556, 333, 500,
+    278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 278, 333, 333, 389, 584,
+    278, 333, 278, 278, 556, 556, 556, 556, 556, 556, 556, 556,
+    556, 556, 333, 333, 584, 584, 584, 611, 975, 722, 722, 722,
+    722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333,
+    278, 333, 584, 556, 278, 556, 611, 556, 611, 556, 333, 611,
+    611, 278, 278, 556, 278, 889, 611, 611, 611, 611, 389, 556,
+    333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+_DEFAULT_WIDTH = 556
+_ASCENT = 0.718
+_DESCENT = 0.207
+
+
+def _layout():
+    # Mirrors RadarFigureRenderer: 8.5x11 figure, gridspec ratios [3.2, 1.55],
+    # hspace 0.08 and subplots_adjust(top=0.92, bottom=0.07, left=0.06, right=0.94).
+    def cell_heights(top, bottom):
+        total = (top - bottom) * PAGE_HEIGHT
+        cell = total / (2 + 0.08)
+        return [cell * 2 * ratio / 4.75 for ratio in (3.2, 1.55)]
+
+    left, right, top, bottom = 0.06 * PAGE_WIDTH, 0.94 * PAGE_WIDTH, 0.92 * PAGE_HEIGHT, 0.07 * PAGE_HEIGHT
+    radar_h, table_h = cell_heights(0.92, 0.07)
+    width = right - left
+    radar_bottom = top - radar_h
+    # Equal aspect on +/-1.25 limits shrinks the radar axes to a centred square.
+    side = min(width, radar_h)
+    # Table rows are sized as 1.2x the default 10pt font against matplotlib's
+    # default subplot params, then scaled 1.35x and stretched with the axes.
+    _, default_table_h = cell_heights(0.88, 0.11)
+    return {
+        "cx": left + width / 2,
+        "cy": radar_bottom + radar_h / 2,
+        "scale": side / 2.5,
+        "legend_top": radar_bottom + (radar_h - side) / 2 + 0.02 * side - 5.0,
+        "table_left": left,
+        "table_width": width,
+        "table_cy": bottom + table_h / 2,
+        "row_h": 10.0 * 1.2 * 1.35 * table_h / default_table_h,
+    }
+
+
+LAYOUT = _layout()
+
+
+def text_width(text: str, size: float, bold: bool = False) -> float:
+    widths = _HELVETICA_BOLD_WIDTHS if bold else _HELVETICA_WIDTHS
+    total = 0
+    for char in text:
+        code = ord(char) - 32
+        total += widths[code] if 0 <= code < len(widths) else _DEFAULT_WIDTH
+    return total * size / 1000.0
+
+
+def _num(value: float) -> str:
+    text = f"{value:.2f}".rstrip("0").rstrip(".")
+    return text if text not in ("", "-0") else "0"
+
+
+def _rgb(color: str) -> str:
+    color = color.lstrip("#")
+    return " ".join(_num(int(color[i : i + 2], 16) / 255.0) for i in (0, 2, 4))
+
+
+def encodable(text: str) -> bool:
+    """Whether ``text`` fits the WinAnsi (cp1252) built-in fonts; other characters print as "?"."""
+    try:
+        str(text).encode("cp1252")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def _pdf_string(text: str) -> bytes:
+    raw = str(text).encode("cp1252", errors="replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _text(
+    x: float, y: float, text: str, size: float, color: str, ha: str = "center", va: str = "center", bold: bool = False
+) -> bytes:
+    width = text_width(text, size, bold)
+    if ha == "center":
+        x -= width / 2
+    elif ha == "right":
+        x -= width
+    if va == "center":
+        y -= (_ASCENT - _DESCENT) * size / 2
+    elif va == "bottom":
+        y += _DESCENT * size
+    font = "/F2" if bold else "/F1"
+    head = f"BT {font} {_num(size)} Tf {_rgb(color)} rg {_num(x)} {_num(y)} Td ".encode("ascii")
+    return head + _pdf_string(text) + b" Tj ET\n"
+
+
+def _path(points, close: bool) -> str:
+    cx, cy, scale = LAYOUT["cx"], LAYOUT["cy"], LAYOUT["scale"]
+    parts = []
+    for index, (x, y) in enumerate(points):
+        op = "m" if index == 0 else "l"
+        parts.append(f"{_num(cx + x * scale)} {_num(cy + y * scale)} {op}")
+    if close:
+        parts.append("h")
+    return " ".join(parts)
+
+
+def _grid_stream() -> bytes:
+    angles = axis_angles(len(AXIS_LABELS))
+    ops = ["q 1 w 1 j 2 J", f"{_rgb('#cccccc')} RG"]
+    for level in RING_LEVELS:
+        ops.append(_path(values_to_points([level] * len(AXIS_LABELS), angles), close=False) + " S")
+    ops.append(f"{_rgb('#e0e0e0')} RG")
+    for angle in angles:
+        ops.append(_path([(0.0, 0.0), (math.cos(angle), math.sin(angle))], close=False) + " S")
+    ops.append("Q")
+    return ("\n".join(ops) + "\n").encode("ascii")
+
+
+def _labels_stream() -> bytes:
+    cx, cy, scale = LAYOUT["cx"], LAYOUT["cy"], LAYOUT["scale"]
+    out = []
+    for level in RING_LEVELS:
+        out.append(_text(cx, cy + level / 100.0 * scale, f"{level}%", 9, "#555555", va="bottom"))
+    for angle, label in zip(axis_angles(len(AXIS_LABELS)), AXIS_LABELS):
+        x = 1.12 * math.cos(angle)
+        y = 1.12 * math.sin(angle)
+        alignment = "center"
+        if x < -0.1:
+            alignment = "right"
+        elif x > 0.1:
+            alignment = "left"
+        out.append(_text(cx + x * scale, cy + y * scale, label, 11, "#000000", ha=alignment))
+    return b"".join(out)
+
+
+def _page_stream(athlete_name: str, date_to_values: Dict[str, List[float]], deltas=None) -> bytes:
+    angles = axis_angles(len(AXIS_LABELS))
+    series = []
+    for idx, (date_label, values) in enumerate(date_to_values.items()):
+        color = DATE_COLORS[idx % len(DATE_COLORS)]
+        series.append((date_label, color, values_to_points(values, angles)))
+
+    # Same stacking as matplotlib: fills, then grid lines, then data lines, then text.
+    out = [b"q /GS15 gs 1 w 1 j\n"]
+    for _label, color, points in series:
+        out.append(f"{_rgb(color)} rg {_rgb(color)} RG {_path(points[:-1], close=True)} b\n".encode("ascii"))
+    out.append(b"Q\n/Grid Do\nq 2 w 1 j 2 J\n")
+    for _label, color, points in series:
+        out.append(f"{_rgb(color)} RG {_path(points, close=False)} S\n".encode("ascii"))
+    out.append(b"Q\n/Labels Do\n")
+
+    out.append(_text(PAGE_WIDTH / 2, 0.965 * PAGE_HEIGHT, athlete_name, 18, "#000000"))
+    out.append(_legend(series))
+    out.append(_table(date_to_values, {label: color for label, color, _points in series}, deltas))
+    return b"".join(out)
+
+
+def _legend(series) -> bytes:
+    if not series:
+        return b""
+    size = 10.0
+    handle, pad, spacing, row = 2.0 * size, 0.8 * size, 2.0 * size, 1.2 * size + 0.5 * size
+    # matplotlib fills legend columns top to bottom, first column gets the extra entry.
+    per_column = (len(series) + 1) // 2
+    columns = [series[:per_column], series[per_column:]]
+    columns = [column for column in columns if column]
+    widths = [handle + pad + max(text_width(label, size) for label, _c, _p in column) for column in columns]
+    x = LAYOUT["cx"] - (sum(widths) + spacing * (len(widths) - 1)) / 2
+    out = []
+    for column, width in zip(columns, widths):
+        y = LAYOUT["legend_top"] - 0.4 * size - row / 2
+        for label, color, _points in column:
+            line = f"q 2 w {_rgb(color)} RG {_num(x)} {_num(y)} m {_num(x + handle)} {_num(y)} l S Q\n"
+            out.append(line.encode("ascii"))
+            out.append(_text(x + handle + pad, y, label, size, "#000000", ha="left"))
+            y -= row
+        x += width + spacing
+    return b"".join(out)
+
+
+def _table(date_to_values: Dict[str, List[float]], date_colors: Dict[str, str], deltas=None) -> bytes:
+    rows = [("header", None, None)] + percentile_table_rows(date_to_values, deltas)
+    row_h = LAYOUT["row_h"]
+    col_widths = [fraction * LAYOUT["table_width"] for fraction in TABLE_COL_WIDTHS]
+    top = LAYOUT["table_cy"] + row_h * len(rows) / 2
+    faces = {"header": "#f2f4f7", "date": "#ffffff", "delta": "#f7f7f7"}
+
+    cells = [f"q 1 w {_rgb('#d0d0d0')} RG"]
+    out = []
+    for index, (row_type, date_label, values) in enumerate(rows):
+        y = top - (index + 1) * row_h
+        if row_type == "header":
+            texts = ["Date", *AXIS_LABELS]
+            colors = ["#000000"] * len(texts)
+            bold = [True] * len(texts)
+        elif row_type == "date":
+            texts = [date_label, *[format_percentile(v) for v in values]]
+            colors = [date_colors.get(date_label, "#222222")] * len(texts)
+            bold = [True] + [False] * len(values)
+        else:
+            texts = ["Delta", *[format_delta(v) for v in values]]
+            colors = ["#444444", *[delta_color(v) for v in values]]
+            bold = [True] + [False] * len(values)
+        x = LAYOUT["table_left"]
+        for col, width in enumerate(col_widths):
+            cells.append(f"{_rgb(faces[row_type])} rg {_num(x)} {_num(y)} {_num(width)} {_num(row_h)} re B")
+            out.append(_text(x + width / 2, y + row_h / 2, texts[col], 9, colors[col], bold=bold[col]))
+            x += width
+    cells.append("Q\n")
+    return "\n".join(cells).encode("ascii") + b"".join(out)
+
+
+class RadarPdfWriter:
+    """Streams radar pages into a PDF file; use as a context manager."""
+
+    def __init__(self, path: str):
+        self._handle = open(path, "wb")
+        self._offsets: Dict[int, int] = {}
+        self._page_ids: List[int] = []
+        self._next_id = 3  # 1 = catalog, 2 = page tree; both written on close.
+        self._handle.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+        regular = self._write_object(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        bold = self._write_object(
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>"
+        )
+        alpha = self._write_object(b"<< /Type /ExtGState /ca 0.15 /CA 0.15 >>")
+        fonts = f"/Font << /F1 {regular} 0 R /F2 {bold} 0 R >>"
+        form_resources = self._write_object(f"<< {fonts} >>".encode("ascii"))
+        grid = self._write_stream(_grid_stream(), self._form_dict(form_resources))
+        labels = self._write_stream(_labels_stream(), self._form_dict(form_resources))
+        self._resources = self._write_object(
+            (
+                f"<< {fonts} /XObject << /Grid {grid} 0 R /Labels {labels} 0 R >> "
+                f"/ExtGState << /GS15 {alpha} 0 R >> >>"
+            ).encode("ascii")
+        )
+
+    def add_page(
+        self,
+        athlete_name: str,
+        date_to_values: Dict[str, List[float]],
+        deltas: Optional[Dict[str, List[float]]] = None,
+    ) -> None:
+        contents = self._write_stream(_page_stream(athlete_name, date_to_values, deltas))
+        page = self._write_object(
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_num(PAGE_WIDTH)} {_num(PAGE_HEIGHT)}] "
+                f"/Resources {self._resources} 0 R /Contents {contents} 0 R >>"
+            ).encode("ascii")
+        )
+        self._page_ids.append(page)
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        kids = " ".join(f"{page} 0 R" for page in self._page_ids)
+        self._write_object(f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>".encode("ascii"), 2)
+        self._write_object(b"<< /Type /Catalog /Pages 2 0 R >>", 1)
+
+        xref_offset = self._handle.tell()
+        size = self._next_id
+        lines = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+        for object_id in range(1, size):
+            lines.append(f"{self._offsets[object_id]:010d} 00000 n \n")
+        lines.append(f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n")
+        self._handle.write("".join(lines).encode("ascii"))
+        self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._handle.close()
+
+    def _form_dict(self, resources: int) -> str:
+        return (
+            f"/Type /XObject /Subtype /Form /BBox [0 0 {_num(PAGE_WIDTH)} {_num(PAGE_HEIGHT)}] "
+            f"/Resources {resources} 0 R"
+        )
+
+    def _write_object(self, body: bytes, object_id: Optional[int] = None) -> int:
+        if object_id is None:
+            object_id = self._next_id
+            self._next_id += 1
+        self._offsets[object_id] = self._handle.tell()
+        self._handle.write(f"{object_id} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+        return object_id
+
+    def _write_stream(self, data: bytes, extra: str = "") -> int:
+        compressed = zlib.compress(data, 6)
+        head = f"<< {extra} /Filter /FlateDecode /Length {len(compressed)} >>\nstream\n".replace("<<  ", "<< ")
+        return self._write_object(head.encode("ascii") + compressed + b"\nendstream")
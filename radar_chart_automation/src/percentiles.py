@@ -1,7 +1,11 @@
-from typing import Dict, List, Tuple
+from typing import Dict, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
+from . import io
+from .timing import timed
+
 AXIS_LABELS = ["Jump Height", "Triple Ext", "Elasticity", "Loading", "Braking"]
 
 METRIC_TO_AXIS = {
@@ -13,55 +17,78 @@ METRIC_TO_AXIS = {
 }
 
 
-def compute_percentiles(df: pd.DataFrame, mapping: Dict[str, str]):
+@timed("compute_percentiles")
+def compute_percentiles(
+    df: pd.DataFrame,
+    mapping: Dict[str, str],
+    reference=None,
+    values: Optional[np.ndarray] = None,
+    group_by: Sequence[str] = (),
+):
     # Excel-like percent rank: RANK.EQ(value, range, 1) / COUNT(range).
+    # With a reference (norms.NormReference for exact ranks, sketches.SketchSet
+    # for approximate ones) the range is a stored population, not the file's rows.
+    # ``values`` is the block from io.validate_required_metrics for these rows;
+    # without it the metric columns are coerced and checked here.
+    # ``group_by`` keys (io.group_key, resolved through ``mapping``) split the
+    # rows into cohorts ranked separately; the outputs carry one column per key.
+    # A reference already is one population, so it cannot be combined with them.
     n = len(df)
     if n == 0:
         raise ValueError("No athlete rows found in CSV.")
+    if reference is not None and group_by:
+        raise ValueError("Cohort grouping cannot be combined with norms; pick a norms group instead.")
 
-    athlete_col = mapping["athlete_name"]
-    records: List[dict] = []
-    wide_records: List[dict] = []
+    athlete_names = df[mapping["athlete_name"]].to_numpy()
+    raw = values if values is not None else io.metric_block(df, mapping)
+    groups = {key: group_labels(df[mapping[key]]) for key in group_by}
 
-    percentiles_by_metric: Dict[str, pd.Series] = {}
-    for metric_key, axis_label in METRIC_TO_AXIS.items():
-        col = mapping[metric_key]
-        series = pd.to_numeric(df[col], errors="coerce")
-        if series.isna().any():
-            raise ValueError(f"Non-numeric or missing values in column: {col}")
-        count = int(series.count())
-        if count == 0:
-            raise ValueError(f"No numeric values found in column: {col}")
-        ranks = series.rank(method="min", ascending=True)
-        percent = ranks / count
-        percentiles_by_metric[axis_label] = percent
+    # Rank every metric column in one call; positional arrays keep the result
+    # independent of whatever index the caller's frame carries.
+    axis_labels = list(METRIC_TO_AXIS.values())
+    if reference is None and groups:
+        # One grouped rank over all cohorts; each row divides by its own cohort's size.
+        codes = np.zeros(n, dtype=np.int64)
+        for labels in groups.values():
+            codes = codes * len(labels.categories) + labels.codes
+        codes = pd.factorize(codes)[0]
+        ranks = pd.DataFrame(raw).groupby(codes).rank(method="min", ascending=True).to_numpy()
+        percent = ranks / np.bincount(codes)[codes][:, None]
+    elif reference is None:
+        ranks = pd.DataFrame(raw).rank(method="min", ascending=True).to_numpy()
+        percent = ranks / n
+    else:
+        percent = np.column_stack(
+            [reference.percent_rank(axis_label, raw[:, pos]) for pos, axis_label in enumerate(axis_labels)]
+        )
 
-    for idx, row in df.iterrows():
-        athlete_name = row[athlete_col]
-        wide_row = {"athlete_name": athlete_name}
-        for axis_label, series in percentiles_by_metric.items():
-            percentile = float(series.iloc[idx])
-            wide_row[f"{axis_label} percentile"] = percentile
-            records.append(
-                {
-                    "athlete_name": athlete_name,
-                    "metric_key": axis_label,
-                    "raw_value": float(row[mapping[_axis_to_metric(axis_label)]]),
-                    "percentile_0_1": percentile,
-                }
-            )
-        wide_records.append(wide_row)
+    wide_df = pd.DataFrame({"athlete_name": athlete_names, **groups})
+    for pos, axis_label in enumerate(axis_labels):
+        wide_df[f"{axis_label} percentile"] = percent[:, pos]
 
-    long_df = pd.DataFrame(records)
-    wide_df = pd.DataFrame(wide_records)
+    # Row-major ravel of the (athletes, axes) block is the athlete-by-axis stack.
+    long_df = pd.DataFrame(
+        {
+            "athlete_name": np.repeat(athlete_names, len(axis_labels)),
+            **{
+                key: pd.Categorical.from_codes(np.repeat(labels.codes, len(axis_labels)), labels.categories)
+                for key, labels in groups.items()
+            },
+            "metric_key": np.tile(axis_labels, n),
+            "raw_value": raw.ravel(),
+            "percentile_0_1": percent.ravel(),
+        }
+    )
     return long_df, wide_df
 
 
-def _axis_to_metric(axis_label: str) -> str:
-    for key, label in METRIC_TO_AXIS.items():
-        if label == axis_label:
-            return key
-    raise KeyError(axis_label)
+def group_labels(series: pd.Series) -> pd.Categorical:
+    """Cohort labels as stripped strings; a blank or missing value is its own cohort ("")."""
+    # Normalise each distinct value once, then merge values that differ only in whitespace.
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    names = np.array(["" if pd.isna(value) else str(value).strip() for value in uniques], dtype=object)
+    merged, categories = pd.factorize(names)
+    return pd.Categorical.from_codes(merged[codes], categories)
 
 
 def validate_percentile_behavior(series: pd.Series) -> dict:
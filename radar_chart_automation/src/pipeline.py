@@ -0,0 +1,880 @@
+"""Headless load -> validate -> percentiles -> charts pipeline.
+
+The GUI and the command line both drive these functions. Anything that needs a
+human decision (unresolved column mappings, missing date labels) is delegated to
+an optional resolver callback so no dialogs are needed here.
+"""
+
+import contextvars
+import logging
+import os
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from . import (
+    columnar,
+    input_cache,
+    input_store,
+    io,
+    memory,
+    norms,
+    page_cache,
+    pdf_writer,
+    percentiles,
+    rendering,
+    run_manager,
+    run_manifest,
+    shards,
+    sketches,
+    tasks,
+    timing,
+    trends,
+    utils,
+)
+from .chart_data import ChartData
+from .version import __version__
+
+LOGGER_NAME = "radar_chart_automation"
+LABEL_COLUMN = "metrics_pull_date_label"
+LEGACY_LABEL_COLUMN = "test_date_label"
+LONG_CSV = "percentiles_long.csv"
+WIDE_CSV = "percentiles_wide.csv"
+TRENDS_CSV = "percentiles_trends.csv"
+WIDE_VALUE_COLUMNS = [f"{label} percentile" for label in percentiles.AXIS_LABELS]
+METRICS_NAME = "metrics.json"
+# Input files parsed at the same time; parsing is mostly I/O and C code.
+LOAD_WORKERS = 4
+
+# resolve_mapping(path, columns, suggested_mapping) -> mapping or None to cancel.
+MappingResolver = Callable[[str, List[str], Dict[str, str]], Optional[Dict[str, str]]]
+# resolve_date_label(path) -> raw date label text or None.
+DateLabelResolver = Callable[[str], Optional[str]]
+StatusCallback = Callable[[str], None]
+
+
+@dataclass
+class RunResult:
+    run_paths: run_manager.RunPaths
+    long_all: pd.DataFrame
+    wide_all: pd.DataFrame
+    date_labels: List[str]
+    athlete_names: List[str]
+    # st_mtime_ns of percentiles_wide.csv when written; a later edit makes make_charts re-read it.
+    wide_mtime_ns: Optional[int] = None
+    # The field name shadows the module inside this class body, hence the string annotation.
+    trends: Optional["trends.Trends"] = None
+
+    def current_wide(self) -> Optional[pd.DataFrame]:
+        """``wide_all`` if percentiles_wide.csv is unchanged since this run wrote it."""
+        path = os.path.join(self.run_paths.percentiles, WIDE_CSV)
+        try:
+            unchanged = os.stat(path).st_mtime_ns == self.wide_mtime_ns
+        except OSError:
+            unchanged = False
+        return self.wide_all if unchanged else None
+
+
+def setup_logger(log_path: str) -> logging.Logger:
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(logging.INFO)
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers = []
+    formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
+    file_handler = logging.FileHandler(log_path)
+    file_handler.setFormatter(formatter)
+    logger.addHandler(file_handler)
+    return logger
+
+
+def resolve_input_mapping(
+    path: str, columns, resolve_mapping: Optional[MappingResolver] = None, group_by: Sequence[str] = ()
+) -> Dict[str, str]:
+    """The mapping a load of ``path`` (header ``columns``) uses, group_by keys included.
+
+    ``resolve_mapping`` is asked only when detection leaves fields unmapped.
+    """
+    try:
+        return io.resolve_mapping(columns, None, group_by)
+    except io.ColumnMappingNeeded as exc:
+        if resolve_mapping is None:
+            raise
+        mapping = resolve_mapping(path, exc.columns, exc.suggested_mapping)
+        if not mapping:
+            raise ValueError("Column mapping was cancelled.")
+        return io.resolve_mapping(columns, mapping, group_by)
+
+
+def _load_validated(
+    path: str, mapping, cache: Optional[input_cache.InputCache], group_by: Sequence[str] = (), digest: Optional[str] = None
+):
+    if cache is not None:
+        return cache.load_validated(path, mapping, group_by, digest)
+    df, mapping = io.load_csv(path, mapping, group_by)
+    return df, mapping, io.validate_required_metrics(df, mapping)
+
+
+def _fallback_date_label(path: str, resolve_date_label: Optional[DateLabelResolver]) -> Optional[str]:
+    date_label = utils.infer_date_from_filename(path)
+    if not date_label and resolve_date_label is not None:
+        date_label = resolve_date_label(path)
+        if date_label:
+            date_label = utils.parse_date_label(date_label) or date_label.strip()
+    return date_label
+
+
+def session_rows(
+    df: pd.DataFrame, path: str, resolve_date_label: Optional[DateLabelResolver] = None
+) -> List[Tuple[str, Optional[np.ndarray]]]:
+    """Split an export into one ``(date_label, row positions)`` cohort per testing date, in date order.
+
+    Positions are ``None`` when every row belongs to the one date.
+    """
+    date_column = utils.pick_date_column(df.columns)
+    if date_column:
+        labels = utils.resolve_date_labels(df[date_column])
+        sessions = labels.dropna().unique()
+        if len(sessions) > 1:
+            missing = np.flatnonzero(labels.isna().to_numpy())
+            if len(missing):
+                # Spreadsheet row numbers: the header is row 1.
+                rows = ", ".join(str(index + 2) for index in missing[:10])
+                raise ValueError(
+                    f"{os.path.basename(path)} holds several test dates but {len(missing)} row(s) "
+                    f"have no readable date in column '{date_column}' (rows {rows})."
+                )
+            groups = pd.Series(np.arange(len(df))).groupby(labels.to_numpy(), sort=True).indices
+            return list(groups.items())
+        if len(sessions) == 1:
+            return [(sessions[0], None)]
+
+    date_label = _fallback_date_label(path, resolve_date_label)
+    if not date_label:
+        raise ValueError(f"No date label resolved for {os.path.basename(path)}")
+    return [(date_label, None)]
+
+
+def run_processing(
+    files: List[str],
+    run_title: str = "",
+    resolve_mapping: Optional[MappingResolver] = None,
+    resolve_date_label: Optional[DateLabelResolver] = None,
+    status: Optional[StatusCallback] = None,
+    use_cache: bool = True,
+    incremental: bool = True,
+    progress: Optional[tasks.ProgressCallback] = None,
+    cancel: Optional[tasks.CancelToken] = None,
+    norms_dir: Optional[str] = None,
+    norms_group: str = norms.DEFAULT_GROUP,
+    norms_sketch: Optional[str] = None,
+    update_sketch: bool = False,
+    collect_timings: bool = True,
+    memory_profile: bool = False,
+    memory_ceiling_mb: Optional[int] = None,
+    group_by: Sequence[str] = (),
+    trend_baseline: Optional[str] = None,
+    trend_window: int = trends.DEFAULT_WINDOW,
+) -> RunResult:
+    if not files:
+        raise ValueError("No input files selected.")
+    status = status or _noop_status
+    # Cohort grouping columns by key ("Team Name" -> "team_name"), each once.
+    group_by = list(dict.fromkeys(io.group_key(name) for name in group_by))
+
+    default_title = os.path.splitext(os.path.basename(files[0]))[0]
+    run_paths = run_manager.create_run_folder(run_title, default_title=default_title)
+    logger = setup_logger(os.path.join(run_paths.logs, "run.log"))
+    logger.info("Radar Chart Automation v%s", __version__)
+    logger.info("Selected CSVs: %s", ", ".join(files))
+
+    ceiling = _ceiling_bytes(memory_ceiling_mb)
+    with _instrumented("run_processing", run_paths.logs, logger, collect_timings, memory_profile):
+        store = input_store.InputStore()
+        if store.prune_due():
+            # Reads every run's manifest, so at most once a day rather than on every run.
+            with timing.span("prune_input_store"):
+                pruned = store.prune()
+            if pruned:
+                logger.info("Removed %s stored input(s) no run uses any more", pruned)
+
+        cache = input_cache.InputCache() if use_cache else None
+        # Without incremental mode the manifest starts empty but is still written for next time.
+        manifest = (
+            run_manifest.RunManifest.load(run_paths.base) if incremental else run_manifest.RunManifest(run_paths.base)
+        )
+
+        try:
+            reference = None
+            if norms_dir and norms_sketch:
+                raise ValueError("Choose either a norms index or a norms sketch, not both.")
+            if group_by and (norms_dir or norms_sketch):
+                raise ValueError("Cohort grouping cannot be combined with norms; pick a norms group instead.")
+            if norms_sketch:
+                reference = sketches.SketchSet.load(norms_sketch)
+                logger.info(
+                    "Scoring against norms sketch %s (%s values per axis, estimated rank error %.2f%%)",
+                    norms_sketch,
+                    min(reference.count(axis) for axis in percentiles.AXIS_LABELS),
+                    reference.error_estimate() * 100,
+                )
+            elif norms_dir:
+                reference = norms.NormsIndex.open(norms_dir).reference(norms_group)
+                logger.info(
+                    "Scoring against norms %s (group %s, %s values per axis)",
+                    norms_dir,
+                    norms_group,
+                    min(reference.count(axis) for axis in percentiles.AXIS_LABELS),
+                )
+            scoring = _scoring(reference, group_by, manifest.inputs)
+            if group_by:
+                logger.info("Ranking within cohorts of: %s", ", ".join(group_by))
+
+            status(f"Loading {len(files)} file(s)...")
+            with memory.stage("load_files"):
+                results = _process_files(
+                    files,
+                    run_paths.raw_input,
+                    store,
+                    manifest,
+                    cache,
+                    resolve_mapping,
+                    resolve_date_label,
+                    logger,
+                    progress,
+                    cancel,
+                    reference,
+                    group_by,
+                    ceiling,
+                )
+
+            long_frames = []
+            wide_frames = []
+            date_labels = []
+            digests = []
+            for path, (digest, file_labels, long_df, wide_df, mapping, columns) in zip(files, results):
+                if mapping is not None:
+                    manifest.record_input(digest, path, columns, mapping, file_labels, long_df, wide_df, scoring)
+                digests.append(digest)
+                date_labels.extend(file_labels)
+                long_frames.append(long_df)
+                wide_frames.append(wide_df)
+
+            long_all = pd.concat(long_frames, ignore_index=True)
+            wide_all = pd.concat(wide_frames, ignore_index=True)
+
+            wide_path = os.path.join(run_paths.percentiles, WIDE_CSV)
+            with timing.span("write_percentiles"), memory.stage("write_percentiles"):
+                columnar.write_table(long_all, os.path.join(run_paths.percentiles, LONG_CSV))
+                columnar.write_table(wide_all, wide_path)
+            wide_mtime_ns = os.stat(wide_path).st_mtime_ns
+            with timing.span("compute_trends"), memory.stage("compute_trends"):
+                run_trends = write_trends(run_paths.percentiles, wide_all, trend_baseline, trend_window)
+            if cache is not None:
+                logger.info("Input cache: %s hit(s), %s miss(es)", cache.hits, cache.misses)
+            manifest.retain_inputs(digests)
+            manifest.save()
+            if update_sketch:
+                _update_sketch(sketches.default_sketch_path(), zip(digests, long_frames), logger)
+        except tasks.Cancelled:
+            logger.info("Run cancelled.")
+            raise
+        except Exception as exc:
+            logger.error("Run failed: %s", exc)
+            logger.error(traceback.format_exc())
+            raise
+
+    athlete_names = sorted(wide_all["athlete_name"].unique().tolist())
+    return RunResult(
+        run_paths=run_paths,
+        long_all=long_all,
+        wide_all=wide_all,
+        date_labels=date_labels,
+        athlete_names=athlete_names,
+        wide_mtime_ns=wide_mtime_ns,
+        trends=run_trends,
+    )
+
+
+def _ceiling_bytes(ceiling_mb: Optional[int]) -> Optional[int]:
+    return int(ceiling_mb * memory.MB) if ceiling_mb else None
+
+
+@contextmanager
+def _instrumented(action: str, logs_dir: str, logger: logging.Logger, enabled: bool, memory_profile: bool = False):
+    """Time ``action`` and its stages; the summary goes to run.log and logs/metrics.json.
+
+    With ``memory_profile`` the memory stages are recorded and logged the same way.
+    """
+    monitor = memory.MemoryMonitor() if memory_profile else None
+    with memory.monitoring(monitor):
+        try:
+            with memory.stage(action):
+                with _timed(action, logs_dir, logger, enabled):
+                    yield
+        finally:
+            if monitor is not None:
+                logger.info("Memory summary (%s):\n%s", action, monitor.format_table())
+                try:
+                    monitor.write_metrics(os.path.join(logs_dir, METRICS_NAME), action)
+                except OSError as exc:
+                    logger.warning("Could not write memory metrics: %s", exc)
+
+
+@contextmanager
+def _timed(action: str, logs_dir: str, logger: logging.Logger, enabled: bool):
+    if not enabled:
+        yield
+        return
+    recorder = timing.Recorder()
+    with timing.recording(recorder):
+        try:
+            with timing.span(action):
+                yield
+        finally:
+            logger.info("Timing summary (%s):\n%s", action, recorder.format_table())
+            pages = recorder.wall_percentiles()
+            if pages:
+                logger.info(
+                    "Page render seconds: p50 %.3f, p90 %.3f, p99 %.3f, max %.3f (%s pages)",
+                    pages["p50"],
+                    pages["p90"],
+                    pages["p99"],
+                    pages["max"],
+                    pages["count"],
+                )
+            try:
+                recorder.write_metrics(os.path.join(logs_dir, METRICS_NAME), action)
+            except OSError as exc:
+                logger.warning("Could not write timing metrics: %s", exc)
+
+
+def _update_sketch(path: str, sources, logger: logging.Logger) -> None:
+    # Fold this run's raw values into the local sketch; inputs already in it are skipped.
+    # The sketch is a by-product, so a damaged file must not fail the run.
+    try:
+        sketch_set = sketches.SketchSet.load_or_create(path)
+        added = sum(sketch_set.add_long(long_df, digest) for digest, long_df in sources)
+        if added:
+            sketch_set.save(path)
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("Could not update norms sketch %s: %s", path, exc)
+        return
+    logger.info(
+        "Norms sketch %s: %s new input(s), %s values per axis",
+        path,
+        added,
+        sketch_set.count(percentiles.AXIS_LABELS[0]),
+    )
+
+
+def _process_files(
+    files,
+    raw_input,
+    store,
+    manifest,
+    cache,
+    resolve_mapping,
+    resolve_date_label,
+    logger,
+    progress,
+    cancel,
+    reference,
+    group_by=(),
+    ceiling=None,
+):
+    """Load and compute every file concurrently; results come back in input order."""
+    tracker = tasks.ProgressTracker("files", len(files), progress)
+    executor = ThreadPoolExecutor(max_workers=max(1, min(LOAD_WORKERS, len(files))))
+    try:
+        futures = {
+            # Each worker thread runs in a copy of this context so timing spans reach the recorder.
+            executor.submit(
+                contextvars.copy_context().run,
+                _process_file,
+                path,
+                raw_input,
+                store,
+                manifest,
+                cache,
+                resolve_mapping,
+                resolve_date_label,
+                logger,
+                cancel,
+                reference,
+                group_by,
+            ): path
+            for path in files
+        }
+        for future in as_completed(futures):
+            future.result()
+            tracker.advance(item=os.path.basename(futures[future]))
+            memory.sample()
+            memory.enforce_ceiling(ceiling)
+            if cancel is not None:
+                cancel.check()
+        return [future.result() for future in futures]
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _process_file(
+    path, raw_input, store, manifest, cache, resolve_mapping, resolve_date_label, logger, cancel, reference, group_by
+):
+    # Returns (digest, date_labels, long_df, wide_df, mapping, columns); mapping is None when reused.
+    if cancel is not None:
+        cancel.check()
+    with timing.span(f"file:{os.path.basename(path)}"):
+        digest = _store_input(path, raw_input, store, logger)
+        return _process_file_timed(
+            path, digest, manifest, cache, resolve_mapping, resolve_date_label, logger, reference, group_by
+        )
+
+
+def _store_input(path, raw_input, store, logger) -> str:
+    # One read copies the file into the store and hashes it on the way; the digest
+    # then keys the input cache and the manifest without reading the file again.
+    with timing.span("store_input"):
+        digest, stored = store.add(path)
+        mode = store.link(stored, os.path.join(raw_input, os.path.basename(path)))
+    if mode == "copy":
+        logger.info("Copied %s into the run folder (links are not supported here)", path)
+    return digest
+
+
+def _scoring(reference, group_by, own_sources=()) -> str:
+    # Manifest identity of how percentiles were ranked; reused frames must match it.
+    if reference is None:
+        scoring = "cohort"
+    elif isinstance(reference, sketches.SketchSet):
+        # A sketch this run's inputs were folded into (--update-sketch) is still the one they were scored against.
+        scoring = reference.identity_excluding(own_sources)
+    else:
+        scoring = reference.identity
+    return f"{scoring}|by:{','.join(group_by)}" if group_by else scoring
+
+
+def _process_file_timed(
+    path, digest, manifest, cache, resolve_mapping, resolve_date_label, logger, reference, group_by
+):
+    scoring = _scoring(reference, group_by, manifest.inputs)
+    # A recorded digest has the same header, so only a new input's header is read here.
+    columns = manifest.input_columns(digest)
+    if columns is None:
+        columns = io.read_header(path)
+    mapping = resolve_input_mapping(path, columns, resolve_mapping, group_by)
+    reused = manifest.cached_percentiles(digest, mapping, scoring)
+    if reused is not None:
+        entry, long_df, wide_df = reused
+        logger.info("Unchanged input %s; reusing percentiles for %s", path, ", ".join(entry["date_labels"]))
+        return digest, entry["date_labels"], long_df, wide_df, None, columns
+
+    df, mapping, values = _load_validated(path, mapping, cache, group_by, digest)
+    logger.info("Column mapping for %s: %s", path, mapping)
+
+    sessions = session_rows(df, path, resolve_date_label)
+    date_labels = [date_label for date_label, _ in sessions]
+    logger.info("Date label(s) for %s: %s", path, ", ".join(date_labels))
+
+    long_frames = []
+    wide_frames = []
+    for date_label, rows in sessions:
+        # The validated block is sliced with its rows; nothing is coerced again.
+        session_df, session_values = (df, values) if rows is None else (df.iloc[rows], values[rows])
+        long_df, wide_df = percentiles.compute_percentiles(
+            session_df, mapping, reference, session_values, group_by
+        )
+        long_df[LABEL_COLUMN] = date_label
+        wide_df[LABEL_COLUMN] = date_label
+        long_frames.append(long_df)
+        wide_frames.append(wide_df)
+        logger.info("Processed %s athletes for %s", len(wide_df), date_label)
+    if len(sessions) == 1:
+        return digest, date_labels, long_frames[0], wide_frames[0], mapping, columns
+    long_all = pd.concat(long_frames, ignore_index=True)
+    wide_all = pd.concat(wide_frames, ignore_index=True)
+    return digest, date_labels, long_all, wide_all, mapping, columns
+
+
+def read_percentiles_wide(run_folder: str) -> pd.DataFrame:
+    percentiles_path = os.path.join(run_folder, "02_percentiles", WIDE_CSV)
+    if not os.path.exists(percentiles_path):
+        raise FileNotFoundError(f"Percentiles file not found: {percentiles_path}")
+    return columnar.read_table(percentiles_path)
+
+
+def chart_data(wide_all: pd.DataFrame) -> ChartData:
+    label_col = LABEL_COLUMN
+    if label_col not in wide_all.columns:
+        label_col = LEGACY_LABEL_COLUMN
+    if label_col not in wide_all.columns:
+        raise ValueError("Missing Metrics Pull Date column in percentiles.")
+    return ChartData.from_wide(wide_all, label_col, WIDE_VALUE_COLUMNS)
+
+
+def write_trends(
+    percentiles_dir: str, wide_all: pd.DataFrame, baseline: Optional[str] = None, window: int = trends.DEFAULT_WINDOW
+) -> trends.Trends:
+    """Compute every athlete's trends across the run's dates and write percentiles_trends."""
+    if baseline:
+        baseline = utils.parse_date_label(baseline) or baseline.strip()
+    run_trends = trends.compute_trends(chart_data(wide_all), baseline, window)
+    columnar.write_table(run_trends.to_frame(LABEL_COLUMN), os.path.join(percentiles_dir, TRENDS_CSV))
+    return run_trends
+
+
+def read_trends(run_folder: str, data: ChartData) -> trends.Trends:
+    """percentiles_trends if it is at least as new as percentiles_wide and covers ``data``, else recomputed."""
+    percentiles_dir = os.path.join(run_folder, "02_percentiles")
+    path = os.path.join(percentiles_dir, TRENDS_CSV)
+    try:
+        fresh = os.stat(path).st_mtime_ns >= os.stat(os.path.join(percentiles_dir, WIDE_CSV)).st_mtime_ns
+    except OSError:
+        fresh = False
+    if fresh:
+        try:
+            return trends.Trends.from_frame(columnar.read_table(path), LABEL_COLUMN, data.athletes, data.dates)
+        except (KeyError, ValueError):
+            pass
+    # Run folders from older versions, or percentiles edited by hand.
+    return trends.compute_trends(data)
+
+
+def athlete_groups(run_folder: str, wide_all: pd.DataFrame, column: str) -> Dict[str, str]:
+    """Map athlete -> value of ``column`` (last one seen), from the percentiles or the run's inputs."""
+    groups: Dict[str, str] = {}
+
+    def add(names, values):
+        for name, value in zip(names, values):
+            if not pd.isna(value) and str(value).strip():
+                groups[name] = str(value).strip()
+
+    match = _find_column(wide_all.columns, column)
+    if match:
+        add(wide_all["athlete_name"], wide_all[match])
+        return groups
+
+    found = False
+    manifest = run_manifest.RunManifest.load(run_folder)
+    for digest, entry in manifest.inputs.items():
+        path = os.path.join(run_folder, "01_raw_input", entry["source"])
+        if not os.path.exists(path):
+            # Removed from the run folder: the shared store still has the content.
+            path = input_store.InputStore().object_path(digest, entry["source"])
+        if not os.path.exists(path):
+            continue
+        match = _find_column(io.read_header(path), column)
+        name_column = entry["mapping"]["athlete_name"]
+        if not match:
+            continue
+        found = True
+        df = io.read_selected_columns(path, list(dict.fromkeys([name_column, match])))
+        add(df[name_column], df[match])
+    if not found:
+        raise ValueError(f"Column '{column}' was not found in the percentiles or in this run's input files.")
+    return groups
+
+
+def _find_column(columns, name: str) -> Optional[str]:
+    lookup = {str(column).strip().lower(): column for column in columns}
+    return lookup.get(name.strip().lower())
+
+
+def chart_pdf_path(run_folder: str, run_title: str = "") -> str:
+    if run_title:
+        pdf_name = f"{utils.sanitize_title(run_title)}__radars.pdf"
+    else:
+        pdf_name = f"{os.path.basename(run_folder)}__radars.pdf"
+    return os.path.join(run_folder, "03_outputs", pdf_name)
+
+
+def make_charts(
+    run_folder: Union[str, RunResult],
+    run_title: str = "",
+    export_png: bool = False,
+    athletes: Optional[Iterable[str]] = None,
+    status: Optional[StatusCallback] = None,
+    workers: Optional[int] = None,
+    backend: str = "matplotlib",
+    incremental: bool = True,
+    progress: Optional[tasks.ProgressCallback] = None,
+    cancel: Optional[tasks.CancelToken] = None,
+    collect_timings: bool = True,
+    memory_profile: bool = False,
+    memory_ceiling_mb: Optional[int] = None,
+    shard_by: Optional[str] = None,
+    shard_pages: Optional[int] = None,
+    shard_mb: Optional[float] = None,
+    use_page_cache: bool = True,
+) -> str:
+    """Render the charts for a run folder, or straight from the :class:`RunResult` just computed.
+
+    Returns the PDF path, or with any ``shard_*`` option the path of the shard
+    index (one PDF per group of ``shard_by`` and/or per ``shard_pages`` /
+    ``shard_mb`` worth of pages).
+    """
+    status = status or _noop_status
+    result = None
+    if isinstance(run_folder, RunResult):
+        result, run_folder = run_folder, run_folder.run_paths.base
+    logs_dir = os.path.join(run_folder, "logs")
+    os.makedirs(logs_dir, exist_ok=True)
+    logger = setup_logger(os.path.join(logs_dir, "run.log"))
+    pages = page_cache.PageCache() if use_page_cache else None
+    with _instrumented("make_charts", logs_dir, logger, collect_timings, memory_profile):
+        try:
+            return _build_charts(
+                run_folder,
+                result,
+                run_title,
+                export_png,
+                athletes,
+                status,
+                workers,
+                backend,
+                incremental,
+                progress,
+                cancel,
+                _ceiling_bytes(memory_ceiling_mb),
+                (shard_by, shard_pages, shard_mb),
+                pages,
+            )
+        finally:
+            if pages is not None:
+                logger.info("Page cache: %s hit(s), %s miss(es)", pages.hits, pages.misses)
+
+
+def _build_charts(
+    run_folder,
+    result,
+    run_title,
+    export_png,
+    athletes,
+    status,
+    workers,
+    backend,
+    incremental,
+    progress,
+    cancel,
+    ceiling,
+    sharding=(None, None, None),
+    pages=None,
+):
+    wide_all = result.current_wide() if result is not None else None
+    run_trends = result.trends if wide_all is not None else None
+    if wide_all is None:
+        with timing.span("read_percentiles"):
+            wide_all = read_percentiles_wide(run_folder)
+    data = chart_data(wide_all)
+    if run_trends is None:
+        with timing.span("read_trends"):
+            run_trends = read_trends(run_folder, data)
+    selected_athletes = set(athletes) if athletes is not None else None
+    # Series iterate dates in store order, so every page lists them in run order;
+    # the table's deltas come precomputed from the trend stage.
+    jobs = [
+        rendering.PageJob(athlete, data.series(athlete), run_trends.deltas(athlete))
+        for athlete in data.athletes
+        if selected_athletes is None or athlete in selected_athletes
+    ]
+    if not jobs:
+        # Checked before anything is rendered, so the existing PDF and manifest are left as they were.
+        if selected_athletes is None:
+            raise ValueError("No athletes found in the percentiles.")
+        raise ValueError(f"No matching athletes in this run: {', '.join(sorted(selected_athletes))}")
+    if backend == "pdf":
+        unprintable = [job.athlete for job in jobs if not pdf_writer.encodable(job.athlete)]
+        if unprintable:
+            message = (
+                f"{len(unprintable)} name(s) have characters the pdf backend cannot show and print them as '?' "
+                f"(e.g. {unprintable[0]}); use the matplotlib backend for these charts."
+            )
+            logging.getLogger(LOGGER_NAME).warning(message)
+            status(message)
+
+    pdf_path = chart_pdf_path(run_folder, run_title)
+    pdf_name = os.path.basename(pdf_path)
+    png_dir = os.path.join(run_folder, "03_outputs", "png") if export_png else None
+
+    manifest = run_manifest.RunManifest.load(run_folder)
+    hashes = {job.athlete: run_manifest.page_hash(job.athlete, job.date_to_values, backend) for job in jobs}
+    if any(sharding):
+        shard_by, shard_pages, shard_mb = sharding
+        groups = athlete_groups(run_folder, wide_all, shard_by) if shard_by else None
+        plan = shards.plan_shards(jobs, groups, shards.pages_per_shard(shard_pages, shard_mb, backend))
+        return _build_shards(
+            plan,
+            pdf_path,
+            png_dir,
+            manifest,
+            hashes,
+            status,
+            workers,
+            backend,
+            incremental,
+            progress,
+            cancel,
+            ceiling,
+            pages,
+        )
+    reuse = manifest.reusable_pages(pdf_name, backend, hashes, need_png=export_png) if incremental else {}
+    png_athletes = set(manifest.png_athletes(pdf_name)) & set(reuse)
+    cached = _cached_pages(pages, [job for job in jobs if job.athlete not in reuse], hashes, png_dir)
+    fresh = [(index, job) for index, job in enumerate(jobs) if job.athlete not in reuse and job.athlete not in cached]
+
+    tracker = tasks.ProgressTracker("pages", len(fresh), progress)
+
+    def on_pages(done_jobs):
+        tracker.advance(len(done_jobs), item=done_jobs[-1].athlete)
+        if cancel is not None:
+            cancel.check()
+
+    status("Building PDF charts...")
+    try:
+        with timing.span("render_pages"), memory.stage("render_pages"):
+            if reuse or cached:
+                status(f"Reusing {len(reuse) + len(cached)} unchanged page(s); rendering {len(fresh)}.")
+                rendering.render_incremental(
+                    pdf_path,
+                    jobs,
+                    reuse,
+                    png_dir=png_dir,
+                    workers=workers,
+                    backend=backend,
+                    on_pages=on_pages,
+                    memory_ceiling=ceiling,
+                    cached={athlete: page.pdf for athlete, page in cached.items()},
+                )
+            else:
+                rendering.render_pages(
+                    pdf_path,
+                    jobs,
+                    png_dir=png_dir,
+                    workers=workers,
+                    backend=backend,
+                    on_pages=on_pages,
+                    memory_ceiling=ceiling,
+                )
+    except (tasks.Cancelled, memory.MemoryCeilingExceeded) as exc:
+        # A fresh render leaves a truncated PDF behind; an incremental one never touched it.
+        if not reuse and not cached and os.path.exists(pdf_path):
+            os.remove(pdf_path)
+        status("Chart build cancelled." if isinstance(exc, tasks.Cancelled) else str(exc))
+        raise
+    if export_png:
+        png_athletes.update(job.athlete for job in jobs)
+    if pages is not None:
+        with timing.span("page_cache_store"):
+            pages.add(pdf_path, fresh, hashes, png_dir)
+
+    manifest.record_chart(pdf_name, backend, [(job.athlete, hashes[job.athlete]) for job in jobs], png_athletes)
+    manifest.save()
+    status("Charts complete.")
+    return pdf_path
+
+
+def _cached_pages(pages, jobs, hashes, png_dir):
+    """Page-cache hits for ``jobs``, with their PNGs already copied into ``png_dir``."""
+    if pages is None or not jobs:
+        return {}
+    with timing.span("page_cache_lookup"):
+        cached = pages.lookup(jobs, hashes, need_png=png_dir is not None)
+        if png_dir is not None:
+            pages.restore_pngs(cached, png_dir)
+    return cached
+
+
+def _build_shards(
+    plan, pdf_path, png_dir, manifest, hashes, status, workers, backend, incremental, progress, cancel, ceiling, pages
+):
+    out_dir = shards.shard_dir(pdf_path)
+    os.makedirs(out_dir, exist_ok=True)
+    folder = os.path.basename(out_dir)
+    export_png = png_dir is not None
+
+    # A shard is skipped when every page in it is unchanged and in the same place.
+    pending = []
+    for shard in plan:
+        key = os.path.join(folder, shard.filename)
+        reuse = manifest.reusable_pages(key, backend, hashes, need_png=export_png) if incremental else {}
+        if reuse != {job.athlete: index for index, job in enumerate(shard.jobs)}:
+            pending.append(shard)
+    keep = {shard.filename for shard in plan}
+    for name in os.listdir(out_dir):
+        if name.endswith(".pdf") and name not in keep:
+            os.remove(os.path.join(out_dir, name))
+            manifest.charts.pop(os.path.join(folder, name), None)
+
+    cached = _cached_pages(pages, [job for shard in pending for job in shard.jobs], hashes, png_dir)
+    tracker = tasks.ProgressTracker("pages", sum(len(shard.jobs) for shard in pending) - len(cached), progress)
+
+    def on_pages(done_jobs):
+        tracker.advance(len(done_jobs), item=done_jobs[-1].athlete)
+        if cancel is not None:
+            cancel.check()
+
+    status(f"Building {len(pending)} of {len(plan)} PDF shard(s)...")
+    try:
+        with timing.span("render_pages"), memory.stage("render_pages"):
+            # Shards with cached pages are assembled one by one; the rest render together.
+            fresh_shards = []
+            for shard in pending:
+                path = os.path.join(out_dir, shard.filename)
+                hits = {job.athlete: cached[job.athlete].pdf for job in shard.jobs if job.athlete in cached}
+                if not hits:
+                    fresh_shards.append((path, shard.jobs))
+                    continue
+                rendering.render_incremental(
+                    path,
+                    shard.jobs,
+                    {},
+                    png_dir=png_dir,
+                    workers=workers,
+                    backend=backend,
+                    on_pages=on_pages,
+                    memory_ceiling=ceiling,
+                    cached=hits,
+                )
+            rendering.render_shards(
+                fresh_shards,
+                png_dir=png_dir,
+                workers=workers,
+                backend=backend,
+                on_pages=on_pages,
+                memory_ceiling=ceiling,
+            )
+    except (tasks.Cancelled, memory.MemoryCeilingExceeded) as exc:
+        # Shards being written may be truncated; drop them so the next run redoes them.
+        for shard in pending:
+            path = os.path.join(out_dir, shard.filename)
+            if os.path.exists(path):
+                os.remove(path)
+            manifest.charts.pop(os.path.join(folder, shard.filename), None)
+        manifest.save()
+        status("Chart build cancelled." if isinstance(exc, tasks.Cancelled) else str(exc))
+        raise
+
+    if pages is not None:
+        with timing.span("page_cache_store"):
+            for shard in pending:
+                fresh = [(index, job) for index, job in enumerate(shard.jobs) if job.athlete not in cached]
+                pages.add(os.path.join(out_dir, shard.filename), fresh, hashes, png_dir)
+
+    index_path = os.path.join(out_dir, shards.INDEX_NAME)
+    shards.write_index(index_path, plan)
+    for shard in pending:
+        ordered = [(job.athlete, hashes[job.athlete]) for job in shard.jobs]
+        athletes = [job.athlete for job in shard.jobs] if export_png else ()
+        manifest.record_chart(os.path.join(folder, shard.filename), backend, ordered, athletes)
+    manifest.save()
+    status("Charts complete.")
+    return index_path
+
+
+def _noop_status(message: str) -> None:
+    pass
@@ -1,60 +1,122 @@
 """Radar chart rendering with polygon grid rings (not circular)."""
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import matplotlib.pyplot as plt
 import numpy as np
 
-AXIS_LABELS = ["Jump Height", "Triple Ext", "Elasticity", "Loading", "Braking"]
+from .chart_style import (
+    AXIS_LABELS,
+    RING_LEVELS,
+    TABLE_COL_WIDTHS,
+    axis_angles,
+    delta_color,
+    format_delta,
+    format_percentile,
+    percentile_table_rows,
+    values_to_points,
+)
+from .timing import timed
+
+
+class RadarFigureRenderer:
+    """Reusable radar page: the grid, labels and layout are drawn once.
+
+    Each ``render`` call only swaps the per-athlete artists (polygons, legend,
+    title and table text) and returns the same figure, ready to be saved.
+    """
+
+    def __init__(self):
+        self.fig = plt.figure(figsize=(8.5, 11))
+        gs = self.fig.add_gridspec(nrows=2, ncols=1, height_ratios=[3.2, 1.55], hspace=0.08)
+        self.ax = self.fig.add_subplot(gs[0, 0])
+        self.table_ax = self.fig.add_subplot(gs[1, 0])
+        self.ax.set_aspect("equal")
+        self.ax.axis("off")
+        self.table_ax.axis("off")
+
+        self.angles = axis_angles(len(AXIS_LABELS))
+        _draw_polygon_grid(self.ax, self.angles, RING_LEVELS)
+        _draw_axis_labels(self.ax, self.angles)
+
+        self.ax.set_xlim(-1.25, 1.25)
+        self.ax.set_ylim(-1.25, 1.25)
+        self._title = self.fig.text(0.5, 0.965, "", ha="center", va="center", fontsize=18)
+        self._series = []
+        self._tables = {}
+        self._active_table = None
+        # Table row heights are sized against the axes height at creation time;
+        # keep the pre-adjustment height so tables created later match.
+        self._table_ax_height = self.table_ax.get_position().height
+        self.fig.subplots_adjust(top=0.92, bottom=0.07, left=0.06, right=0.94)
+
+    @timed("build_radar_figure")
+    def render(
+        self,
+        athlete_name: str,
+        date_to_values: Dict[str, List[float]],
+        deltas: Optional[Dict[str, List[float]]] = None,
+    ):
+        colors = plt.cm.tab10.colors
+        date_colors = {}
+        handles = []
+        for idx, (date_label, values) in enumerate(date_to_values.items()):
+            color = colors[idx % len(colors)]
+            date_colors[date_label] = color
+            points = values_to_points(values, self.angles)
+            line, patch = self._series_artists(idx, points)
+            line.set_data(points[:, 0], points[:, 1])
+            line.set_color(color)
+            line.set_label(date_label)
+            patch.set_xy(points)
+            patch.set_color(color)
+            line.set_visible(True)
+            patch.set_visible(True)
+            handles.append(line)
+        for line, patch in self._series[len(handles) :]:
+            line.set_visible(False)
+            patch.set_visible(False)
+
+        self._title.set_text(athlete_name)
+        self.ax.legend(
+            handles=handles, loc="upper center", bbox_to_anchor=(0.5, 0.02), ncol=2, frameon=False
+        )
+        self._show_table(date_to_values, date_colors, deltas)
+        return self.fig
+
+    def close(self) -> None:
+        plt.close(self.fig)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _series_artists(self, idx: int, points: np.ndarray):
+        while len(self._series) <= idx:
+            (line,) = self.ax.plot(points[:, 0], points[:, 1], linewidth=2)
+            (patch,) = self.ax.fill(points[:, 0], points[:, 1], alpha=0.15)
+            self._series.append((line, patch))
+        return self._series[idx]
+
+    def _show_table(self, date_to_values: Dict[str, List[float]], date_colors, deltas=None) -> None:
+        n_rows = max(2 * len(date_to_values) - 1, 0)
+        table = self._tables.get(n_rows)
+        if table is None:
+            table = _create_percentile_table(self.table_ax, n_rows)
+            table.scale(1, self.table_ax.get_position().height / self._table_ax_height)
+            self._tables[n_rows] = table
+        if self._active_table is not None and self._active_table is not table:
+            self._active_table.set_visible(False)
+        table.set_visible(True)
+        self._active_table = table
+        _fill_percentile_table(table, date_to_values, date_colors, deltas)
 
 
 def build_radar_figure(athlete_name: str, date_to_values: Dict[str, List[float]]):
-    fig = plt.figure(figsize=(8.5, 11))
-    gs = fig.add_gridspec(nrows=2, ncols=1, height_ratios=[3.2, 1.55], hspace=0.08)
-    ax = fig.add_subplot(gs[0, 0])
-    table_ax = fig.add_subplot(gs[1, 0])
-    ax.set_aspect("equal")
-    ax.axis("off")
-    table_ax.axis("off")
-
-    n_axes = len(AXIS_LABELS)
-    angles = _axis_angles(n_axes)
-
-    ring_levels = [0, 25, 50, 75, 100]
-    _draw_polygon_grid(ax, angles, ring_levels)
-    _draw_axis_labels(ax, angles)
-
-    colors = plt.cm.tab10.colors
-    date_colors = {}
-    for idx, (date_label, values) in enumerate(date_to_values.items()):
-        color = colors[idx % len(colors)]
-        date_colors[date_label] = color
-        points = _values_to_points(values, angles)
-        ax.plot(points[:, 0], points[:, 1], color=color, linewidth=2, label=date_label)
-        ax.fill(points[:, 0], points[:, 1], color=color, alpha=0.15)
-
-    ax.set_xlim(-1.25, 1.25)
-    ax.set_ylim(-1.25, 1.25)
-
-    fig.text(0.5, 0.965, athlete_name, ha="center", va="center", fontsize=18)
-    ax.legend(loc="upper center", bbox_to_anchor=(0.5, 0.02), ncol=2, frameon=False)
-    _draw_percentile_table(table_ax, date_to_values, date_colors)
-
-    fig.subplots_adjust(top=0.92, bottom=0.07, left=0.06, right=0.94)
-    return fig
-
-
-def _axis_angles(n_axes: int) -> np.ndarray:
-    base = np.linspace(0, 2 * np.pi, n_axes, endpoint=False)
-    return np.pi / 2 - base
-
-
-def _values_to_points(values: List[float], angles: np.ndarray) -> np.ndarray:
-    scaled = np.array(values, dtype=float) / 100.0
-    x = scaled * np.cos(angles)
-    y = scaled * np.sin(angles)
-    points = np.column_stack([x, y])
-    return np.vstack([points, points[0]])
+    """Return a new figure; the caller must close it (or use :class:`RadarFigureRenderer` as a context manager)."""
+    return RadarFigureRenderer().render(athlete_name, date_to_values)
 
 
 def _draw_polygon_grid(ax, angles: np.ndarray, ring_levels: List[int]) -> None:
@@ -87,29 +149,14 @@ def _draw_axis_labels(ax, angles: np.ndarray) -> None:
         ax.text(x, y, label, ha=alignment, va="center", fontsize=11)
 
 
-def _draw_percentile_table(table_ax, date_to_values: Dict[str, List[float]], date_colors) -> None:
+def _create_percentile_table(table_ax, n_rows: int):
     col_labels = ["Date", *AXIS_LABELS]
-    cell_text = []
-    row_meta = []
-    previous_values = None
-
-    for date_label, values in date_to_values.items():
-        cell_text.append([date_label, *[_format_percentile(v) for v in values]])
-        row_meta.append(("date", date_label, values))
-
-        if previous_values is not None:
-            deltas = [curr - prev for curr, prev in zip(values, previous_values)]
-            cell_text.append(["Delta", *[_format_delta(v) for v in deltas]])
-            row_meta.append(("delta", date_label, deltas))
-        previous_values = values
-
-    col_widths = [0.20, 0.16, 0.16, 0.16, 0.16, 0.16]
     table = table_ax.table(
-        cellText=cell_text,
+        cellText=[[""] * len(col_labels) for _ in range(n_rows)] or None,
         colLabels=col_labels,
         loc="center",
         cellLoc="center",
-        colWidths=col_widths,
+        colWidths=TABLE_COL_WIDTHS,
     )
     table.auto_set_font_size(False)
     table.set_fontsize(9)
@@ -120,44 +167,31 @@ def _draw_percentile_table(table_ax, date_to_values: Dict[str, List[float]], dat
         if row == 0:
             cell.set_facecolor("#f2f4f7")
             cell.get_text().set_fontweight("bold")
+    return table
 
-    for idx, meta in enumerate(row_meta, start=1):
+
+def _fill_percentile_table(table, date_to_values: Dict[str, List[float]], date_colors, deltas=None) -> None:
+    n_cols = len(AXIS_LABELS) + 1
+    for idx, meta in enumerate(percentile_table_rows(date_to_values, deltas), start=1):
         row_type, date_label, values = meta
         if row_type == "date":
+            texts = [date_label, *[format_percentile(v) for v in values]]
             color = date_colors.get(date_label, "#222222")
-            for col in range(len(col_labels)):
+            for col in range(n_cols):
+                cell_text = table[(idx, col)].get_text()
+                cell_text.set_text(texts[col])
                 table[(idx, col)].set_facecolor("#ffffff")
-                table[(idx, col)].get_text().set_color(color)
+                cell_text.set_color(color)
                 if col == 0:
-                    table[(idx, col)].get_text().set_fontweight("bold")
+                    cell_text.set_fontweight("bold")
         else:
-            for col in range(len(col_labels)):
+            texts = ["Delta", *[format_delta(v) for v in values]]
+            for col in range(n_cols):
+                cell_text = table[(idx, col)].get_text()
+                cell_text.set_text(texts[col])
                 table[(idx, col)].set_facecolor("#f7f7f7")
                 if col == 0:
-                    table[(idx, col)].get_text().set_fontweight("bold")
-                    table[(idx, col)].get_text().set_color("#444444")
+                    cell_text.set_fontweight("bold")
+                    cell_text.set_color("#444444")
                     continue
-                delta_value = values[col - 1]
-                table[(idx, col)].get_text().set_color(_delta_color(delta_value))
-
-
-def _format_percentile(value: float) -> str:
-    rounded = round(float(value), 1)
-    if rounded.is_integer():
-        return f"{int(rounded)}%"
-    return f"{rounded:.1f}%"
-
-
-def _format_delta(value: float) -> str:
-    rounded = round(float(value), 1)
-    if rounded.is_integer():
-        return f"{int(rounded):+d}"
-    return f"{rounded:+.1f}"
-
-
-def _delta_color(delta_value: float) -> str:
-    if delta_value > 0:
-        return "#1b7f3a"
-    if delta_value < 0:
-        return "#b42318"
-    return "#555555"
+                cell_text.set_color(delta_color(values[col - 1]))
@@ -0,0 +1,328 @@
+"""Chart page rendering, optionally spread across a pool of worker processes.
+
+Each worker renders a contiguous chunk of athletes into its own PDF fragment
+(and PNGs) on the Agg backend. Fragments are merged back in chunk order, so the
+final PDF keeps the same athlete order as a sequential render. The "pdf"
+backend skips matplotlib and writes pages straight to the output file.
+:func:`render_shards` writes several PDFs from one pool, for sharded output.
+"""
+
+import contextlib
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import memory, pdf_writer, timing, utils
+
+# "matplotlib" renders figures; "pdf" writes pages directly with pdf_writer.
+BACKENDS = ("matplotlib", "pdf")
+# More chunks than workers keeps the pool busy when page costs are uneven.
+CHUNKS_PER_WORKER = 4
+PNG_DPI = 150
+
+# on_pages(jobs) is called in the parent process as pages finish; raising stops the render.
+PagesCallback = Callable[[List["PageJob"]], None]
+
+
+@dataclass
+class PageJob:
+    athlete: str
+    date_to_values: Dict[str, List[float]]
+    # Change since the previous date for the table (trends.Trends.deltas); None computes it per page.
+    deltas: Optional[Dict[str, List[float]]] = None
+
+
+def png_filename(athlete: str) -> str:
+    return utils.sanitize_filename(athlete) + ".png"
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def render_chunk(
+    pdf_path: Optional[str],
+    jobs: List[PageJob],
+    png_dir: Optional[str] = None,
+    on_pages: Optional[PagesCallback] = None,
+    timed: bool = False,
+    memory_ceiling: Optional[int] = None,
+) -> List[timing.SpanRecord]:
+    """Render ``jobs`` in this process; with ``timed`` (worker processes) the
+    page timings are collected locally and returned for the parent to merge."""
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    from . import radar_plot
+
+    recorder = timing.Recorder() if timed else None
+    renderers = [radar_plot.RadarFigureRenderer()]
+
+    def flush():
+        # Start over with a fresh scaffold and drop any figure the renderer does not own.
+        import matplotlib.pyplot as plt
+
+        renderers[0].close()
+        plt.close("all")
+        renderers[0] = radar_plot.RadarFigureRenderer()
+
+    with timing.recording(recorder) if timed else contextlib.nullcontext():
+        pdf = PdfPages(pdf_path) if pdf_path else None
+        try:
+            for job in jobs:
+                with timing.span(timing.PAGE_SPAN, athlete=job.athlete):
+                    fig = renderers[0].render(job.athlete, job.date_to_values, job.deltas)
+                    if pdf is not None:
+                        with timing.span("save_pdf_page"):
+                            pdf.savefig(fig)
+                    if png_dir:
+                        with timing.span("save_png"):
+                            fig.savefig(os.path.join(png_dir, png_filename(job.athlete)), dpi=PNG_DPI)
+                memory.sample()
+                memory.enforce_ceiling(memory_ceiling, flush)
+                if on_pages is not None:
+                    on_pages([job])
+        finally:
+            if pdf is not None:
+                pdf.close()
+            renderers[0].close()
+    return recorder.records if recorder is not None else []
+
+
+def render_pages(
+    pdf_path: str,
+    jobs: List[PageJob],
+    png_dir: Optional[str] = None,
+    workers: Optional[int] = None,
+    backend: str = "matplotlib",
+    on_pages: Optional[PagesCallback] = None,
+    memory_ceiling: Optional[int] = None,
+) -> str:
+    render_shards([(pdf_path, jobs)], png_dir, workers, backend, on_pages, memory_ceiling)
+    return pdf_path
+
+
+def render_shards(
+    shards: List[Tuple[str, List[PageJob]]],
+    png_dir: Optional[str] = None,
+    workers: Optional[int] = None,
+    backend: str = "matplotlib",
+    on_pages: Optional[PagesCallback] = None,
+    memory_ceiling: Optional[int] = None,
+) -> None:
+    """Write each ``(pdf_path, jobs)`` shard as its own PDF; shards are rendered side by side."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown chart backend: {backend}")
+    if png_dir:
+        os.makedirs(png_dir, exist_ok=True)
+    workers = default_workers() if workers is None else max(1, int(workers))
+
+    if backend == "pdf":
+        # With PNGs the matplotlib pass dominates, so progress is reported there.
+        _write_direct_shards(shards, workers, None if png_dir else on_pages, memory_ceiling)
+        if png_dir:
+            # The direct writer only produces PDF; PNGs still come from matplotlib.
+            all_jobs = [job for _, jobs in shards for job in jobs]
+            _render_outputs([(None, all_jobs)], png_dir, workers, on_pages, memory_ceiling)
+        return
+
+    _render_outputs(shards, png_dir, workers, on_pages, memory_ceiling)
+
+
+def write_direct(
+    pdf_path: str,
+    jobs: List[PageJob],
+    on_pages: Optional[PagesCallback] = None,
+    timed: bool = False,
+    memory_ceiling: Optional[int] = None,
+) -> List[timing.SpanRecord]:
+    """Write ``jobs`` with the direct PDF writer; like ``render_chunk`` it can run in a worker."""
+    recorder = timing.Recorder() if timed else None
+    with timing.recording(recorder) if timed else contextlib.nullcontext():
+        with pdf_writer.RadarPdfWriter(pdf_path) as writer:
+            for job in jobs:
+                with timing.span(timing.PAGE_SPAN, athlete=job.athlete, backend="pdf"):
+                    writer.add_page(job.athlete, job.date_to_values, job.deltas)
+                memory.sample()
+                memory.enforce_ceiling(memory_ceiling)
+                if on_pages is not None:
+                    on_pages([job])
+    return recorder.records if recorder is not None else []
+
+
+def _write_direct_shards(shards, workers: int, on_pages, memory_ceiling) -> None:
+    if workers == 1 or len(shards) < 2:
+        for pdf_path, jobs in shards:
+            write_direct(pdf_path, jobs, on_pages, memory_ceiling=memory_ceiling)
+        return
+    tasks = [(write_direct, (pdf_path, jobs, None, True, memory_ceiling), jobs) for pdf_path, jobs in shards]
+    _run_pool(tasks, workers, on_pages)
+
+
+def _render_outputs(outputs, png_dir, workers: int, on_pages=None, memory_ceiling=None) -> None:
+    """Render several ``(pdf_path or None, jobs)`` outputs with one worker pool.
+
+    Each output is cut into chunks in proportion to its size; an output that
+    fits one chunk is written straight to its path, larger ones are merged from
+    fragments in chunk order.
+    """
+    total = sum(len(jobs) for _, jobs in outputs)
+    budget = workers * CHUNKS_PER_WORKER
+    plans = [
+        (pdf_path, _split_chunks(jobs, max(1, math.ceil(budget * len(jobs) / max(total, 1)))))
+        for pdf_path, jobs in outputs
+    ]
+    if workers == 1 or sum(len(chunks) for _, chunks in plans) < 2:
+        for pdf_path, jobs in outputs:
+            render_chunk(pdf_path, jobs, png_dir, on_pages, memory_ceiling=memory_ceiling)
+        return
+
+    recorder = timing.active()
+    fragment_dir = None
+    merges = []
+    tasks = []
+    for number, (pdf_path, chunks) in enumerate(plans):
+        fragments = [None] * len(chunks)
+        if pdf_path and len(chunks) == 1:
+            fragments = [pdf_path]
+        elif pdf_path:
+            if fragment_dir is None:
+                fragment_dir = tempfile.mkdtemp(prefix=".fragments_", dir=os.path.dirname(pdf_path) or ".")
+            fragments = [
+                os.path.join(fragment_dir, f"fragment_{number:04d}_{index:04d}.pdf")
+                for index in range(len(chunks))
+            ]
+            merges.append((fragments, pdf_path))
+        for fragment, chunk in zip(fragments, chunks):
+            # Each worker enforces the ceiling on its own process.
+            args = (fragment, chunk, png_dir, None, recorder is not None, memory_ceiling)
+            tasks.append((render_chunk, args, chunk))
+    try:
+        _run_pool(tasks, workers, on_pages)
+        for fragments, pdf_path in merges:
+            merge_pdfs(fragments, pdf_path)
+    finally:
+        if fragment_dir:
+            shutil.rmtree(fragment_dir, ignore_errors=True)
+
+
+def _run_pool(tasks, workers: int, on_pages) -> None:
+    """Run ``(func, args, jobs)`` tasks in spawned workers, merging their timing records."""
+    recorder = timing.active()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)), mp_context=context, initializer=_init_worker
+    ) as executor:
+        futures = {executor.submit(func, *args): jobs for func, args, jobs in tasks}
+        try:
+            for future in as_completed(futures):
+                records = future.result()
+                if recorder is not None:
+                    recorder.extend(records)
+                if on_pages is not None:
+                    on_pages(futures[future])
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def render_incremental(
+    pdf_path: str,
+    jobs: List[PageJob],
+    reuse: Dict[str, int],
+    png_dir: Optional[str] = None,
+    workers: Optional[int] = None,
+    backend: str = "matplotlib",
+    on_pages: Optional[PagesCallback] = None,
+    memory_ceiling: Optional[int] = None,
+    cached: Optional[Dict[str, str]] = None,
+) -> str:
+    """Rebuild ``pdf_path`` reusing its existing pages for athletes in ``reuse``
+    (athlete -> page index), single-page PDFs for athletes in ``cached``
+    (athlete -> path) and rendering only the remaining jobs."""
+    cached = cached or {}
+    pending = [job for job in jobs if job.athlete not in reuse and job.athlete not in cached]
+    work_dir = tempfile.mkdtemp(prefix=".incremental_", dir=os.path.dirname(pdf_path) or ".")
+    try:
+        fresh_path = os.path.join(work_dir, "fresh.pdf")
+        if pending:
+            render_pages(
+                fresh_path,
+                pending,
+                png_dir=png_dir,
+                workers=workers,
+                backend=backend,
+                on_pages=on_pages,
+                memory_ceiling=memory_ceiling,
+            )
+        sources = []
+        fresh_index = 0
+        for job in jobs:
+            if job.athlete in reuse:
+                sources.append((pdf_path, reuse[job.athlete]))
+            elif job.athlete in cached:
+                sources.append((cached[job.athlete], 0))
+            else:
+                sources.append((fresh_path, fresh_index))
+                fresh_index += 1
+        assemble_pages(sources, pdf_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return pdf_path
+
+
+def assemble_pages(sources, pdf_path: str) -> None:
+    """Write ``(source_pdf, page_index)`` pages, in order, to ``pdf_path``."""
+    from pypdf import PdfReader, PdfWriter
+
+    readers = {}
+    writer = PdfWriter()
+    for source, index in sources:
+        if source not in readers:
+            readers[source] = PdfReader(source)
+        writer.add_page(readers[source].pages[index])
+    if len(readers) > 1:
+        # Pages from separate files each carry their own copy of the fonts; keep one.
+        writer.compress_identical_objects(remove_duplicates=True, remove_unreferenced=True)
+    tmp_path = pdf_path + ".tmp"
+    with open(tmp_path, "wb") as handle:
+        writer.write(handle)
+    writer.close()
+    readers.clear()
+    os.replace(tmp_path, pdf_path)
+
+
+def merge_pdfs(fragment_paths: List[str], pdf_path: str) -> None:
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for fragment in fragment_paths:
+        writer.append(fragment)
+    with open(pdf_path, "wb") as handle:
+        writer.write(handle)
+    writer.close()
+
+
+def _split_chunks(jobs: List[PageJob], max_chunks: int) -> List[List[PageJob]]:
+    if not jobs:
+        return []
+    count = max(1, min(max_chunks, len(jobs)))
+    size, extra = divmod(len(jobs), count)
+    chunks = []
+    start = 0
+    for index in range(count):
+        end = start + size + (1 if index < extra else 0)
+        chunks.append(jobs[start:end])
+        start = end
+    return chunks
+
+
+def _init_worker() -> None:
+    import matplotlib
+
+    matplotlib.use("Agg")
@@ -2,8 +2,6 @@ import os
 from dataclasses import dataclass
 from datetime import datetime
 
-from .utils import sanitize_title
-
 
 @dataclass
 class RunPaths:
@@ -14,9 +12,16 @@ class RunPaths:
     logs: str
 
 
-def create_run_folder(run_title: str, default_title: str | None = None) -> RunPaths:
+def app_data_dir() -> str:
     home = os.path.expanduser("~")
-    base_dir = os.path.join(home, "Documents", "RadarChartAutomation", "Runs")
+    return os.path.join(home, "Documents", "RadarChartAutomation")
+
+
+def create_run_folder(run_title: str, default_title: str | None = None) -> RunPaths:
+    # utils pulls in pandas; importing it here keeps app_data_dir() cheap at GUI startup.
+    from .utils import sanitize_title
+
+    base_dir = os.path.join(app_data_dir(), "Runs")
     if run_title:
         run_folder = sanitize_title(run_title)
     else:
@@ -0,0 +1,192 @@
+"""Per-run manifest used to make repeat runs incremental.
+
+``<run folder>/manifest.json`` records a content hash for every processed
+input (with its header, mapping, date labels and stored percentile frames) and
+a hash of every athlete page in each chart PDF. A re-run only recomputes inputs
+whose hash, resolved mapping or scoring is new and only re-renders athletes
+whose page data changed. The percentile frames are Arrow IPC files (see
+:mod:`columnar`); without pyarrow inputs are always recomputed.
+"""
+
+import glob
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+
+from . import columnar
+from .chart_style import STYLE_VERSION
+from .disk_cache import hash_key
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 3
+FRAMES_DIR = "inputs"
+
+
+def page_hash(athlete: str, date_to_values: Dict[str, List[float]], backend: str) -> str:
+    # Ordered date -> values pairs; rounding keeps float noise from forcing re-renders.
+    series = [[label, [round(float(v), 9) for v in values]] for label, values in date_to_values.items()]
+    return hash_key(STYLE_VERSION, backend, athlete, series)
+
+
+class RunManifest:
+    def __init__(self, run_folder: str, data: Optional[dict] = None):
+        self.run_folder = run_folder
+        data = data or {}
+        if data.get("version") != MANIFEST_VERSION:
+            data = {}
+        self.inputs: Dict[str, dict] = data.get("inputs", {})
+        self.charts: Dict[str, dict] = data.get("charts", {})
+
+    @classmethod
+    def load(cls, run_folder: str) -> "RunManifest":
+        path = os.path.join(run_folder, MANIFEST_NAME)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                return cls(run_folder, json.load(handle))
+        except (OSError, ValueError):
+            return cls(run_folder)
+
+    def save(self) -> None:
+        path = os.path.join(self.run_folder, MANIFEST_NAME)
+        data = {"version": MANIFEST_VERSION, "inputs": self.inputs, "charts": self.charts}
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    # Inputs -----------------------------------------------------------------
+
+    def input_columns(self, digest: str) -> Optional[List[str]]:
+        """Header of a recorded input; the same digest means the same header."""
+        entry = self.inputs.get(digest)
+        return list(entry["columns"]) if entry else None
+
+    def cached_percentiles(
+        self, digest: str, mapping: Dict[str, str], scoring: str = "cohort"
+    ) -> Optional[Tuple[dict, pd.DataFrame, pd.DataFrame]]:
+        # mapping is the one this run resolved (group columns included); scoring is
+        # "cohort" for within-file ranks or the identity of a norms reference.
+        entry = self.inputs.get(digest)
+        if not entry or entry["mapping"] != mapping or entry["scoring"] != scoring:
+            return None
+        if not entry.get("frames") or not columnar.available():
+            return None
+        try:
+            frames = {
+                name: columnar.read_frame(os.path.join(self.run_folder, relative))
+                for name, relative in entry["frames"].items()
+            }
+        except Exception:
+            return None
+        return entry, frames["long"], frames["wide"]
+
+    def record_input(
+        self,
+        digest: str,
+        path: str,
+        columns: Sequence[str],
+        mapping: Dict[str, str],
+        date_labels: List[str],
+        long_df,
+        wide_df,
+        scoring: str = "cohort",
+    ) -> None:
+        self._remove_frames(self.inputs.get(digest))
+        frames = {}
+        if columnar.available():
+            try:
+                for name, df in (("long", long_df), ("wide", wide_df)):
+                    filename = f"{digest[:16]}.{name}{columnar.ARROW_SUFFIX}"
+                    relative = os.path.join("02_percentiles", FRAMES_DIR, filename)
+                    target = os.path.join(self.run_folder, relative)
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    columnar.write_frame(df, target)
+                    frames[name] = relative
+            except Exception:
+                # Columns Arrow cannot type are recomputed next time instead of reused.
+                self._remove_frames({"frames": frames})
+                frames = {}
+        self.inputs[digest] = {
+            "source": os.path.basename(path),
+            "columns": [str(column) for column in columns],
+            "mapping": mapping,
+            "date_labels": list(date_labels),
+            "frames": frames,
+            "scoring": scoring,
+        }
+
+    def retain_inputs(self, digests) -> None:
+        """Forget inputs that are not part of the current selection."""
+        keep = set(digests)
+        for digest in [d for d in self.inputs if d not in keep]:
+            self._remove_frames(self.inputs.pop(digest))
+
+    def _remove_frames(self, entry: Optional[dict]) -> None:
+        for relative in (entry or {}).get("frames", {}).values():
+            try:
+                os.remove(os.path.join(self.run_folder, relative))
+            except OSError:
+                pass
+
+    # Charts -----------------------------------------------------------------
+
+    def reusable_pages(
+        self, pdf_name: str, backend: str, page_hashes: Dict[str, str], need_png: bool = False
+    ) -> Dict[str, int]:
+        """Map athlete -> page index in the existing PDF for pages that are unchanged."""
+        previous = self.charts.get(pdf_name)
+        pdf_path = os.path.join(self.run_folder, "03_outputs", pdf_name)
+        if not previous or previous.get("backend") != backend or not os.path.exists(pdf_path):
+            return {}
+        if previous.get("file") != _file_signature(pdf_path):
+            return {}
+        reusable = {}
+        for athlete, entry in previous.get("pages", {}).items():
+            if page_hashes.get(athlete) != entry["hash"]:
+                continue
+            if need_png and not entry.get("png"):
+                continue
+            reusable[athlete] = entry["index"]
+        return reusable
+
+    def record_chart(
+        self, pdf_name: str, backend: str, ordered_hashes: List[Tuple[str, str]], png_athletes=()
+    ) -> None:
+        pdf_path = os.path.join(self.run_folder, "03_outputs", pdf_name)
+        png_athletes = set(png_athletes)
+        self.charts[pdf_name] = {
+            "backend": backend,
+            "file": _file_signature(pdf_path),
+            "pages": {
+                athlete: {"hash": digest, "index": index, "png": athlete in png_athletes}
+                for index, (athlete, digest) in enumerate(ordered_hashes)
+            },
+        }
+
+    def png_athletes(self, pdf_name: str) -> List[str]:
+        previous = self.charts.get(pdf_name, {})
+        return [athlete for athlete, entry in previous.get("pages", {}).items() if entry.get("png")]
+
+
+def referenced_inputs(runs_dir: str) -> Optional[Set[str]]:
+    """Input digests listed by every run folder's manifest; None if any manifest cannot be read."""
+    digests: Set[str] = set()
+    for path in glob.glob(os.path.join(glob.escape(runs_dir), "*", MANIFEST_NAME)):
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                # Any manifest version: older runs still reference their inputs by digest.
+                digests.update(json.load(handle).get("inputs", {}))
+        except (OSError, ValueError, AttributeError):
+            return None
+    return digests
+
+
+def _file_signature(path: str) -> Optional[List[int]]:
+    # Size and mtime detect a PDF replaced or edited outside the app.
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
@@ -0,0 +1,88 @@
+"""Split chart pages across several PDFs (shards) for very large rosters.
+
+Pages can be grouped by a column value (team, position, ...), capped per
+file, or both; a byte cap becomes a page cap using the typical page size of
+the backend. Shards are written to ``03_outputs/<pdf stem>__shards/`` next to
+an ``index.csv`` that gives the file and page number of every athlete.
+"""
+
+import csv
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .rendering import PageJob
+from .utils import sanitize_filename
+
+# Typical sizes of a two-date page and of one file's fixed overhead (fonts, grid), by backend.
+PAGE_BYTES = {"matplotlib": 4_000, "pdf": 1_200}
+FILE_BYTES = {"matplotlib": 30_000, "pdf": 3_000}
+INDEX_NAME = "index.csv"
+UNGROUPED = "Ungrouped"
+
+
+@dataclass
+class Shard:
+    name: str
+    group: Optional[str]
+    jobs: List[PageJob]
+
+    @property
+    def filename(self) -> str:
+        return f"{self.name}.pdf"
+
+
+def shard_dir(pdf_path: str) -> str:
+    stem = os.path.splitext(os.path.basename(pdf_path))[0]
+    return os.path.join(os.path.dirname(pdf_path), f"{stem}__shards")
+
+
+def pages_per_shard(max_pages: Optional[int], max_mb: Optional[float], backend: str) -> Optional[int]:
+    caps = []
+    if max_pages:
+        caps.append(int(max_pages))
+    if max_mb:
+        budget = max_mb * 1024 * 1024 - FILE_BYTES[backend]
+        caps.append(max(1, int(budget // PAGE_BYTES[backend])))
+    return min(caps) if caps else None
+
+
+def plan_shards(
+    jobs: List[PageJob], groups: Optional[Dict[str, str]] = None, max_pages: Optional[int] = None
+) -> List[Shard]:
+    """Shards in group order (alphabetical), each keeping the jobs' page order."""
+    if max_pages is not None and max_pages < 1:
+        raise ValueError("Pages per shard must be at least 1.")
+    buckets: Dict[Optional[str], List[PageJob]] = {}
+    for job in jobs:
+        group = (groups.get(job.athlete) or UNGROUPED) if groups is not None else None
+        buckets.setdefault(group, []).append(job)
+
+    shards = []
+    used = set()
+    for group in sorted(buckets, key=lambda value: (value is None, value or "")):
+        group_jobs = buckets[group]
+        size = max_pages or len(group_jobs)
+        parts = [group_jobs[start : start + size] for start in range(0, len(group_jobs), size)]
+        stem = sanitize_filename(group) if group is not None else "part"
+        for number, part in enumerate(parts, start=1):
+            name = f"{stem}_{number:03d}" if group is None or len(parts) > 1 else stem
+            # Different groups can sanitize to the same file name.
+            base, suffix = name, 2
+            while name.lower() in used:
+                name = f"{base}_{suffix}"
+                suffix += 1
+            used.add(name.lower())
+            shards.append(Shard(name, group, part))
+    return shards
+
+
+def write_index(path: str, shards: List[Shard]) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["athlete_name", "group", "file", "page"])
+        for shard in shards:
+            for page, job in enumerate(shard.jobs, start=1):
+                writer.writerow([job.athlete, shard.group or "", shard.filename, page])
+    os.replace(tmp_path, path)
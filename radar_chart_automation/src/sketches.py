@@ -0,0 +1,205 @@
+"""Mergeable quantile sketches for approximate norms over very large pools.
+
+A :class:`KLLSketch` (Karnin-Lang-Liberty) keeps a few hundred weighted
+samples per metric no matter how many values it has seen, can be updated
+as runs complete and merged across sites. :class:`SketchSet` holds one sketch
+per axis and scores athletes with the same RANK.EQ/COUNT rule as
+``norms.percent_rank``, so it can stand in for an exact norms reference.
+
+Error estimate: a rank query is typically off by no more than
+``error_estimate()`` (``3 / k``) of the pool size, i.e. 0.75 percentile points
+with the default ``k=400``. That is an empirical figure, not a proven bound:
+the worst case measured over 500 quantiles on 300k-1M values, streamed in small
+batches or merged from 8 sites, which did not grow with pool size or merges.
+"""
+
+import json
+import math
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .disk_cache import hash_key
+from .percentiles import AXIS_LABELS
+from .run_manager import app_data_dir
+
+DEFAULT_K = 400
+SKETCH_VERSION = 1
+# Compactor capacities shrink by this factor per level below the top one.
+CAPACITY_DECAY = 2.0 / 3.0
+
+
+def default_sketch_path() -> str:
+    return os.path.join(app_data_dir(), "Sketches", "local.npz")
+
+
+class KLLSketch:
+    def __init__(self, k: int = DEFAULT_K):
+        if k < 8:
+            raise ValueError("Sketch size k must be at least 8.")
+        self.k = k
+        self.n = 0
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._cdf = None
+
+    def error_estimate(self) -> float:
+        """Empirical worst-case normalized rank error (fraction of the pool size)."""
+        return 3.0 / self.k
+
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.n += len(values)
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for height, items in enumerate(other.levels):
+            self.levels[height] = np.concatenate([self.levels[height], items])
+        self.n += other.n
+        self._compress()
+
+    def rank_below(self, values) -> np.ndarray:
+        """Approximate count of seen values strictly below each of ``values``."""
+        items, cumulative = self._cdf_arrays()
+        positions = np.searchsorted(items, np.asarray(values, dtype=float), side="left")
+        return np.where(positions > 0, cumulative[np.maximum(positions - 1, 0)], 0.0)
+
+    def percent_rank(self, values) -> np.ndarray:
+        return (self.rank_below(values) + 1) / (self.n + 1)
+
+    def size(self) -> int:
+        return sum(len(items) for items in self.levels)
+
+    def _capacity(self, height: int) -> int:
+        depth = len(self.levels) - height - 1
+        return max(2, int(math.ceil(self.k * CAPACITY_DECAY**depth)))
+
+    def _compress(self) -> None:
+        self._cdf = None
+        height = 0
+        while height < len(self.levels):
+            items = self.levels[height]
+            if len(items) >= self._capacity(height):
+                if height + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind so total weight is preserved exactly.
+                keep = items[len(items) - len(items) % 2 :]
+                pairs = items[: len(items) - len(keep)]
+                offset = np.random.default_rng((self.n, height)).integers(2)
+                self.levels[height + 1] = np.concatenate([self.levels[height + 1], pairs[offset::2]])
+                self.levels[height] = keep
+            height += 1
+
+    def _cdf_arrays(self):
+        if self._cdf is None:
+            items = np.concatenate(self.levels)
+            weights = np.concatenate([np.full(len(level), 2.0**height) for height, level in enumerate(self.levels)])
+            order = np.argsort(items, kind="mergesort")
+            self._cdf = (items[order], np.cumsum(weights[order]))
+        return self._cdf
+
+
+class SketchSet:
+    """One KLL sketch per axis plus the sources (input digests) already folded in."""
+
+    def __init__(self, k: int = DEFAULT_K):
+        self.k = k
+        self.sketches: Dict[str, KLLSketch] = {axis: KLLSketch(k) for axis in AXIS_LABELS}
+        self.sources: List[str] = []
+
+    @property
+    def identity(self) -> str:
+        return self.identity_excluding(())
+
+    def identity_excluding(self, sources: Iterable[str]) -> str:
+        """Identity of this sketch as it was before ``sources`` were folded in."""
+        return hash_key("sketch", self.k, sorted(set(self.sources) - set(sources)))
+
+    def count(self, axis_label: str) -> int:
+        return self.sketches[axis_label].n
+
+    def percent_rank(self, axis_label: str, values) -> np.ndarray:
+        return self.sketches[axis_label].percent_rank(values)
+
+    def error_estimate(self) -> float:
+        return self.sketches[AXIS_LABELS[0]].error_estimate()
+
+    def add_long(self, long_df, source: str) -> bool:
+        """Fold a percentiles_long frame in; False if ``source`` was already added."""
+        if source in self.sources:
+            return False
+        for axis, axis_frame in long_df.groupby("metric_key", sort=False):
+            if axis in self.sketches:
+                self.sketches[axis].update(axis_frame["raw_value"].to_numpy(dtype=float))
+        self.sources.append(source)
+        return True
+
+    def merge(self, other: "SketchSet") -> None:
+        if other.k != self.k:
+            raise ValueError(f"Cannot merge sketches of different sizes (k={self.k} and k={other.k}).")
+        overlap = set(self.sources) & set(other.sources)
+        if overlap == set(other.sources):
+            return
+        if overlap:
+            raise ValueError(f"Sketches share {len(overlap)} input(s); merging would count them twice.")
+        for axis, sketch in other.sketches.items():
+            self.sketches[axis].merge(sketch)
+        self.sources.extend(other.sources)
+
+    def save(self, path: str) -> None:
+        arrays = {}
+        meta = {"version": SKETCH_VERSION, "k": self.k, "sources": self.sources, "n": {}}
+        for axis, sketch in self.sketches.items():
+            meta["n"][axis] = sketch.n
+            for height, items in enumerate(sketch.levels):
+                arrays[f"{axis}/{height}"] = items
+        arrays["meta"] = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SketchSet":
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Sketch file not found: {path}")
+        with np.load(path) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            if meta.get("version") != SKETCH_VERSION:
+                raise ValueError(f"Unsupported sketch version in {path}")
+            sketch_set = cls(meta["k"])
+            sketch_set.sources = meta["sources"]
+            for axis, sketch in sketch_set.sketches.items():
+                sketch.n = meta["n"][axis]
+                levels = sorted(
+                    (int(name.rsplit("/", 1)[1]), data[name]) for name in data.files if name.startswith(f"{axis}/")
+                )
+                sketch.levels = [items for _, items in levels] or [np.empty(0)]
+        return sketch_set
+
+    @classmethod
+    def load_or_create(cls, path: str, k: int = DEFAULT_K) -> "SketchSet":
+        return cls.load(path) if os.path.exists(path) else cls(k)
+
+
+def merge_files(paths: Iterable[str], out_path: Optional[str] = None) -> SketchSet:
+    """Merge per-site sketch files into ``out_path`` (or return the merged set)."""
+    merged = None
+    for path in paths:
+        sketch_set = SketchSet.load(path)
+        if merged is None:
+            merged = sketch_set
+        else:
+            merged.merge(sketch_set)
+    if merged is None:
+        raise ValueError("No sketch files given.")
+    if out_path:
+        merged.save(out_path)
+    return merged
@@ -0,0 +1,75 @@
+"""Keep heavy work off the GUI's startup path.
+
+The window is built from tkinter alone; pandas, matplotlib and the pipeline are
+imported by :func:`warm_imports` on a background thread once it is showing.
+
+Frozen builds also ship matplotlib's font cache, built at packaging time by
+``scripts/build_font_cache.py``. Without it matplotlib scans every installed
+font on launch; PyInstaller's own matplotlib runtime hook points
+``MPLCONFIGDIR`` at a new temporary folder each run, so that scan would repeat
+on every launch. :func:`configure_frozen_matplotlib` runs before matplotlib is
+imported and points it at a persistent folder seeded from the bundled cache.
+"""
+
+import glob
+import os
+import shutil
+import sys
+import threading
+
+BUNDLED_CONFIG = "mplconfig"
+
+
+def build_font_cache(out_dir: str) -> str:
+    """Write matplotlib's font list to ``out_dir`` and return its path.
+
+    matplotlib stores its own fonts relative to its data folder, so the file
+    stays valid inside the bundle. Must run in a fresh interpreter: matplotlib
+    reads ``MPLCONFIGDIR`` once, on import.
+    """
+    if "matplotlib" in sys.modules:
+        raise RuntimeError("build_font_cache must run before matplotlib is imported.")
+    os.makedirs(out_dir, exist_ok=True)
+    os.environ["MPLCONFIGDIR"] = os.path.abspath(out_dir)
+    from matplotlib import font_manager
+
+    return os.path.join(out_dir, f"fontlist-v{font_manager.FontManager.__version__}.json")
+
+
+def configure_frozen_matplotlib(config_dir: str) -> bool:
+    """In a frozen build, point matplotlib at ``config_dir`` seeded with the shipped font cache."""
+    bundle = getattr(sys, "_MEIPASS", None)
+    if not getattr(sys, "frozen", False) or bundle is None or "matplotlib" in sys.modules:
+        return False
+    shipped = glob.glob(os.path.join(bundle, BUNDLED_CONFIG, "fontlist-*.json"))
+    if not shipped:
+        return False
+    try:
+        os.makedirs(config_dir, exist_ok=True)
+        for source in shipped:
+            target = os.path.join(config_dir, os.path.basename(source))
+            if not os.path.exists(target):
+                shutil.copyfile(source, target)
+    except OSError:
+        # An unwritable folder only costs the font scan; matplotlib falls back on its own.
+        return False
+    os.environ["MPLCONFIGDIR"] = config_dir
+    return True
+
+
+def warm_imports(modules) -> threading.Thread:
+    """Import ``modules`` on a daemon thread so the first Run or Make Charts click does not wait."""
+
+    def work():
+        import importlib
+
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                # The real import on first use reports the error properly.
+                return
+
+    thread = threading.Thread(target=work, name="warm-imports", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,171 @@
+"""Progress reporting, cancellation and a background worker for long runs.
+
+The pipeline reports :class:`ProgressEvent` objects and checks a
+:class:`CancelToken` between files and pages. :class:`BackgroundTask` runs a
+pipeline call on a worker thread and hands everything back to the UI thread
+through a queue, including resolver calls that must show dialogs there.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+
+class Cancelled(Exception):
+    """Raised inside a run when the user asked it to stop."""
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise Cancelled("Run cancelled.")
+
+
+@dataclass
+class ProgressEvent:
+    stage: str  # "files" or "pages"
+    current: int
+    total: int
+    item: str = ""
+    eta_seconds: Optional[float] = None
+
+    def describe(self) -> str:
+        noun = "File" if self.stage == "files" else "Athlete"
+        text = f"{noun} {self.current}/{self.total}"
+        if self.item:
+            text += f": {self.item}"
+        if self.eta_seconds is not None and self.current < self.total:
+            text += f" (about {format_duration(self.eta_seconds)} left)"
+        return text
+
+
+ProgressCallback = Callable[[ProgressEvent], None]
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    return f"{minutes}m {seconds:02d}s"
+
+
+class ProgressTracker:
+    """Counts completed items for one stage and estimates the time remaining."""
+
+    def __init__(self, stage: str, total: int, callback: Optional[ProgressCallback] = None):
+        self.stage = stage
+        self.total = total
+        self.current = 0
+        self.callback = callback
+        self._started = time.monotonic()
+
+    def advance(self, count: int = 1, item: str = "") -> None:
+        self.current += count
+        if self.callback is None:
+            return
+        elapsed = time.monotonic() - self._started
+        eta = elapsed / self.current * (self.total - self.current) if self.current else None
+        self.callback(ProgressEvent(self.stage, self.current, self.total, item, eta))
+
+
+class _UiCall:
+    def __init__(self, fn: Callable, args: tuple):
+        self.fn = fn
+        self.args = args
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+    def run(self) -> None:
+        try:
+            self.result = self.fn(*self.args)
+        except BaseException as exc:
+            self.error = exc
+        finally:
+            self.done.set()
+
+
+class BackgroundTask:
+    """Run ``target(task)`` on a worker thread.
+
+    The UI thread calls :meth:`dispatch` periodically; it receives
+    ``("status", message)``, ``("progress", ProgressEvent)`` and finally one of
+    ``("done", result)``, ``("cancelled", None)`` or ``("error", exception)``.
+    """
+
+    def __init__(self, target: Callable[["BackgroundTask"], Any]):
+        self.cancel_token = CancelToken()
+        self.finished = False
+        self._target = target
+        self._events: "queue.Queue" = queue.Queue()
+        # Only one UI call (dialog) may be outstanding at a time.
+        self._ui_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="radar-run", daemon=True)
+
+    def start(self) -> "BackgroundTask":
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        self.cancel_token.cancel()
+
+    # Worker side -----------------------------------------------------------
+
+    def status(self, message: str) -> None:
+        self._events.put(("status", message))
+
+    def progress(self, event: ProgressEvent) -> None:
+        self._events.put(("progress", event))
+
+    def call_on_ui(self, fn: Callable, *args):
+        """Run ``fn(*args)`` on the UI thread and wait for its result."""
+        call = _UiCall(fn, args)
+        with self._ui_lock:
+            self.cancel_token.check()
+            self._events.put(("call", call))
+            call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def ui_callback(self, fn: Callable) -> Callable:
+        return lambda *args: self.call_on_ui(fn, *args)
+
+    def _run(self) -> None:
+        try:
+            result = self._target(self)
+        except Cancelled:
+            self._events.put(("cancelled", None))
+        except Exception as exc:
+            self._events.put(("error", exc))
+        else:
+            self._events.put(("done", result))
+
+    # UI side ---------------------------------------------------------------
+
+    def dispatch(self, handler: Callable[[str, Any], None]) -> None:
+        """Deliver queued events in order; UI calls run here, on the caller's thread."""
+        while True:
+            try:
+                kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                return
+            if kind == "call":
+                payload.run()
+                continue
+            if kind in ("done", "cancelled", "error"):
+                self.finished = True
+            handler(kind, payload)
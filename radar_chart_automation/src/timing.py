@@ -0,0 +1,176 @@
+"""Lightweight wall/CPU timing spans for run diagnostics.
+
+    with timing.span("compute_percentiles"):
+        ...
+
+or decorate a function with ``@timing.timed("stage")``. Spans are recorded on
+the :class:`Recorder` made active with :func:`recording`. With no active
+recorder ``span`` returns a shared no-op object, so disabled instrumentation
+costs one context-variable lookup. CPU time is the calling thread's
+(``time.thread_time``), so waiting on worker threads or processes shows up as
+wall time only.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+PAGE_SPAN = "render_page"
+
+_current: ContextVar[Optional["Recorder"]] = ContextVar("timing_recorder", default=None)
+
+
+@dataclass
+class SpanRecord:
+    name: str
+    wall: float
+    cpu: float
+    attrs: Dict[str, object] = field(default_factory=dict)
+
+
+class Recorder:
+    def __init__(self):
+        self.records: List[SpanRecord] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: SpanRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def extend(self, records) -> None:
+        with self._lock:
+            self.records.extend(records)
+
+    def summary(self) -> List[dict]:
+        """One row per span name, in first-seen order."""
+        rows: Dict[str, dict] = {}
+        for record in self.records:
+            row = rows.setdefault(
+                record.name, {"name": record.name, "count": 0, "wall": 0.0, "cpu": 0.0, "max": 0.0}
+            )
+            row["count"] += 1
+            row["wall"] += record.wall
+            row["cpu"] += record.cpu
+            row["max"] = max(row["max"], record.wall)
+        return list(rows.values())
+
+    def wall_percentiles(self, name: str = PAGE_SPAN) -> Optional[dict]:
+        walls = [record.wall for record in self.records if record.name == name]
+        if not walls:
+            return None
+        p50, p90, p95, p99 = np.percentile(walls, [50, 90, 95, 99])
+        return {
+            "count": len(walls),
+            "p50": p50,
+            "p90": p90,
+            "p95": p95,
+            "p99": p99,
+            "max": max(walls),
+            "mean": float(np.mean(walls)),
+        }
+
+    def format_table(self) -> str:
+        lines = [f"{'Stage':<40} {'Count':>6} {'Wall s':>9} {'CPU s':>9} {'Mean ms':>9} {'Max ms':>9}"]
+        for row in self.summary():
+            mean_ms = row["wall"] / row["count"] * 1000
+            lines.append(
+                f"{row['name'][:40]:<40} {row['count']:>6} {row['wall']:>9.3f} {row['cpu']:>9.3f} "
+                f"{mean_ms:>9.1f} {row['max'] * 1000:>9.1f}"
+            )
+        return "\n".join(lines)
+
+    def write_metrics(self, path: str, section: str) -> None:
+        """Store this recorder under ``section`` of a metrics JSON file, keeping other sections."""
+        data = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    data = json.load(handle)
+            except (OSError, ValueError):
+                data = {}
+        data[section] = {
+            "stages": self.summary(),
+            "page_render_seconds": self.wall_percentiles(),
+            "spans": [asdict(record) for record in self.records if record.name != PAGE_SPAN],
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2, default=str)
+        os.replace(tmp_path, path)
+
+
+class _Span:
+    __slots__ = ("recorder", "name", "attrs", "_wall", "_cpu")
+
+    def __init__(self, recorder: Recorder, name: str, attrs: dict):
+        self.recorder = recorder
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        self.recorder.add(SpanRecord(self.name, wall, cpu, self.attrs))
+        return False
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **attrs):
+    recorder = _current.get()
+    if recorder is None:
+        return _NULL_SPAN
+    return _Span(recorder, name, attrs)
+
+
+def timed(name: str):
+    """Decorator form of :func:`span` for whole functions."""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _current.get()
+            if recorder is None:
+                return func(*args, **kwargs)
+            with _Span(recorder, name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def active() -> Optional[Recorder]:
+    return _current.get()
+
+
+@contextmanager
+def recording(recorder: Optional[Recorder]):
+    """Make ``recorder`` active for the block (``None`` disables timing)."""
+    token = _current.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current.reset(token)
@@ -0,0 +1,142 @@
+"""Per-athlete percentile trends across every date label of a run.
+
+Built from :class:`ChartData`'s ``(athletes, dates, axes)`` array in a few
+vectorized steps, with no per-athlete loop: for each athlete's tested dates,
+the change since their previous test, the change since a baseline (their first
+test, or a chosen date label), and the mean and least-squares slope (points
+per test) over their last ``window`` tests. Values are percentile points
+(0-100) in the run's date order, the order the charts list them.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .chart_data import ChartData
+from .chart_style import AXIS_LABELS
+
+DEFAULT_WINDOW = 3
+STAT_COLUMNS = ["delta_previous", "delta_baseline", "rolling_mean", "rolling_slope"]
+
+
+class Trends:
+    def __init__(self, data: ChartData, stats: Dict[str, np.ndarray], baseline: Optional[str], window: int):
+        self.data = data
+        # Each stat is an (athletes, dates, axes) array aligned with data.values; NaN where untested.
+        self.stats = stats
+        self.baseline = baseline
+        self.window = window
+
+    def deltas(self, athlete: str) -> Dict[str, np.ndarray]:
+        """``date label -> change since the previous test`` for each test after the first."""
+        row = self.data.athlete_index[athlete]
+        columns = np.flatnonzero(self.data.present[row])[1:]
+        delta = self.stats["delta_previous"][row]
+        return {self.data.dates[column]: delta[column] for column in columns}
+
+    def to_frame(self, label_column: str) -> pd.DataFrame:
+        """One row per athlete, tested date and axis (the layout of percentiles_long)."""
+        rows, columns = np.nonzero(self.data.present)
+        n_axes = len(AXIS_LABELS)
+        # Categoricals over codes avoid building a string per output row.
+        frame = pd.DataFrame(
+            {
+                "athlete_name": pd.Categorical.from_codes(np.repeat(rows, n_axes), self.data.athletes),
+                label_column: pd.Categorical.from_codes(np.repeat(columns, n_axes), self.data.dates),
+                "metric_key": pd.Categorical.from_codes(np.tile(np.arange(n_axes), len(rows)), AXIS_LABELS),
+                "percentile": self.data.values[rows, columns].ravel(),
+            }
+        )
+        for name in STAT_COLUMNS:
+            frame[name] = self.stats[name][rows, columns].ravel()
+        return frame
+
+    @classmethod
+    def from_frame(
+        cls,
+        frame: pd.DataFrame,
+        label_column: str,
+        athletes: Optional[Sequence[str]] = None,
+        dates: Optional[Sequence[str]] = None,
+    ) -> "Trends":
+        """Rebuild the arrays from a :meth:`to_frame` table (e.g. percentiles_trends read back).
+
+        Pass the run's ``athletes`` and ``dates`` (a :class:`ChartData`'s order):
+        the table is athlete-major, so first-seen order only matches the run's
+        date order when every athlete tested on every date.
+        """
+        athlete_codes, athletes = _codes(frame["athlete_name"], athletes)
+        date_codes, dates = _codes(frame[label_column], dates)
+        axis_codes = pd.Index(AXIS_LABELS).get_indexer(frame["metric_key"])
+        if (athlete_codes < 0).any() or (date_codes < 0).any():
+            raise ValueError("Trends table does not match the run's athletes and dates.")
+        if (axis_codes < 0).any():
+            raise ValueError("Unknown metric in trends table.")
+        shape = (len(athletes), len(dates), len(AXIS_LABELS))
+
+        def gather(column):
+            array = np.full(shape, np.nan)
+            array[athlete_codes, date_codes, axis_codes] = frame[column].to_numpy(dtype=float)
+            return array
+
+        present = np.zeros(shape[:2], dtype=bool)
+        present[athlete_codes, date_codes] = True
+        data = ChartData(list(athletes), list(dates), gather("percentile"), present)
+        return cls(data, {name: gather(name) for name in STAT_COLUMNS}, None, DEFAULT_WINDOW)
+
+
+def _codes(column: pd.Series, order: Optional[Sequence[str]]):
+    if order is None:
+        return pd.factorize(column, use_na_sentinel=False)
+    return pd.Index(order).get_indexer(column.astype(object)), pd.Index(order)
+
+
+def compute_trends(data: ChartData, baseline: Optional[str] = None, window: int = DEFAULT_WINDOW) -> Trends:
+    if window < 1:
+        raise ValueError("Trend window must be at least 1 test.")
+    if baseline is not None and baseline not in data.date_index:
+        raise ValueError(f"Baseline date '{baseline}' is not one of this run's dates.")
+    present = data.present
+    n_dates = present.shape[1]
+
+    # Left-align each athlete's tests: compact[:, j] is their (j+1)-th test, NaN past the last.
+    order = np.argsort(~present, axis=1, kind="stable")
+    compact = np.take_along_axis(data.values, order[:, :, None], axis=1)
+    compact[np.arange(n_dates)[None, :] >= present.sum(axis=1)[:, None]] = np.nan
+
+    delta = np.full_like(compact, np.nan)
+    delta[:, 1:] = compact[:, 1:] - compact[:, :-1]
+    if baseline is None:
+        base = compact[:, :1]
+    else:
+        base = data.values[:, data.date_index[baseline]][:, None]
+    baseline_delta = compact - base
+
+    # Rolling sums over the last `window` tests from cumulative sums; x is the test number.
+    x = np.arange(n_dates, dtype=float)[None, :, None]
+    lo = np.maximum(np.arange(n_dates) - window + 1, 0)
+    hi = np.arange(n_dates) + 1
+
+    def window_sum(values):
+        sums = np.concatenate([np.zeros_like(values[:, :1]), np.cumsum(values, axis=1)], axis=1)
+        return sums[:, hi] - sums[:, lo]
+
+    count = (hi - lo).astype(float)[None, :, None]
+    sum_x = ((hi - 1) * hi / 2 - (lo - 1) * lo / 2)[None, :, None]
+    sum_xx = ((hi - 1) * hi * (2 * hi - 1) / 6 - (lo - 1) * lo * (2 * lo - 1) / 6)[None, :, None]
+    sum_y = window_sum(compact)
+    sum_xy = window_sum(x * compact)
+    rolling_mean = sum_y / count
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = (count * sum_xy - sum_x * sum_y) / (count * sum_xx - sum_x**2)
+    slope[:, count[0, :, 0] < 2] = np.nan
+
+    # Scatter the left-aligned results back to their date columns.
+    stats = {}
+    for name, values in zip(STAT_COLUMNS, (delta, baseline_delta, rolling_mean, slope)):
+        scattered = np.full_like(values, np.nan)
+        np.put_along_axis(scattered, order[:, :, None], values, axis=1)
+        scattered[~present] = np.nan
+        stats[name] = scattered
+    return Trends(data, stats, baseline, window)
@@ -1,8 +1,11 @@
 import os
 import re
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
+import numpy as np
+import pandas as pd
 from dateutil import parser
 
 DATE_COLUMN_CANDIDATES = [
@@ -11,6 +14,12 @@ DATE_COLUMN_CANDIDATES = [
     "session date",
 ]
 
+# Fast paths tried before dateutil: (pattern capturing the date part, strptime format).
+KNOWN_DATE_FORMATS = [
+    (r"^\s*(\d{4}-\d{2}-\d{2})(?:[T ].*)?$", "%Y-%m-%d"),
+    (r"^\s*(\d{1,2}/\d{1,2}/\d{4})(?:\s.*)?$", "%m/%d/%Y"),
+]
+
 
 def sanitize_filename(value: str) -> str:
     value = value.strip()
@@ -26,13 +35,45 @@ def sanitize_title(value: str) -> str:
 def parse_date_label(value: str) -> Optional[str]:
     if not value:
         return None
+    return _fuzzy_date_label(str(value))
+
+
+@lru_cache(maxsize=4096)
+def _fuzzy_date_label(text: str) -> Optional[str]:
     try:
-        parsed = parser.parse(str(value), fuzzy=True)
-    except (ValueError, TypeError):
+        parsed = parser.parse(text, fuzzy=True)
+    except (ValueError, TypeError, OverflowError):
         return None
     return parsed.strftime("%Y-%m-%d")
 
 
+def resolve_date_labels(values) -> pd.Series:
+    """Date label ("YYYY-MM-DD") for every cell of a date column, None where unreadable.
+
+    Each distinct value is parsed once: known formats are matched vectorized and
+    only the leftovers go through the (memoized) fuzzy dateutil parser.
+    """
+    series = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.strftime("%Y-%m-%d").astype(object).where(series.notna(), None)
+
+    codes, uniques = pd.factorize(series)
+    text = pd.Series(uniques, dtype=object).map(str)
+    labels = pd.Series([None] * len(text), dtype=object)
+    for pattern, date_format in KNOWN_DATE_FORMATS:
+        pending = labels.isna()
+        parsed = pd.to_datetime(
+            text[pending].str.extract(pattern, expand=False), format=date_format, errors="coerce"
+        ).dropna()
+        labels[parsed.index] = parsed.dt.strftime("%Y-%m-%d")
+    pending = labels.isna()
+    labels[pending] = text[pending].map(parse_date_label)
+
+    lookup = np.array([label if isinstance(label, str) else None for label in labels] + [None], dtype=object)
+    # factorize marks missing cells with -1, which picks the trailing None.
+    return pd.Series(lookup[codes], index=series.index, dtype=object)
+
+
 def infer_date_from_filename(filename: str) -> Optional[str]:
     stem = os.path.splitext(os.path.basename(filename))[0]
     return parse_date_label(stem)
@@ -46,15 +87,5 @@ def pick_date_column(columns):
     return None
 
 
-def extract_date_label_from_column(df, column_name: str) -> Optional[str]:
-    if column_name not in df.columns:
-        return None
-    series = df[column_name].dropna()
-    if series.empty:
-        return None
-    sample = series.iloc[0]
-    return parse_date_label(sample)
-
-
 def format_timestamp(dt: datetime) -> str:
     return dt.strftime("%Y-%m-%d_%H%M%S")
@@ -1,6 +1,10 @@
 import os
 import sys
 
+import matplotlib
+
+matplotlib.use("Agg")
+
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
@@ -0,0 +1,65 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from src import pipeline
+
+
+def _wide():
+    rows = [
+        ("Athlete B", "2026-01-05", 0.1),
+        ("Athlete A", "2026-01-05", 0.2),
+        ("Athlete A", "2026-01-12", 0.3),
+        ("Athlete C", "2026-01-12", 0.4),
+        ("Athlete A", "2026-01-05", 0.5),  # a re-export of the same session replaces the first row
+    ]
+    data = {
+        "athlete_name": [name for name, _, _ in rows],
+        pipeline.LABEL_COLUMN: [label for _, label, _ in rows],
+    }
+    for offset, column in enumerate(pipeline.WIDE_VALUE_COLUMNS):
+        data[column] = [value + offset / 100 for _, _, value in rows]
+    return pd.DataFrame(data)
+
+
+def test_store_keeps_first_seen_order_and_presence():
+    data = pipeline.chart_data(_wide())
+
+    assert data.athletes == ["Athlete B", "Athlete A", "Athlete C"]
+    assert data.dates == ["2026-01-05", "2026-01-12"]
+    assert data.values.shape == (3, 2, len(pipeline.WIDE_VALUE_COLUMNS))
+    assert data.present.tolist() == [[True, False], [True, True], [False, True]]
+
+    series = data.series("Athlete A")
+    assert list(series) == ["2026-01-05", "2026-01-12"]
+    np.testing.assert_allclose(series["2026-01-05"], [50, 51, 52, 53, 54])
+    assert np.shares_memory(series["2026-01-12"], data.values)
+    assert list(data.series("Athlete C")) == ["2026-01-12"]
+    assert "2026-01-05" not in data.series("Athlete C")
+
+
+def test_series_match_the_row_by_row_build():
+    wide = _wide()
+    data = pipeline.chart_data(wide)
+
+    expected = {}
+    for _, row in wide.iterrows():
+        values = [float(row[col]) * 100 for col in pipeline.WIDE_VALUE_COLUMNS]
+        expected.setdefault(row["athlete_name"], {})[row[pipeline.LABEL_COLUMN]] = values
+
+    assert data.dates == ["2026-01-05", "2026-01-12"]
+    assert data.athletes == list(expected)
+    for athlete, date_map in expected.items():
+        series = data.series(athlete)
+        assert sorted(series) == sorted(date_map)
+        for label, values in date_map.items():
+            np.testing.assert_allclose(series[label], values)
+
+
+def test_series_pickles_as_a_plain_dict():
+    series = pipeline.chart_data(_wide()).series("Athlete A")
+    restored = pickle.loads(pickle.dumps(series))
+    assert isinstance(restored, dict)
+    assert list(restored) == list(series)
+    assert not np.shares_memory(restored["2026-01-05"], series["2026-01-05"])
@@ -1,3 +1,5 @@
+import pandas as pd
+
 from src import utils
 
 
@@ -8,3 +10,15 @@ def test_parse_date_label():
 
 def test_infer_from_filename():
     assert utils.infer_date_from_filename("cmj_2026-01-31.csv") == "2026-01-31"
+
+
+def test_resolve_date_labels_whole_column():
+    labels = utils.resolve_date_labels(
+        pd.Series(["2026-01-31", "2026-01-31 09:15", "1/2/2026", "Mar 15, 2026", None, "not a date"])
+    )
+    assert labels.tolist() == ["2026-01-31", "2026-01-31", "2026-01-02", "2026-03-15", None, None]
+
+
+def test_resolve_date_labels_accepts_datetime_column():
+    labels = utils.resolve_date_labels(pd.to_datetime(pd.Series(["2026-01-31", None])))
+    assert labels.tolist() == ["2026-01-31", None]
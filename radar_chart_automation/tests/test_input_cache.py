@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+import pytest
+
+from src import input_cache, io
+from src.disk_cache import DiskCache
+
+CSV = (
+    "Name,Jump Height (in),Peak Power/BM,RSI-Modified,Eccentric Peak Power/BM,Eccentric Deceleration RFD/BM\n"
+    "A,10,20,0.5,5,9\n"
+    "B,11,21,0.6,6,8\n"
+)
+
+
+def test_repeat_load_skips_parsing(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "export.csv"
+    path.write_text(CSV)
+    cache = input_cache.InputCache(root=str(tmp_path / "cache"))
+
+    first, mapping, values = cache.load_validated(str(path))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("file was parsed again")
+
+    monkeypatch.setattr(io, "load_csv", fail)
+    fresh = input_cache.InputCache(root=str(tmp_path / "cache"))
+    second, cached_mapping, cached_values = fresh.load_validated(str(path))
+
+    assert (fresh.hits, fresh.misses) == (1, 0)
+    assert cached_mapping == mapping
+    assert second.equals(first)
+    assert list(second.columns) == list(first.columns)
+    np.testing.assert_array_equal(cached_values, values)
+    assert second["Jump Height (in)"].dtype == "float64"
+
+
+def test_changed_content_is_a_miss(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text(CSV)
+    cache = input_cache.InputCache(root=str(tmp_path / "cache"))
+    cache.load_validated(str(path))
+
+    path.write_text(CSV.replace("A,10", "A,12"))
+    df, _mapping, _values = cache.load_validated(str(path))
+    assert cache.misses == 2
+    assert df["Jump Height (in)"].iloc[0] == 12.0
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    store = DiskCache(str(tmp_path), max_bytes=250)
+
+    def writer(size):
+        return lambda target: open(target, "wb").write(b"x" * size)
+
+    store.put("aa01", ".bin", writer(100))
+    store.put("bb02", ".bin", writer(100))
+    os.utime(store.path_for("aa01", ".bin"), (1, 1))
+    os.utime(store.path_for("bb02", ".bin"), (2, 2))
+    store.get("aa01", ".bin")  # refreshes aa01, leaving bb02 the oldest
+    store.put("cc03", ".bin", writer(100))
+
+    assert store.get("bb02", ".bin") is None
+    assert store.get("aa01", ".bin") and store.get("cc03", ".bin")
@@ -0,0 +1,105 @@
+import os
+import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src import input_store, pipeline
+
+
+def _write_export(path, names):
+    pd.DataFrame(
+        {
+            "Name": names,
+            "Date": ["2026-01-31"] * len(names),
+            "Jump Height (in)": range(10, 10 + len(names)),
+            "Peak Power/BM": range(20, 20 + len(names)),
+            "RSI-Modified": [0.5] * len(names),
+            "Eccentric Peak Power/BM": range(5, 5 + len(names)),
+            "Eccentric Deceleration RFD/BM": range(9, 9 + len(names)),
+        }
+    ).to_csv(path, index=False)
+
+
+def test_runs_share_one_stored_copy_of_each_input(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    export = tmp_path / "season.csv"
+    _write_export(export, ["A", "B"])
+
+    first = pipeline.run_processing([str(export)], run_title="First")
+    second = pipeline.run_processing([str(export)], run_title="Second")
+
+    store = input_store.InputStore()
+    stored = [
+        os.path.join(root, name) for root, _dirs, names in os.walk(store.root) for name in names if name[0] != "."
+    ]
+    assert len(stored) == 1 and stored[0].endswith(".csv")
+    # The run's copy keeps the export's permissions.
+    assert os.stat(stored[0]).st_mode & stat.S_IWUSR
+    for result in (first, second):
+        linked = os.path.join(result.run_paths.raw_input, "season.csv")
+        assert os.path.samefile(linked, stored[0])
+    # The first run pruned; the second found it done within the interval.
+    assert not store.prune_due()
+
+    # Once no run links to it, the stored file goes on the next prune.
+    shutil.rmtree(first.run_paths.base)
+    shutil.rmtree(second.run_paths.base)
+    assert store.prune() == 1
+    assert not os.path.exists(stored[0])
+
+
+def test_link_falls_back_to_a_copy(tmp_path, monkeypatch):
+    source = tmp_path / "export.csv"
+    source.write_text("Name\nA\n")
+    store = input_store.InputStore(str(tmp_path / "store"))
+    _digest, stored = store.add(str(source))
+
+    def no_links(*_args):
+        raise OSError("links not supported")
+
+    monkeypatch.setattr(os, "link", no_links)
+    monkeypatch.setattr(input_store, "_reflink", lambda source, target: False)
+    target = tmp_path / "run" / "export.csv"
+    target.parent.mkdir()
+    assert store.link(stored, str(target)) == "copy"
+    assert target.read_text() == "Name\nA\n"
+    assert not os.path.samefile(stored, target)
+    assert os.stat(target).st_mode & stat.S_IWUSR
+
+
+def test_prune_keeps_copied_inputs_while_a_run_lists_them(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    export = tmp_path / "season.csv"
+    _write_export(export, ["A", "B"])
+
+    def no_links(*_args):
+        raise OSError("links not supported")
+
+    monkeypatch.setattr(os, "link", no_links)
+    monkeypatch.setattr(input_store, "_reflink", lambda source, target: False)
+    result = pipeline.run_processing([str(export)], run_title="Copied")
+
+    store = input_store.InputStore()
+    assert store.prune() == 0
+    # The run folder's copy is gone, but the store still serves its content.
+    os.remove(os.path.join(result.run_paths.raw_input, "season.csv"))
+    assert store.prune() == 0
+    assert pipeline.athlete_groups(result.run_paths.base, result.wide_all, "Name") == {"A": "A", "B": "B"}
+
+    shutil.rmtree(result.run_paths.base)
+    assert store.prune() == 1
+
+
+def test_concurrent_adds_of_the_same_content(tmp_path):
+    source = tmp_path / "export.csv"
+    source.write_text("Name\nA\n")
+    store = input_store.InputStore(str(tmp_path / "store"), str(tmp_path / "runs"))
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        stored = set(pool.map(lambda _: store.add(str(source))[1], range(32)))
+    assert len(stored) == 1
+    assert open(stored.pop()).read() == "Name\nA\n"
+    assert [name for _root, _dirs, names in os.walk(store.root) for name in names if name.endswith(".tmp")] == []
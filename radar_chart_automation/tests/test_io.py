@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import io
+
+HEADER = "Name,Date,Jump Height (in),Peak Power/BM,RSI-Modified,Eccentric Peak Power/BM,Eccentric Deceleration RFD/BM"
+
+
+def test_load_csv_reads_only_mapped_and_date_columns(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text(
+        HEADER + ",Notes,Extra\n"
+        "A,2026-01-31,10,20,0.5,5,9,hello,1\n"
+        "B,2026-01-31,11,21,0.6,6,8,world,2\n"
+    )
+
+    df, mapping = io.load_csv(str(path))
+
+    assert "Notes" not in df.columns and "Extra" not in df.columns
+    assert "Date" in df.columns
+    assert mapping["jump_height"] == "Jump Height (in)"
+    assert df["Jump Height (in)"].dtype == "float64"
+
+
+def test_missing_mapping_fails_before_parsing_rows(tmp_path):
+    path = tmp_path / "export.csv"
+    # Ragged body rows would make a full parse fail; the header alone is enough here.
+    path.write_text(HEADER.replace("Name", "Who") + "\nA,1\nB,2,3,4,5,6,7,8,9,10\n")
+
+    with pytest.raises(io.ColumnMappingNeeded) as excinfo:
+        io.load_csv(str(path))
+    assert excinfo.value.missing_keys == ["athlete_name"]
+    assert "Who" in excinfo.value.columns
+
+
+def test_non_numeric_cells_still_reported_by_validation(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text(HEADER + "\nA,2026-01-31,10,n/a,0.5,5,9\n")
+
+    df, mapping = io.load_csv(str(path))
+    with pytest.raises(ValueError, match="Peak Power/BM"):
+        io.validate_required_metrics(df, mapping)
+
+
+def test_validation_report_lists_rows_and_raw_values():
+    rows = 30
+    df = pd.DataFrame({col: [1.0] * rows for col in HEADER.split(",")[2:]})
+    df.insert(0, "Name", [f"A{index}" for index in range(rows)])
+    df["RSI-Modified"] = ["0.5"] * rows
+    df.loc[3, "RSI-Modified"] = "n/a"
+    df.loc[4, "Name"] = None
+    df.loc[range(0, rows, 2), "Jump Height (in)"] = np.nan
+    mapping = io.resolve_mapping(df.columns)
+
+    with pytest.raises(io.InputValidationError) as excinfo:
+        io.validate_required_metrics(df, mapping)
+    report = excinfo.value.report
+    assert report.missing_name_rows == [6]
+    assert report.invalid_counts == {"Jump Height (in)": 15, "RSI-Modified": 1}
+    assert [(cell.row, cell.value) for cell in report.invalid_cells if cell.column == "RSI-Modified"] == [(5, "n/a")]
+    assert len([cell for cell in report.invalid_cells if cell.column == "Jump Height (in)"]) == io.MAX_REPORTED_CELLS
+    assert "row 5: 'n/a'" in str(excinfo.value) and "+5 more" in str(excinfo.value)
+
+    df.loc[3, "RSI-Modified"] = "0.7"
+    df.loc[4, "Name"] = "A4"
+    df["Jump Height (in)"] = 2.0
+    block = io.validate_required_metrics(df, mapping)
+    assert block.shape == (rows, 5) and block.dtype == np.float64
+    assert block[3, 2] == 0.7 and block[0, 0] == 2.0
+
+
+def test_load_excel_projects_columns(tmp_path):
+    path = tmp_path / "export.xlsx"
+    columns = HEADER.split(",") + ["Notes"]
+    pd.DataFrame([["A", "2026-01-31", 10, 20, 0.5, 5, 9, "x"]], columns=columns).to_excel(path, index=False)
+
+    df, _mapping = io.load_csv(str(path))
+    assert list(df.columns) == HEADER.split(",")
+
+
+def test_streaming_excel_reader_matches_read_excel(tmp_path):
+    from datetime import datetime
+
+    from openpyxl import Workbook
+
+    path = str(tmp_path / "export.xlsx")
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER.split(",") + ["Notes"])
+    sheet.append(["A", datetime(2026, 1, 31), 10, 20.5, 0.5, 5, 9, "x"])
+    sheet.append([None] * 8)
+    sheet.append(["B", "2026-01-31", 11, "21", 0.6, 6, 8])
+    sheet.append([None, None, None, None, None, None, None, "notes only"])
+    sheet.append([])
+    workbook.save(path)
+
+    columns = io.read_header(path)
+    usecols = io.projected_columns(columns, io.resolve_mapping(columns))
+    for dtype in (None, {"Jump Height (in)": "float64", "Peak Power/BM": "float64"}):
+        expected = pd.read_excel(path, engine="openpyxl", usecols=usecols, dtype=dtype)
+        pd.testing.assert_frame_equal(io.read_excel_columns(path, columns, usecols, dtype), expected)
@@ -0,0 +1,59 @@
+import json
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import pytest  # noqa: E402
+
+from src import memory, radar_plot  # noqa: E402
+
+VALUES = {"2026-01-05": [0.5, 0.6, 0.7, 0.4, 0.3]}
+
+
+def test_monitor_records_stages_and_writes_metrics(tmp_path):
+    monitor = memory.MemoryMonitor()
+    with memory.monitoring(monitor):
+        with memory.stage("outer"):
+            with memory.stage("allocate"):
+                block = bytearray(8 * memory.MB)
+            del block
+
+    stages = [record.stage for record in monitor.records]
+    assert stages == ["allocate", "outer"]
+    assert monitor.records[0].traced_peak >= 8 * memory.MB
+    assert "allocate" in monitor.format_table()
+
+    path = tmp_path / "metrics.json"
+    path.write_text(json.dumps({"outer": {"stages": []}}), encoding="utf-8")
+    monitor.write_metrics(str(path), "outer")
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["outer"]["stages"] == []
+    assert [row["stage"] for row in data["outer"]["memory"]] == stages
+
+
+def test_stage_is_a_no_op_without_a_monitor():
+    with memory.stage("anything"):
+        pass
+    memory.sample()
+
+
+def test_ceiling_flushes_then_aborts():
+    flushed = []
+    with pytest.raises(memory.MemoryCeilingExceeded):
+        memory.enforce_ceiling(1, lambda: flushed.append(True))
+    assert flushed == [True]
+    memory.enforce_ceiling(None)
+    memory.enforce_ceiling(1 << 50)
+
+
+def test_guarded_figure_is_closed_when_saving_fails():
+    before = set(plt.get_fignums())
+    with pytest.raises(OSError):
+        with radar_plot.RadarFigureRenderer() as renderer:
+            fig = renderer.render("Athlete A", VALUES)
+            assert memory.live_figures() == len(before) + 1
+            raise OSError("disk full")
+    assert set(plt.get_fignums()) == before
+    assert not plt.fignum_exists(fig.number)
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import norms, percentiles
+
+
+def _long_frame(values, team=None):
+    frame = pd.DataFrame(
+        {
+            "athlete_name": np.repeat([f"A{i}" for i in range(len(values))], len(percentiles.AXIS_LABELS)),
+            "metric_key": np.tile(percentiles.AXIS_LABELS, len(values)),
+            "raw_value": np.repeat(values, len(percentiles.AXIS_LABELS)),
+        }
+    )
+    if team is not None:
+        frame["team"] = team
+    return frame
+
+
+def test_percent_rank_matches_rank_eq_with_value_added():
+    reference = np.array([1.0, 2.0, 2.0, 3.0, 5.0])
+    values = np.array([0.5, 2.0, 4.0, 9.0])
+    for value, result in zip(values, norms.percent_rank(reference, values)):
+        pool = pd.Series(np.append(reference, value))
+        expected = pool.rank(method="min").iloc[-1] / len(pool)
+        assert result == pytest.approx(expected)
+
+
+def test_build_index_and_score_against_it(tmp_path):
+    long_csv = tmp_path / "percentiles_long.csv"
+    _long_frame([10.0, 20.0, 30.0]).to_csv(long_csv, index=False)
+    root = str(tmp_path / "norms")
+
+    index = norms.build_index(root, [str(long_csv)])
+    norms.build_index(root, [str(long_csv)])  # already included: no double counting
+
+    reopened = norms.NormsIndex.open(root)
+    assert reopened.groups["all"]["Jump Height"]["count"] == 3
+    reference = reopened.reference()
+    assert reference.identity == index.reference().identity
+
+    mapping = {"athlete_name": "name", **{key: key for key in percentiles.METRIC_TO_AXIS}}
+    df = pd.DataFrame({"name": ["New"], **{key: [25.0] for key in percentiles.METRIC_TO_AXIS}})
+    _, wide_df = percentiles.compute_percentiles(df, mapping, reference)
+    assert wide_df.iloc[0, 1:].tolist() == [0.75] * 5
+
+
+def test_grouped_index_keeps_groups_apart(tmp_path):
+    root = str(tmp_path / "norms")
+    index = norms.NormsIndex.open_or_create(root, ["team"])
+    index.add_long(_long_frame([1.0, 2.0], team="Soccer"), "first")
+    index.add_long(_long_frame([5.0], team="Track"), "second")
+    index.save()
+
+    assert norms.NormsIndex.open(root).reference("Track").count("Braking") == 1
+    with pytest.raises(ValueError, match="No norms for group"):
+        index.reference("Rowing")
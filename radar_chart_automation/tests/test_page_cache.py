@@ -0,0 +1,54 @@
+import os
+
+import pandas as pd
+from pypdf import PdfReader
+
+from src import pipeline, rendering
+
+
+def _export(path):
+    pd.DataFrame(
+        {
+            "Name": ["Athlete A", "Athlete B", "Athlete C"],
+            "Date": ["2026-01-31"] * 3,
+            "Jump Height (in)": [10, 11, 12],
+            "Peak Power/BM": [20, 21, 22],
+            "RSI-Modified": [0.5, 0.6, 0.7],
+            "Eccentric Peak Power/BM": [3, 2, 1],
+            "Eccentric Deceleration RFD/BM": [30, 31, 32],
+        }
+    ).to_csv(path, index=False)
+
+
+def test_pages_are_shared_across_run_titles_and_subsets(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    export = tmp_path / "export.csv"
+    _export(export)
+    result = pipeline.run_processing([str(export)], run_title="Cache")
+    pipeline.make_charts(result, run_title="First", export_png=True, workers=1)
+
+    rendered = []
+    original = rendering.render_chunk
+
+    def counting_render(pdf_path, jobs, *args, **kwargs):
+        rendered.extend(jobs)
+        return original(pdf_path, jobs, *args, **kwargs)
+
+    monkeypatch.setattr(rendering, "render_chunk", counting_render)
+    png_dir = os.path.join(result.run_paths.outputs, "png")
+    for name in os.listdir(png_dir):
+        os.remove(os.path.join(png_dir, name))
+
+    pdf_path = pipeline.make_charts(
+        result, run_title="Second", export_png=True, workers=1, athletes=["Athlete C", "Athlete A"]
+    )
+    assert rendered == []
+    text = [page.extract_text() for page in PdfReader(pdf_path).pages]
+    assert len(text) == 2 and "Athlete A" in text[0] and "Athlete C" in text[1]
+    assert sorted(os.listdir(png_dir)) == ["Athlete_A.png", "Athlete_C.png"]
+    with open(os.path.join(result.run_paths.logs, "run.log"), encoding="utf-8") as handle:
+        assert "Page cache: 2 hit(s), 0 miss(es)" in handle.read()
+
+    pipeline.make_charts(result, run_title="Third", workers=1, use_page_cache=False)
+    assert len(rendered) == 3
@@ -0,0 +1,34 @@
+from pypdf import PdfReader
+
+from src import pdf_writer
+
+
+def test_direct_writer_pages_share_static_forms(tmp_path):
+    pdf_path = str(tmp_path / "direct.pdf")
+    pages = [
+        ("Athlete (One)", {"2026-01-31": [10, 20, 30, 40, 50]}),
+        ("Athlete Two", {"2026-01-31": [10, 20, 30, 40, 50], "2026-03-15": [15, 20, 25, 40, 55.5]}),
+    ]
+    with pdf_writer.RadarPdfWriter(pdf_path) as writer:
+        for athlete_name, date_to_values in pages:
+            writer.add_page(athlete_name, date_to_values)
+
+    reader = PdfReader(pdf_path, strict=True)
+    assert len(reader.pages) == 2
+    second = reader.pages[1].extract_text()
+    assert "Athlete Two" in second
+    assert "Delta" in second and "+5.5" in second
+    assert "Athlete (One)" in reader.pages[0].extract_text()
+
+    grids = {page["/Resources"]["/XObject"].raw_get("/Grid").idnum for page in reader.pages}
+    assert len(grids) == 1
+
+
+def test_text_width_uses_font_metrics():
+    assert pdf_writer.text_width("ii", 10) < pdf_writer.text_width("MM", 10)
+    assert pdf_writer.text_width("Delta", 9, bold=True) > pdf_writer.text_width("Delta", 9)
+
+
+def test_encodable_flags_names_the_builtin_fonts_cannot_show():
+    assert pdf_writer.encodable("Zoë Müller")
+    assert not pdf_writer.encodable("王伟")
@@ -1,6 +1,18 @@
+import numpy as np
 import pandas as pd
+import pytest
 
-from src import percentiles
+from src import io, percentiles
+
+MAPPING = {
+    "athlete_name": "Name",
+    "jump_height": "Jump Height (in)",
+    "peak_power_bm": "Peak Power/BM",
+    "rsi_modified": "RSI-Modified",
+    "ecc_peak_power_bm": "Eccentric Peak Power/BM",
+    "ecc_dec_rfd_bm": "Eccentric Deceleration RFD/BM",
+}
+MAPPING_COLUMNS = list(MAPPING.values())[1:]
 
 
 def test_percentiles_rank_n():
@@ -56,3 +68,58 @@ def test_percentiles_ties_min_rank():
     assert wide_df.loc[1, "Jump Height percentile"] == 2 / 4
     assert wide_df.loc[2, "Jump Height percentile"] == 2 / 4
     assert wide_df.loc[3, "Jump Height percentile"] == 4 / 4
+
+
+def test_percentiles_ignore_frame_index():
+    df = pd.DataFrame(
+        {
+            "Name": ["X", "A", "B", "C"],
+            "Jump Height (in)": [99, 30, 10, 20],
+            "Peak Power/BM": [1, 2, 3, 4],
+            "RSI-Modified": [1, 2, 3, 4],
+            "Eccentric Peak Power/BM": [1, 2, 3, 4],
+            "Eccentric Deceleration RFD/BM": [1, 2, 3, 4],
+        }
+    )
+    mapping = {
+        "athlete_name": "Name",
+        "jump_height": "Jump Height (in)",
+        "peak_power_bm": "Peak Power/BM",
+        "rsi_modified": "RSI-Modified",
+        "ecc_peak_power_bm": "Eccentric Peak Power/BM",
+        "ecc_dec_rfd_bm": "Eccentric Deceleration RFD/BM",
+    }
+
+    filtered = df[df["Name"] != "X"]
+    long_df, wide_df = percentiles.compute_percentiles(filtered, mapping)
+    assert wide_df["athlete_name"].tolist() == ["A", "B", "C"]
+    assert wide_df["Jump Height percentile"].tolist() == [1.0, 1 / 3, 2 / 3]
+    jump_rows = long_df[long_df["metric_key"] == "Jump Height"]
+    assert jump_rows["raw_value"].tolist() == [30.0, 10.0, 20.0]
+
+
+def test_grouped_percentiles_match_ranking_each_group_alone():
+    rng = np.random.default_rng(7)
+    n = 60
+    df = pd.DataFrame(
+        {
+            "Name": [f"A{index}" for index in range(n)],
+            "Team": rng.choice(["Soccer", "Track", None], n),
+            "Pos": rng.choice(["F", "B"], n),
+            **{col: rng.integers(0, 5, n) for col in MAPPING_COLUMNS},
+        }
+    )
+    mapping = io.resolve_mapping(df.columns, {**MAPPING, "pos": "Pos"}, ["team", "pos"])
+    assert mapping["team"] == "Team"
+
+    long_df, wide_df = percentiles.compute_percentiles(df, mapping, group_by=["team", "pos"])
+    assert list(wide_df.columns[:3]) == ["athlete_name", "team", "pos"]
+    assert {"team", "pos"} <= set(long_df.columns)
+    for (team, pos), rows in df.fillna({"Team": ""}).groupby(["Team", "Pos"]):
+        _, alone = percentiles.compute_percentiles(rows, MAPPING)
+        grouped = wide_df[(wide_df["team"] == team) & (wide_df["pos"] == pos)]
+        assert grouped["athlete_name"].tolist() == alone["athlete_name"].tolist()
+        np.testing.assert_allclose(grouped.iloc[:, 3:].to_numpy(), alone.iloc[:, 1:].to_numpy())
+
+    with pytest.raises(ValueError, match="cannot be combined with norms"):
+        percentiles.compute_percentiles(df, mapping, reference=object(), group_by=["team"])
@@ -0,0 +1,332 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from src import chart_style, io, percentiles, pipeline, sketches
+
+
+def _write_export(path, names, date_label):
+    n = len(names)
+    pd.DataFrame(
+        {
+            "Name": names,
+            "Date": [date_label] * n,
+            "Jump Height (in)": range(10, 10 + n),
+            "Peak Power/BM": range(20, 20 + n),
+            "RSI-Modified": [0.5] * n,
+            "Eccentric Peak Power/BM": range(n, 0, -1),
+            "Eccentric Deceleration RFD/BM": range(30, 30 + n),
+        }
+    ).to_csv(path, index=False)
+
+
+def test_run_processing_and_charts_headless(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    first = tmp_path / "jan.csv"
+    second = tmp_path / "mar.csv"
+    _write_export(first, ["A", "B", "C"], "2026-01-31")
+    _write_export(second, ["A", "B"], "2026-03-15")
+
+    result = pipeline.run_processing([str(first), str(second)], run_title="Pipeline Test")
+
+    assert result.date_labels == ["2026-01-31", "2026-03-15"]
+    assert result.athlete_names == ["A", "B", "C"]
+    assert len(result.wide_all) == 5
+    assert os.path.exists(os.path.join(result.run_paths.percentiles, "percentiles_wide.csv"))
+
+    pdf_path = pipeline.make_charts(
+        result.run_paths.base, run_title="Pipeline Test", athletes=["A"], memory_profile=True
+    )
+    assert os.path.basename(pdf_path) == "Pipeline_Test__radars.pdf"
+    assert os.path.getsize(pdf_path) > 0
+
+    with open(os.path.join(result.run_paths.logs, "metrics.json"), encoding="utf-8") as handle:
+        metrics = json.load(handle)
+    assert metrics["make_charts"]["page_render_seconds"]["count"] == 1
+    assert [row["stage"] for row in metrics["make_charts"]["memory"]] == ["render_pages", "make_charts"]
+    assert any(row["name"] == "compute_percentiles" for row in metrics["run_processing"]["stages"])
+
+    # No match leaves the PDF and its manifest entry alone.
+    before = os.stat(pdf_path).st_mtime_ns
+    manifest_path = os.path.join(result.run_paths.base, "manifest.json")
+    with open(manifest_path, encoding="utf-8") as handle:
+        manifest = handle.read()
+    with pytest.raises(ValueError, match="No matching athletes"):
+        pipeline.make_charts(result.run_paths.base, run_title="Pipeline Test", athletes=["Nobody"])
+    assert os.stat(pdf_path).st_mtime_ns == before
+    with open(manifest_path, encoding="utf-8") as handle:
+        assert handle.read() == manifest
+
+
+def test_charts_use_the_in_memory_result_until_the_csv_changes(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    export = tmp_path / "jan.csv"
+    _write_export(export, ["Athlete A", "Athlete B"], "2026-01-31")
+    result = pipeline.run_processing([str(export)], run_title="Hand-off")
+
+    reads = []
+    original = pipeline.read_percentiles_wide
+    monkeypatch.setattr(pipeline, "read_percentiles_wide", lambda folder: reads.append(folder) or original(folder))
+    pipeline.make_charts(result, run_title="Hand-off", backend="pdf", workers=1)
+    assert reads == []
+
+    wide_path = os.path.join(result.run_paths.percentiles, "percentiles_wide.csv")
+    stat = os.stat(wide_path)
+    os.utime(wide_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    pipeline.make_charts(result, run_title="Hand-off", backend="pdf", workers=1)
+    assert reads == [result.run_paths.base]
+
+
+def test_reopened_run_reads_the_arrow_copy_unless_the_csv_is_newer(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    export = tmp_path / "jan.csv"
+    _write_export(export, ["Athlete A", "Athlete B"], "2026-01-31")
+    result = pipeline.run_processing([str(export)], run_title="Arrow")
+    wide_path = os.path.join(result.run_paths.percentiles, "percentiles_wide.csv")
+    assert os.path.exists(os.path.join(result.run_paths.percentiles, "percentiles_long.arrow"))
+
+    with monkeypatch.context() as patch:
+        patch.setattr(pd, "read_csv", lambda *args, **kwargs: pytest.fail("parsed the CSV"))
+        loaded = pipeline.read_percentiles_wide(result.run_paths.base)
+    pd.testing.assert_frame_equal(loaded, result.wide_all, check_dtype=False)
+
+    edited = result.wide_all.assign(athlete_name=["Edited A", "Edited B"])
+    edited.to_csv(wide_path, index=False)
+    stat = os.stat(wide_path)
+    os.utime(wide_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert pipeline.read_percentiles_wide(result.run_paths.base)["athlete_name"].tolist() == ["Edited A", "Edited B"]
+
+
+def test_date_label_resolver_used_when_unresolved(tmp_path):
+    df = pd.DataFrame({"Name": ["A"]})
+    path = str(tmp_path / "export.csv")
+    assert pipeline.session_rows(df, path, lambda _path: "Jan 31, 2026") == [("2026-01-31", None)]
+    with pytest.raises(ValueError, match="No date label"):
+        pipeline.session_rows(df, path)
+
+
+def test_repeat_run_reuses_unchanged_inputs_and_pages(tmp_path, monkeypatch):
+    from pypdf import PdfReader
+
+    from src import percentiles, rendering
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    first = tmp_path / "jan.csv"
+    second = tmp_path / "mar.csv"
+    _write_export(first, ["Athlete A", "Athlete B", "Athlete C"], "2026-01-31")
+    _write_export(second, ["Athlete A", "Athlete B"], "2026-03-15")
+    result = pipeline.run_processing([str(first), str(second)], run_title="Incremental", use_cache=False)
+    pipeline.make_charts(result.run_paths.base, run_title="Incremental", workers=1, backend="pdf")
+
+    # Only the March export changes: January must not be recomputed and Athlete C's page not re-rendered.
+    _write_export(second, ["Athlete A", "Athlete B"], "2026-03-16")
+    computed = []
+    original_compute = percentiles.compute_percentiles
+    monkeypatch.setattr(
+        percentiles,
+        "compute_percentiles",
+        lambda df, mapping, *args: computed.append(len(df)) or original_compute(df, mapping, *args),
+    )
+    rendered = []
+    original_render = rendering.render_pages
+    monkeypatch.setattr(
+        rendering,
+        "render_pages",
+        lambda pdf_path, jobs, **kwargs: rendered.extend(job.athlete for job in jobs)
+        or original_render(pdf_path, jobs, **kwargs),
+    )
+
+    result = pipeline.run_processing([str(first), str(second)], run_title="Incremental", use_cache=False)
+    pdf_path = pipeline.make_charts(result.run_paths.base, run_title="Incremental", workers=1, backend="pdf")
+
+    assert computed == [2]
+    assert result.date_labels == ["2026-01-31", "2026-03-16"]
+    assert rendered == ["Athlete A", "Athlete B"]
+    pages = PdfReader(pdf_path).pages
+    titles = [line for page in pages for line in page.extract_text().splitlines() if line.startswith("Athlete")]
+    assert titles == ["Athlete A", "Athlete B", "Athlete C"]
+
+
+def test_multi_session_export_splits_into_cohorts(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    jan = tmp_path / "jan.csv"
+    mar = tmp_path / "mar.csv"
+    _write_export(jan, ["A", "B", "C"], "2026-01-31")
+    _write_export(mar, ["A", "B"], "03/15/2026")
+    combined = tmp_path / "season.csv"
+    pd.concat([pd.read_csv(mar), pd.read_csv(jan)]).to_csv(combined, index=False)
+
+    split = pipeline.run_processing([str(combined)], run_title="Season", use_cache=False)
+    separate = pipeline.run_processing([str(jan), str(mar)], run_title="Separate", use_cache=False)
+
+    assert split.date_labels == ["2026-01-31", "2026-03-15"]
+    pd.testing.assert_frame_equal(split.wide_all, separate.wide_all)
+
+
+def test_multi_session_export_reports_rows_without_dates(tmp_path):
+    df = pd.DataFrame({"Name": ["A", "B", "C"], "Date": ["2026-01-31", None, "2026-03-15"]})
+    with pytest.raises(ValueError, match="rows 3"):
+        pipeline.session_rows(df, str(tmp_path / "season.csv"))
+
+
+def test_group_by_ranks_within_each_cohort(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    export = tmp_path / "export.csv"
+    _write_export(export, ["A", "B", "C", "D"], "2026-01-31")
+    df = pd.read_csv(export)
+    df.insert(1, "Squad", ["Red", "Blue", "Red", "Blue"])
+    df.to_csv(export, index=False)
+
+    with pytest.raises(io.ColumnMappingNeeded):
+        pipeline.run_processing([str(export)], run_title="Cohorts", group_by=["Position"])
+    # "Team" is auto-detected from its header variants, here "Squad".
+    result = pipeline.run_processing([str(export)], run_title="Cohorts", group_by=["Team"])
+    wide = result.wide_all.set_index("athlete_name")
+    assert wide["team"].to_dict() == {"A": "Red", "B": "Blue", "C": "Red", "D": "Blue"}
+    assert wide["Jump Height percentile"].to_dict() == {"A": 0.5, "B": 0.5, "C": 1.0, "D": 1.0}
+    assert "team" in pd.read_csv(os.path.join(result.run_paths.percentiles, "percentiles_long.csv")).columns
+
+    # Ranking the whole file again is a different scoring, so nothing is reused.
+    result = pipeline.run_processing([str(export)], run_title="Cohorts")
+    assert "team" not in result.wide_all.columns
+    assert result.wide_all["Jump Height percentile"].tolist() == [0.25, 0.5, 0.75, 1.0]
+
+
+def test_trend_stage_feeds_the_chart_table(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    jan = tmp_path / "jan.csv"
+    mar = tmp_path / "mar.csv"
+    _write_export(jan, ["A", "B"], "2026-01-31")
+    _write_export(mar, ["B", "A"], "2026-03-15")
+    result = pipeline.run_processing([str(jan), str(mar)], run_title="Trends", trend_baseline="01/31/2026")
+
+    table = pd.read_csv(os.path.join(result.run_paths.percentiles, pipeline.TRENDS_CSV))
+    jump = table[(table["athlete_name"] == "A") & (table["metric_key"] == "Jump Height")]
+    assert jump["percentile"].tolist() == [50.0, 100.0]
+    assert jump["delta_previous"].isna().tolist() == [True, False]
+    assert jump["delta_baseline"].tolist() == [0.0, 50.0]
+
+    # Charts built from the run folder read the table instead of recomputing trends.
+    jobs = []
+    monkeypatch.setattr(pipeline.trends, "compute_trends", None)
+    monkeypatch.setattr(
+        pipeline.rendering,
+        "render_pages",
+        lambda pdf_path, page_jobs, **kwargs: jobs.extend(page_jobs),
+    )
+    pipeline.make_charts(result.run_paths.base, run_title="Trends", backend="pdf", use_page_cache=False)
+    deltas = {job.athlete: job.deltas for job in jobs}
+    assert list(deltas["A"]) == ["2026-03-15"]
+    assert deltas["A"]["2026-03-15"][0] == 50.0
+
+
+def test_trends_read_back_keep_the_run_date_order_when_athletes_skip_sessions(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    paths = []
+    for label, names in (("2026-01-31", ["A", "X"]), ("2026-02-28", ["B", "Y"]), ("2026-03-31", ["A", "B"])):
+        paths.append(tmp_path / f"{label}.csv")
+        _write_export(paths[-1], names, label)
+    result = pipeline.run_processing([str(path) for path in paths], run_title="Skipped")
+
+    jobs = []
+    monkeypatch.setattr(pipeline.trends, "compute_trends", None)
+    monkeypatch.setattr(
+        pipeline.rendering,
+        "render_pages",
+        lambda pdf_path, page_jobs, **kwargs: jobs.extend(page_jobs),
+    )
+    pipeline.make_charts(result.run_paths.base, run_title="Skipped", backend="pdf", use_page_cache=False)
+    deltas = {job.athlete: job.deltas for job in jobs}
+    assert list(deltas["A"]) == ["2026-03-31"]
+    assert list(deltas["B"]) == ["2026-03-31"]
+    for job in jobs:
+        chart_style.percentile_table_rows(job.date_to_values, job.deltas)
+
+
+def test_local_sketch_is_only_updated_on_request_and_keeps_reuse(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    export = tmp_path / "jan.csv"
+    _write_export(export, ["A", "B", "C"], "2026-01-31")
+    local = sketches.default_sketch_path()
+
+    pipeline.run_processing([str(export)], run_title="Plain")
+    assert not os.path.exists(local)
+
+    seed = tmp_path / "seed.csv"
+    _write_export(seed, ["D", "E"], "2025-12-31")
+    pipeline.run_processing([str(seed)], run_title="Seed", update_sketch=True)
+    assert sketches.SketchSet.load(local).count("Jump Height") == 2
+
+    calls = []
+    original = percentiles.compute_percentiles
+    monkeypatch.setattr(
+        percentiles, "compute_percentiles", lambda *args, **kwargs: calls.append(1) or original(*args, **kwargs)
+    )
+    for _ in range(2):
+        pipeline.run_processing([str(export)], run_title="Scored", norms_sketch=local, update_sketch=True)
+    # The second run's sketch also holds this run's own values, yet the scored frames are reused.
+    assert sketches.SketchSet.load(local).count("Jump Height") == 5
+    assert calls == [1]
+
+
+def test_pdf_backend_warns_about_names_it_cannot_show(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    export = tmp_path / "jan.csv"
+    _write_export(export, ["王伟", "Zoë"], "2026-01-31")
+    result = pipeline.run_processing([str(export)], run_title="Names")
+    monkeypatch.setattr(pipeline.rendering, "render_pages", lambda *args, **kwargs: None)
+
+    messages = []
+    pipeline.make_charts(result, run_title="Names", backend="pdf", status=messages.append, use_page_cache=False)
+    assert [message for message in messages if "cannot show" in message] == [
+        "1 name(s) have characters the pdf backend cannot show and print them as '?' (e.g. 王伟); "
+        "use the matplotlib backend for these charts."
+    ]
+
+
+def test_reuse_needs_the_same_resolved_mapping(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    path = tmp_path / "jan.csv"
+    _write_export(path, ["A", "B"], "2026-01-31")
+    df = pd.read_csv(path).rename(columns={"Name": "Who"})
+    df["Nick"] = ["Ace", "Bee"]
+    df.to_csv(path, index=False)
+
+    def run(name_column):
+        def resolve(path, columns, suggested_mapping):
+            return {**suggested_mapping, "athlete_name": name_column}
+
+        return pipeline.run_processing([str(path)], run_title="Mapped", resolve_mapping=resolve, use_cache=False)
+
+    assert run("Who").athlete_names == ["A", "B"]
+    computed = []
+    original_compute = percentiles.compute_percentiles
+    monkeypatch.setattr(
+        percentiles,
+        "compute_percentiles",
+        lambda df, mapping, *args: computed.append(len(df)) or original_compute(df, mapping, *args),
+    )
+
+    # A different answer for the same file is a new input, not a reuse of the old frames.
+    assert run("Nick").athlete_names == ["Ace", "Bee"]
+    assert computed == [2]
+    result = run("Nick")
+    assert computed == [2]
+    assert result.athlete_names == ["Ace", "Bee"]
+    frames_dir = os.path.join(result.run_paths.percentiles, "inputs")
+    assert sorted(name.split(".", 1)[1] for name in os.listdir(frames_dir)) == ["long.arrow", "wide.arrow"]
@@ -0,0 +1,20 @@
+from src import radar_plot
+
+
+def test_renderer_reuses_figure_and_hides_unused_series():
+    renderer = radar_plot.RadarFigureRenderer()
+    three_dates = {
+        "2026-01-31": [10, 20, 30, 40, 50],
+        "2026-03-15": [20, 30, 40, 50, 60],
+        "2026-05-01": [30, 40, 50, 60, 70],
+    }
+    fig = renderer.render("A", three_dates)
+    again = renderer.render("B", {"2026-01-31": [50, 50, 50, 50, 50]})
+
+    assert again is fig
+    visible = [line for line, _patch in renderer._series if line.get_visible()]
+    assert [line.get_label() for line in visible] == ["2026-01-31"]
+    assert [t.get_text() for t in renderer.ax.get_legend().get_texts()] == ["2026-01-31"]
+    assert renderer._active_table[(1, 1)].get_text().get_text() == "50%"
+    assert any(text.get_text() == "B" for text in fig.texts)
+    renderer.close()
@@ -0,0 +1,27 @@
+from pypdf import PdfReader
+
+from src import rendering
+
+
+def _jobs(count):
+    values = {"2026-01-31": [10.0, 20.0, 30.0, 40.0, 50.0]}
+    return [rendering.PageJob(f"Athlete {index}", values) for index in range(count)]
+
+
+def test_split_chunks_keeps_order_and_sizes():
+    jobs = _jobs(10)
+    chunks = rendering._split_chunks(jobs, 4)
+    assert [len(chunk) for chunk in chunks] == [3, 3, 2, 2]
+    assert [job for chunk in chunks for job in chunk] == jobs
+    assert rendering._split_chunks(jobs[:2], 8) == [[jobs[0]], [jobs[1]]]
+    assert rendering._split_chunks([], 4) == []
+
+
+def test_parallel_render_merges_in_athlete_order(tmp_path):
+    pdf_path = str(tmp_path / "out.pdf")
+    rendering.render_pages(pdf_path, _jobs(5), png_dir=str(tmp_path / "png"), workers=2)
+
+    pages = PdfReader(pdf_path).pages
+    titles = [line for page in pages for line in page.extract_text().splitlines() if line.startswith("Athlete")]
+    assert titles == [f"Athlete {index}" for index in range(5)]
+    assert len(list((tmp_path / "png").iterdir())) == 5
@@ -0,0 +1,77 @@
+import csv
+import os
+
+import pandas as pd
+from pypdf import PdfReader
+
+from src import pipeline, rendering, shards
+
+VALUES = {"2026-01-05": [10.0, 20.0, 30.0, 40.0, 50.0]}
+
+
+def _jobs(count):
+    return [rendering.PageJob(f"Athlete {index:02d}", VALUES) for index in range(count)]
+
+
+def test_plan_groups_caps_and_keeps_names_unique():
+    jobs = _jobs(5)
+    groups = {"Athlete 00": "JV", "Athlete 01": "Varsity", "Athlete 02": "JV", "Athlete 03": "JV"}
+    plan = shards.plan_shards(jobs, groups, max_pages=2)
+    assert [(shard.name, shard.group, [job.athlete for job in shard.jobs]) for shard in plan] == [
+        ("JV_001", "JV", ["Athlete 00", "Athlete 02"]),
+        ("JV_002", "JV", ["Athlete 03"]),
+        ("Ungrouped", "Ungrouped", ["Athlete 04"]),
+        ("Varsity", "Varsity", ["Athlete 01"]),
+    ]
+
+    plan = shards.plan_shards(jobs, {"Athlete 00": "A/B", "Athlete 01": "A_B"})
+    assert len({shard.filename for shard in plan}) == len(plan)
+
+    assert [len(shard.jobs) for shard in shards.plan_shards(jobs, max_pages=2)] == [2, 2, 1]
+    assert shards.pages_per_shard(None, 1, "pdf") < shards.pages_per_shard(None, 2, "pdf")
+    assert shards.pages_per_shard(3, 100, "matplotlib") == 3
+
+
+def test_render_shards_writes_each_pdf_in_order(tmp_path):
+    jobs = _jobs(6)
+    outputs = [(str(tmp_path / "a.pdf"), jobs[:4]), (str(tmp_path / "b.pdf"), jobs[4:])]
+    rendering.render_shards(outputs, workers=2)
+    for path, shard_jobs in outputs:
+        text = [page.extract_text() for page in PdfReader(path).pages]
+        assert [job.athlete in page for job, page in zip(shard_jobs, text)] == [True] * len(shard_jobs)
+        assert len(text) == len(shard_jobs)
+
+
+def test_sharded_charts_by_input_column(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    export = tmp_path / "export.csv"
+    pd.DataFrame(
+        {
+            "Name": ["Athlete A", "Athlete B", "Athlete C"],
+            "Date": ["2026-01-31"] * 3,
+            "Team": ["Varsity", "JV", "Varsity"],
+            "Jump Height (in)": [10, 11, 12],
+            "Peak Power/BM": [20, 21, 22],
+            "RSI-Modified": [0.5, 0.6, 0.7],
+            "Eccentric Peak Power/BM": [3, 2, 1],
+            "Eccentric Deceleration RFD/BM": [30, 31, 32],
+        }
+    ).to_csv(export, index=False)
+    result = pipeline.run_processing([str(export)], run_title="Shards")
+
+    index_path = pipeline.make_charts(result, run_title="Shards", backend="pdf", workers=2, shard_by="team")
+    with open(index_path, encoding="utf-8", newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [(row["athlete_name"], row["file"], row["page"]) for row in rows] == [
+        ("Athlete B", "JV.pdf", "1"),
+        ("Athlete A", "Varsity.pdf", "1"),
+        ("Athlete C", "Varsity.pdf", "2"),
+    ]
+    shard_dir = os.path.dirname(index_path)
+    assert len(PdfReader(os.path.join(shard_dir, "Varsity.pdf")).pages) == 2
+
+    # Unchanged shards are left alone on the next build.
+    before = os.stat(os.path.join(shard_dir, "JV.pdf")).st_mtime_ns
+    pipeline.make_charts(result, run_title="Shards", backend="pdf", workers=2, shard_by="Team")
+    assert os.stat(os.path.join(shard_dir, "JV.pdf")).st_mtime_ns == before
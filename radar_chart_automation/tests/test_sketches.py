@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import norms, percentiles, sketches
+
+
+def _long_frame(values):
+    return pd.DataFrame(
+        {
+            "metric_key": np.tile(percentiles.AXIS_LABELS, len(values)),
+            "raw_value": np.repeat(values, len(percentiles.AXIS_LABELS)),
+        }
+    )
+
+
+def test_merged_sketch_stays_within_error_estimate():
+    rng = np.random.default_rng(7)
+    data = rng.lognormal(size=200_000)
+    sites = [sketches.KLLSketch() for _ in range(4)]
+    for index, chunk in enumerate(np.array_split(data, 200)):
+        sites[index % 4].update(chunk)
+    merged = sites[0]
+    for site in sites[1:]:
+        merged.merge(site)
+
+    queries = np.quantile(data, np.linspace(0.01, 0.99, 99))
+    exact = norms.percent_rank(np.sort(data), queries)
+    assert merged.n == len(data)
+    assert merged.size() < 2_000
+    assert np.max(np.abs(merged.percent_rank(queries) - exact)) <= merged.error_estimate()
+
+
+def test_small_pool_is_exact():
+    sketch = sketches.KLLSketch()
+    sketch.update([1.0, 2.0, 2.0, 3.0, 5.0])
+    values = [0.5, 2.0, 4.0, 9.0]
+    np.testing.assert_allclose(
+        sketch.percent_rank(values), norms.percent_rank(np.array([1.0, 2.0, 2.0, 3.0, 5.0]), values)
+    )
+
+
+def test_sketch_set_round_trip_and_merge_guards(tmp_path):
+    site_a = sketches.SketchSet()
+    site_a.add_long(_long_frame(np.arange(5000.0)), "a")
+    site_b = sketches.SketchSet()
+    site_b.add_long(_long_frame(np.arange(5000.0, 10000.0)), "b")
+    path = str(tmp_path / "site_a.npz")
+    site_a.save(path)
+
+    loaded = sketches.SketchSet.load(path)
+    assert loaded.identity == site_a.identity
+    assert site_a.identity_excluding(["a"]) == sketches.SketchSet().identity
+    np.testing.assert_allclose(loaded.percent_rank("Braking", [2500.0]), site_a.percent_rank("Braking", [2500.0]))
+
+    loaded.merge(site_b)
+    loaded.merge(site_b)  # already included: no-op
+    assert loaded.count("Jump Height") == 10000
+    site_c = sketches.SketchSet()
+    site_c.add_long(_long_frame([1.0]), "a")
+    site_c.add_long(_long_frame([2.0]), "c")
+    with pytest.raises(ValueError, match="count them twice"):
+        loaded.merge(site_c)
@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+from src import startup
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def test_importing_the_gui_leaves_heavy_modules_for_later():
+    code = "import sys, app; print(sorted({'pandas', 'matplotlib', 'src.pipeline'} & set(sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True)
+    assert output.stdout.strip() == "[]"
+
+
+def test_frozen_build_seeds_matplotlib_config_from_the_bundle(tmp_path, monkeypatch):
+    bundle = tmp_path / "bundle"
+    (bundle / startup.BUNDLED_CONFIG).mkdir(parents=True)
+    (bundle / startup.BUNDLED_CONFIG / "fontlist-v390.json").write_text("{}", encoding="utf-8")
+    config_dir = tmp_path / "mplconfig"
+
+    assert not startup.configure_frozen_matplotlib(str(config_dir))
+
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+    monkeypatch.setattr(sys, "_MEIPASS", str(bundle), raising=False)
+    monkeypatch.delitem(sys.modules, "matplotlib", raising=False)
+    monkeypatch.delenv("MPLCONFIGDIR", raising=False)
+    assert startup.configure_frozen_matplotlib(str(config_dir))
+    assert (config_dir / "fontlist-v390.json").exists()
+    assert os.environ["MPLCONFIGDIR"] == str(config_dir)
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src import pipeline, tasks
+
+
+def _drain(task, timeout=10):
+    events = []
+    deadline = time.monotonic() + timeout
+    while not task.finished and time.monotonic() < deadline:
+        task.dispatch(lambda kind, payload: events.append((kind, payload)))
+        time.sleep(0.01)
+    return events
+
+
+def test_background_task_runs_ui_calls_on_dispatching_thread():
+    ui_threads = []
+
+    def ask(name):
+        ui_threads.append(threading.current_thread())
+        return name.upper()
+
+    def work(task):
+        task.status("working")
+        task.progress(tasks.ProgressEvent("files", 1, 2, "a.csv"))
+        return task.call_on_ui(ask, "answer")
+
+    events = _drain(tasks.BackgroundTask(work).start())
+
+    assert [kind for kind, _ in events] == ["status", "progress", "done"]
+    assert events[-1][1] == "ANSWER"
+    assert ui_threads == [threading.current_thread()]
+
+
+def test_progress_tracker_estimates_remaining_time():
+    events = []
+    tracker = tasks.ProgressTracker("pages", 4, events.append)
+    tracker.advance(item="A")
+    tracker.advance(2, item="C")
+    assert [(event.current, event.total, event.item) for event in events] == [(1, 4, "A"), (3, 4, "C")]
+    assert events[-1].eta_seconds is not None
+    assert events[-1].describe().startswith("Athlete 3/4: C")
+
+
+def test_make_charts_stops_between_pages_when_cancelled(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    monkeypatch.setattr(
+        pipeline,
+        "read_percentiles_wide",
+        lambda run_folder: pd.DataFrame(
+            {
+                "athlete_name": [f"Athlete {index}" for index in range(5)],
+                **{column: [0.5] * 5 for column in pipeline.WIDE_VALUE_COLUMNS},
+                pipeline.LABEL_COLUMN: ["2026-01-31"] * 5,
+            }
+        ),
+    )
+    (tmp_path / "03_outputs").mkdir()
+    token = tasks.CancelToken()
+    events = []
+
+    def progress(event):
+        events.append(event)
+        if event.current == 2:
+            token.cancel()
+
+    with pytest.raises(tasks.Cancelled):
+        pipeline.make_charts(str(tmp_path), workers=1, progress=progress, cancel=token)
+
+    assert [event.current for event in events] == [1, 2]
+    assert not (tmp_path / "03_outputs" / f"{tmp_path.name}__radars.pdf").exists()
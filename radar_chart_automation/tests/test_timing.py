@@ -0,0 +1,38 @@
+import json
+
+from src import timing
+
+
+@timing.timed("decorated")
+def _work():
+    with timing.span("inner", item="x"):
+        return 42
+
+
+def test_spans_are_dropped_without_a_recorder():
+    assert timing.active() is None
+    assert timing.span("anything") is timing.span("other")
+    assert _work() == 42
+
+
+def test_recorder_collects_nested_spans_and_page_percentiles(tmp_path):
+    recorder = timing.Recorder()
+    with timing.recording(recorder):
+        for _ in range(3):
+            _work()
+        for _ in range(4):
+            with timing.span(timing.PAGE_SPAN):
+                pass
+
+    summary = {row["name"]: row for row in recorder.summary()}
+    assert summary["decorated"]["count"] == 3
+    assert summary["inner"]["count"] == 3
+    assert recorder.wall_percentiles()["count"] == 4
+    assert "decorated" in recorder.format_table()
+
+    path = tmp_path / "metrics.json"
+    recorder.write_metrics(str(path), "make_charts")
+    recorder.write_metrics(str(path), "run_processing")
+    data = json.loads(path.read_text())
+    assert set(data) == {"make_charts", "run_processing"}
+    assert data["make_charts"]["page_render_seconds"]["count"] == 4
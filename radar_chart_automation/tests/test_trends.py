@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from src import trends
+from src.chart_data import ChartData
+
+
+def _data():
+    values = np.full((2, 4, 5), np.nan)
+    present = np.array([[True, True, True, True], [True, False, True, True]])
+    jump = np.array([[10.0, 20.0, 40.0, 40.0], [50.0, np.nan, 30.0, 60.0]])
+    values[present] = np.repeat(jump[present][:, None], 5, axis=1)
+    return ChartData(["A", "B"], ["d1", "d2", "d3", "d4"], values, present)
+
+
+def test_trends_follow_each_athletes_own_tests():
+    result = trends.compute_trends(_data(), window=3)
+    jump = {name: array[:, :, 0] for name, array in result.stats.items()}
+
+    np.testing.assert_allclose(jump["delta_previous"], [[np.nan, 10, 20, 0], [np.nan, np.nan, -20, 30]])
+    np.testing.assert_allclose(jump["delta_baseline"], [[0, 10, 30, 30], [0, np.nan, -20, 10]])
+    np.testing.assert_allclose(jump["rolling_mean"], [[10, 15, 70 / 3, 100 / 3], [50, np.nan, 40, 140 / 3]])
+    # Slope is points per test over the last three tests (B's d3 and d4 are its 2nd and 3rd).
+    np.testing.assert_allclose(jump["rolling_slope"], [[np.nan, 10, 15, 10], [np.nan, np.nan, -20, 5]])
+
+    assert list(result.deltas("B")) == ["d3", "d4"]
+    assert result.deltas("B")["d4"][0] == 30
+
+    against_d3 = trends.compute_trends(_data(), baseline="d3")
+    np.testing.assert_allclose(against_d3.stats["delta_baseline"][:, :, 0], [[-30, -20, 0, 0], [20, np.nan, 0, 30]])
+    with pytest.raises(ValueError, match="Baseline"):
+        trends.compute_trends(_data(), baseline="d9")
+
+
+def test_trends_table_round_trips():
+    result = trends.compute_trends(_data())
+    frame = result.to_frame("date")
+    assert len(frame) == 7 * 5
+    rebuilt = trends.Trends.from_frame(frame, "date")
+    for athlete in ("A", "B"):
+        expected = result.deltas(athlete)
+        assert {label: list(values) for label, values in rebuilt.deltas(athlete).items()} == {
+            label: list(values) for label, values in expected.items()
+        }